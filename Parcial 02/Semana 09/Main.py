@@ -5,6 +5,7 @@ Autor: Sistema de Gestión de Inventarios
 """
 
 from inventario import Inventario
+from paginacion import leer_orden, navegar
 
 
 def mostrar_menu_principal():
@@ -138,21 +139,50 @@ class InterfazInventario:
     def opcion_ver_todos(self):
         """Maneja la opción de ver todos los productos."""
         print("\n--- TODOS LOS PRODUCTOS EN EL INVENTARIO ---")
-        self.inventario.mostrar_todos_productos()
+        try:
+            clave, descendente = leer_orden(input(
+                "Ordenar por id, nombre, cantidad, precio o valor ('-' delante = descendente) [id]: "))
+        except ValueError as e:
+            print(f" Error: {e}")
+            return
+        navegar(self.inventario.paginar_productos(clave, descendente),
+                self.inventario.mostrar_pagina)
 
     def opcion_estadisticas(self):
-        """Muestra estadísticas generales del inventario."""
+        """Muestra estadísticas generales del inventario (calculadas en una sola pasada)."""
         print("\n--- ESTADÍSTICAS DEL INVENTARIO ---")
         print("=" * 60)
+        # Totales en O(1): el inventario los mantiene actualizados en cada cambio
         cantidad_productos = self.inventario.obtener_cantidad_productos()
         valor_total = self.inventario.obtener_valor_total_inventario()
 
         print(f"Total de productos diferentes: {cantidad_productos}")
+        print(f"Total de unidades en stock: {self.inventario.obtener_unidades_totales()}")
         print(f"Valor total del inventario: ${valor_total:.2f}")
 
         if cantidad_productos > 0:
             print(f"Valor promedio por producto: ${valor_total / cantidad_productos:.2f}")
 
+            categorias = self.inventario.obtener_conteo_categorias()
+            principales = sorted(categorias.items(), key=lambda c: (-c[1], c[0]))[:5]
+            print("Categorías principales: "
+                  + ", ".join(f"{nombre} ({conteo})" for nombre, conteo in principales))
+
+            # Percentiles, top y stock bajo sí requieren recorrer los datos
+            estadisticas = self.inventario.obtener_estadisticas()
+            percentiles = " | ".join(f"P{p}: ${v:.2f}" for p, v in estadisticas["percentiles"].items())
+            print(f"Percentiles del valor por producto: {percentiles}")
+
+            print("\nProductos de mayor valor:")
+            for id_producto, valor in estadisticas["top"]:
+                print(f"  ID {id_producto:<6} ${valor:.2f}")
+
+            stock_bajo = estadisticas["stock_bajo"]
+            print(f"\nProductos con stock bajo (< 5 unidades): {len(stock_bajo)}")
+            if stock_bajo:
+                print("  IDs: " + ", ".join(str(i) for i in stock_bajo[:20])
+                      + (" ..." if len(stock_bajo) > 20 else ""))
+
         print("=" * 60 + "\n")
 
     def ejecutar(self):
@@ -4,8 +4,22 @@ Descripción: Define la clase Inventario que gestiona la colección de productos
 Autor: Sistema de Gestión de Inventarios
 """
 
+import math
+
+from estadisticas import calcular_estadisticas
+from indice_nombres import IndiceNombres
+from paginacion import FILAS_POR_PAGINA, Paginador, escribir_lineas
 from producto import Producto
 
+# Claves de ordenación del listado; el ID desempata los valores repetidos
+CLAVES_ORDEN = {
+    "id": lambda p: p.obtener_id(),
+    "nombre": lambda p: (p.obtener_nombre().lower(), p.obtener_id()),
+    "cantidad": lambda p: (p.obtener_cantidad(), p.obtener_id()),
+    "precio": lambda p: (p.obtener_precio(), p.obtener_id()),
+    "valor": lambda p: (p.obtener_cantidad() * p.obtener_precio(), p.obtener_id()),
+}
+
 
 class Inventario:
     """
@@ -13,11 +27,25 @@ class Inventario:
 
     Atributos:
         productos (list): Lista de objetos Producto almacenados en el inventario
+        _indice_nombres (IndiceNombres): Índice de tokens/trigramas para buscar_por_nombre
+        _unidades_totales (int), _valor_total (float), _conteo_categorias (dict):
+            Agregados mantenidos en O(1) en cada alta, baja o actualización
+        _ordenes (dict): Clave de orden → lista de Producto ya ordenada. Se
+            calcula al primer listado con esa clave y se reutiliza hasta que
+            un cambio la descarta
     """
 
     def __init__(self):
         """Constructor de la clase Inventario. Inicializa una lista vacía de productos."""
         self._productos = []
+        # Índice invertido de nombres (claves = objetos Producto)
+        self._indice_nombres = IndiceNombres()
+        # Agregados incrementales para las estadísticas
+        self._unidades_totales = 0
+        self._valor_total = 0.0
+        self._conteo_categorias = {}
+        # Ordenaciones para el listado por páginas
+        self._ordenes = {}
 
     # ============== MÉTODOS PRINCIPALES ==============
 
@@ -51,6 +79,9 @@ class Inventario:
         # Crear y añadir el producto
         nuevo_producto = Producto(id_producto, nombre, cantidad, precio)
         self._productos.append(nuevo_producto)
+        self._indice_nombres.agregar(nuevo_producto, nombre)
+        self._sumar_agregados(nuevo_producto, 1)
+        self._ordenes.clear()
         print(f"Producto '{nombre}' agregado exitosamente.")
         return True
 
@@ -68,6 +99,9 @@ class Inventario:
             if producto.obtener_id() == id_producto:
                 nombre = producto.obtener_nombre()
                 self._productos.pop(i)
+                self._indice_nombres.eliminar(producto)
+                self._sumar_agregados(producto, -1)
+                self._ordenes.clear()
                 print(f"Producto '{nombre}' (ID: {id_producto}) eliminado exitosamente.")
                 return True
 
@@ -93,6 +127,9 @@ class Inventario:
         if producto:
             cantidad_anterior = producto.obtener_cantidad()
             producto.establecer_cantidad(nueva_cantidad)
+            self._unidades_totales += nueva_cantidad - cantidad_anterior
+            self._ajustar_valor((nueva_cantidad - cantidad_anterior) * producto.obtener_precio())
+            self._descartar_ordenes("cantidad", "valor")
             print(f"Cantidad actualizada: {cantidad_anterior} → {nueva_cantidad} unidades")
             return True
 
@@ -118,54 +155,130 @@ class Inventario:
         if producto:
             precio_anterior = producto.obtener_precio()
             producto.establecer_precio(nuevo_precio)
+            self._ajustar_valor(producto.obtener_cantidad() * (nuevo_precio - precio_anterior))
+            self._descartar_ordenes("precio", "valor")
             print(f"Precio actualizado: ${precio_anterior:.2f} → ${nuevo_precio:.2f}")
             return True
 
         print(f"Error: No se encontró producto con ID {id_producto}.")
         return False
 
-    def buscar_por_nombre(self, nombre_busqueda):
+    def buscar_por_nombre(self, nombre_busqueda, limite=None):
         """
         Busca productos cuyo nombre contenga la cadena de búsqueda (case-insensitive).
+        Usa el índice de trigramas, por lo que no recorre toda la lista.
 
         Args:
             nombre_busqueda (str): Parte del nombre a buscar
+            limite (int): Máximo de resultados a retornar (None = todos)
 
         Returns:
-            list: Lista de productos encontrados
+            list: Lista de productos encontrados, ordenados por relevancia
         """
-        nombre_busqueda = nombre_busqueda.lower()
-        productos_encontrados = [
-            producto for producto in self._productos
-            if nombre_busqueda in producto.obtener_nombre().lower()
-        ]
+        productos_encontrados = self._indice_nombres.buscar(nombre_busqueda, limite)
 
         return productos_encontrados
 
-    def mostrar_todos_productos(self):
-        """Muestra todos los productos en el inventario de forma formateada."""
+    def mostrar_todos_productos(self, clave=None, descendente=False):
+        """
+        Muestra todos los productos en el inventario de forma formateada.
+        Las filas se generan de a una y se escriben en bloques (ver paginacion.py).
+
+        Args:
+            clave (str): Orden del listado (ver CLAVES_ORDEN); None = orden de inserción
+            descendente (bool): Listar de mayor a menor
+        """
         if not self._productos:
             print("\n  El inventario está vacío.\n")
             return
 
-        print("\n" + "=" * 80)
-        print(f"{'ID':<5} {'Nombre':<25} {'Cantidad':<12} {'Precio':<15} {'Total':<15}")
-        print("=" * 80)
+        productos = self._productos if clave is None else self.ordenar_productos(clave)
+        if descendente:
+            productos = reversed(productos)
+        escribir_lineas(self._lineas_listado(productos))
 
-        total_valor = 0
-        for producto in self._productos:
-            valor_producto = producto.obtener_cantidad() * producto.obtener_precio()
-            total_valor += valor_producto
+    def ordenar_productos(self, clave="id"):
+        """
+        Productos ordenados por 'clave', de menor a mayor. La lista se calcula
+        una sola vez y se reutiliza hasta que un cambio la descarta; no se
+        debe modificar.
 
-            print(f"{producto.obtener_id():<5} "
-                  f"{producto.obtener_nombre():<25} "
-                  f"{producto.obtener_cantidad():<12} "
-                  f"${producto.obtener_precio():<14.2f} "
-                  f"${valor_producto:<14.2f}")
+        Args:
+            clave (str): Una de CLAVES_ORDEN
+
+        Returns:
+            list: Lista de Producto ordenada
 
-        print("=" * 80)
-        print(f"{'VALOR TOTAL DEL INVENTARIO:':<57} ${total_valor:.2f}")
-        print("=" * 80 + "\n")
+        Raises:
+            ValueError: Si la clave no existe
+        """
+        if clave not in CLAVES_ORDEN:
+            raise ValueError(f"Orden '{clave}' desconocido.")
+        productos = self._ordenes.get(clave)
+        if productos is None:
+            productos = self._ordenes[clave] = sorted(self._productos, key=CLAVES_ORDEN[clave])
+        return productos
+
+    def paginar_productos(self, clave="id", descendente=False, por_pagina=FILAS_POR_PAGINA):
+        """
+        Cursor por páginas sobre los productos ordenados por 'clave'.
+
+        Args:
+            clave (str): Una de CLAVES_ORDEN
+            descendente (bool): Recorrer de mayor a menor
+            por_pagina (int): Productos por página
+
+        Returns:
+            Paginador: Posicionado en la primera página
+        """
+        return Paginador(self.ordenar_productos(clave), clave, descendente, por_pagina)
+
+    def mostrar_pagina(self, paginador):
+        """
+        Muestra la página actual de un Paginador con el mismo formato que
+        mostrar_todos_productos; el valor total aparece en la última página.
+
+        Args:
+            paginador (Paginador): Cursor creado con paginar_productos
+        """
+        if not paginador.total:
+            print("\n  El inventario está vacío.\n")
+            return
+
+        lineas = self._encabezado_listado()
+        lineas.extend(map(self._formatear_fila, paginador.actual()))
+        lineas.append("=" * 80)
+        if paginador.es_ultima():
+            lineas.append(f"{'VALOR TOTAL DEL INVENTARIO:':<57} "
+                          f"${self.obtener_valor_total_inventario():.2f}")
+        lineas.append(paginador.resumen())
+        escribir_lineas(lineas)
+
+    def _lineas_listado(self, productos):
+        """Genera las líneas del listado completo (encabezado, filas y total)."""
+        yield from self._encabezado_listado()
+        yield from map(self._formatear_fila, productos)
+        yield "=" * 80
+        yield f"{'VALOR TOTAL DEL INVENTARIO:':<57} ${self.obtener_valor_total_inventario():.2f}"
+        yield "=" * 80 + "\n"
+
+    @staticmethod
+    def _encabezado_listado():
+        """Líneas de encabezado de la tabla de productos."""
+        return ["", "=" * 80,
+                f"{'ID':<5} {'Nombre':<25} {'Cantidad':<12} {'Precio':<15} {'Total':<15}",
+                "=" * 80]
+
+    @staticmethod
+    def _formatear_fila(producto):
+        """Fila de la tabla de productos."""
+        cantidad = producto.obtener_cantidad()
+        precio = producto.obtener_precio()
+        return (f"{producto.obtener_id():<5} "
+                f"{producto.obtener_nombre():<25} "
+                f"{cantidad:<12} "
+                f"${precio:<14.2f} "
+                f"${cantidad * precio:<14.2f}")
 
     # ============== MÉTODOS PRIVADOS (AUXILIARES) ==============
 
@@ -196,13 +309,113 @@ class Inventario:
                 return producto
         return None
 
+    def _descartar_ordenes(self, *claves):
+        """Descarta las ordenaciones guardadas que dependen de un dato que cambió."""
+        for clave in claves:
+            self._ordenes.pop(clave, None)
+
     def obtener_cantidad_productos(self):
         """Retorna la cantidad total de productos diferentes en el inventario."""
         return len(self._productos)
 
+    def _columnas(self):
+        """
+        Extrae los datos del inventario como tres listas paralelas en una sola pasada.
+
+        Returns:
+            tuple: (ids, cantidades, precios)
+        """
+        ids, cantidades, precios = [], [], []
+        for producto in self._productos:
+            ids.append(producto.obtener_id())
+            cantidades.append(producto.obtener_cantidad())
+            precios.append(producto.obtener_precio())
+        return ids, cantidades, precios
+
+    def obtener_estadisticas(self, umbral_stock_bajo=5, top_n=5):
+        """
+        Calcula todas las estadísticas del inventario de una vez (ver estadisticas.py).
+
+        Args:
+            umbral_stock_bajo (int): Cantidad por debajo de la cual se alerta stock bajo
+            top_n (int): Cuántos productos de mayor valor retornar
+
+        Returns:
+            dict: Totales, promedio, percentiles, IDs con stock bajo y top por valor
+        """
+        ids, cantidades, precios = self._columnas()
+        return calcular_estadisticas(ids, cantidades, precios, umbral_stock_bajo, top_n)
+
+    # ============== AGREGADOS INCREMENTALES ==============
+
+    @staticmethod
+    def _categoria(nombre):
+        """Categoría de un producto: la primera palabra de su nombre."""
+        palabras = nombre.split()
+        return palabras[0].lower() if palabras else ""
+
+    def _sumar_agregados(self, producto, signo):
+        """
+        Suma (signo=1) o resta (signo=-1) un producto de los agregados en O(1).
+        Los agregados solo son correctos si los cambios pasan por el Inventario
+        (agregar, eliminar, actualizar), no por los setters de Producto.
+        """
+        cantidad = producto.obtener_cantidad()
+        self._unidades_totales += signo * cantidad
+        self._ajustar_valor(signo * cantidad * producto.obtener_precio())
+        categoria = self._categoria(producto.obtener_nombre())
+        conteo = self._conteo_categorias.get(categoria, 0) + signo
+        if conteo:
+            self._conteo_categorias[categoria] = conteo
+        else:
+            del self._conteo_categorias[categoria]
+
+    def _ajustar_valor(self, diferencia):
+        """
+        Suma 'diferencia' al valor total mantenido (después de actualizar las
+        unidades). Sin unidades en stock el valor es exactamente 0, así que
+        se reinicia y no queda el error de redondeo acumulado (por ejemplo
+        -2.3e-14, que se mostraría como "$-0.00").
+        """
+        if self._unidades_totales:
+            self._valor_total += diferencia
+        else:
+            self._valor_total = 0.0
+
+    def obtener_unidades_totales(self):
+        """Retorna el total de unidades en stock (O(1))."""
+        return self._unidades_totales
+
+    def obtener_conteo_categorias(self):
+        """Retorna una copia de {categoría: cantidad de productos} (O(1) por consulta)."""
+        return dict(self._conteo_categorias)
+
+    def verificar_agregados(self):
+        """
+        Recalcula los agregados recorriendo todo el inventario y los compara con
+        los valores mantenidos de forma incremental.
+
+        Returns:
+            bool: True si coinciden, False si hay alguna diferencia
+        """
+        unidades, valor, categorias = 0, 0.0, {}
+        for producto in self._productos:
+            unidades += producto.obtener_cantidad()
+            valor += producto.obtener_cantidad() * producto.obtener_precio()
+            categoria = self._categoria(producto.obtener_nombre())
+            categorias[categoria] = categorias.get(categoria, 0) + 1
+
+        correcto = (unidades == self._unidades_totales
+                    and math.isclose(valor, self._valor_total, rel_tol=1e-9)
+                    and categorias == self._conteo_categorias)
+        if not correcto:
+            print(f"⚠️  Agregados inconsistentes: unidades {self._unidades_totales} vs {unidades}, "
+                  f"valor {self._valor_total:.2f} vs {valor:.2f}")
+        return correcto
+
     def obtener_valor_total_inventario(self):
-        """Retorna el valor total de todos los productos en el inventario."""
-        return sum(
-            producto.obtener_cantidad() * producto.obtener_precio()
-            for producto in self._productos
-        )
\ No newline at end of file
+        """
+        Retorna el valor total de todos los productos en el inventario (O(1)),
+        redondeado a centavos (+ 0.0 convierte un -0.0 en 0.0).
+        """
+        return round(self._valor_total, 2) + 0.0
\ No newline at end of file
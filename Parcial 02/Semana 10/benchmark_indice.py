@@ -0,0 +1,102 @@
+"""
+Módulo: benchmark_indice.py
+Descripción: Compara el costo de las operaciones por ID del Inventario usando
+             el índice hash (ID → posición) frente al recorrido lineal de la
+             lista que se usaba antes.
+Uso: python benchmark_indice.py [cantidad_productos]
+Autor: Sistema de Gestión de Inventarios
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from inventario_modificado import Inventario
+from producto import Producto
+
+
+class InventarioLineal(Inventario):
+    """
+    Réplica de las búsquedas y eliminaciones originales (recorrido de la
+    lista y list.pop), usada solo como referencia para comparar.
+    """
+
+    def _id_existe(self, id_producto):
+        return any(p is not None and p.obtener_id() == id_producto for p in self._productos)
+
+    def _buscar_producto_por_id(self, id_producto):
+        for producto in self._productos:
+            if producto is not None and producto.obtener_id() == id_producto:
+                return producto
+        return None
+
+    def eliminar_producto(self, id_producto):
+        for i, producto in enumerate(self._productos):
+            if producto is not None and producto.obtener_id() == id_producto:
+                self._productos.pop(i)
+                return True
+        return False
+
+
+def crear_inventario(clase, cantidad, carpeta):
+    """Crea un inventario con 'cantidad' productos sin escribir en disco por cada uno."""
+    with open(os.devnull, "w") as nulo:
+        salida, sys.stdout = sys.stdout, nulo
+        try:
+            inventario = clase(os.path.join(carpeta, f"{clase.__name__}.txt"))
+        finally:
+            sys.stdout = salida
+    # El benchmark mide las estructuras en memoria, no la escritura del archivo
+    inventario._guardar_en_archivo = lambda: True
+    for i in range(cantidad):
+        inventario._insertar(Producto(i, f"Producto {i}", i % 50, 1.0 + i % 7))
+    return inventario
+
+
+def medir(funcion, ids):
+    """Ejecuta funcion(id) para cada ID con la salida silenciada; retorna segundos."""
+    with open(os.devnull, "w") as nulo:
+        salida, sys.stdout = sys.stdout, nulo
+        try:
+            inicio = time.perf_counter()
+            for id_producto in ids:
+                funcion(id_producto)
+            return time.perf_counter() - inicio
+        finally:
+            sys.stdout = salida
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    consultas = 200
+    random.seed(42)
+    ids = random.sample(range(cantidad), consultas)
+
+    print(f"\nBenchmark con {cantidad} productos y {consultas} operaciones por ID")
+    print("=" * 70)
+    print(f"{'Operación':<25} {'Lineal (s)':>12} {'Índice (s)':>12} {'Mejora':>12}")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        lineal = crear_inventario(InventarioLineal, cantidad, carpeta)
+        indexado = crear_inventario(Inventario, cantidad, carpeta)
+
+        operaciones = [
+            ("_id_existe", lambda inv: inv._id_existe),
+            ("actualizar_cantidad", lambda inv: lambda i: inv.actualizar_cantidad(i, 5)),
+            ("actualizar_precio", lambda inv: lambda i: inv.actualizar_precio(i, 2.5)),
+            ("eliminar_producto", lambda inv: inv.eliminar_producto),
+        ]
+        for nombre, obtener in operaciones:
+            t_lineal = medir(obtener(lineal), ids)
+            t_indice = medir(obtener(indexado), ids)
+            print(f"{nombre:<25} {t_lineal:>12.4f} {t_indice:>12.4f} "
+                  f"{t_lineal / max(t_indice, 1e-9):>11.0f}x")
+
+    print("=" * 70 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Módulo: estadisticas.py
+Descripción: Cálculo de estadísticas del inventario sobre columnas (listas
+             paralelas de IDs, cantidades y precios) en una sola pasada.
+             Usa NumPy si está instalado; si no, una versión en Python puro
+             que da los mismos resultados (salvo el redondeo de las sumas;
+             el top con empates también queda igual: primero el de menor
+             posición).
+Autor: Sistema de Gestión de Inventarios
+"""
+
+import heapq
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+# Percentiles del valor por producto (cantidad × precio) que se reportan
+PERCENTILES = (25, 50, 75, 90)
+
+
+def calcular_estadisticas(ids, cantidades, precios, umbral_stock_bajo=5, top_n=5):
+    """
+    Calcula las estadísticas del inventario.
+
+    Args:
+        ids (list): IDs de los productos
+        cantidades (list): Cantidades, en el mismo orden que ids
+        precios (list): Precios unitarios, en el mismo orden que ids
+        umbral_stock_bajo (int): Cantidad por debajo de la cual un producto se reporta
+        top_n (int): Cuántos productos de mayor valor incluir
+
+    Returns:
+        dict: total_productos, unidades_totales, valor_total, valor_promedio,
+              percentiles {p: valor}, stock_bajo [ids] y top [(id, valor)]
+    """
+    if not ids:
+        return {
+            "total_productos": 0, "unidades_totales": 0, "valor_total": 0.0,
+            "valor_promedio": 0.0, "percentiles": {p: 0.0 for p in PERCENTILES},
+            "stock_bajo": [], "top": [],
+        }
+    if np is not None:
+        return _calcular_numpy(ids, cantidades, precios, umbral_stock_bajo, top_n)
+    return _calcular_python(ids, cantidades, precios, umbral_stock_bajo, top_n)
+
+
+def _calcular_numpy(ids, cantidades, precios, umbral_stock_bajo, top_n):
+    """Versión vectorizada: todas las operaciones recorren arreglos contiguos."""
+    cant = np.asarray(cantidades, dtype=np.int64)
+    prec = np.asarray(precios, dtype=np.float64)
+    valores = cant * prec
+    n = len(valores)
+
+    # partition da el k-ésimo mayor valor sin ordenar todo el arreglo; se
+    # toman todos los que lo alcanzan (en orden de posición) y se ordenan
+    # por valor y posición, así los empates salen como en _calcular_python
+    k = min(top_n, n)
+    mayores = np.array([], dtype=np.int64)
+    if k:
+        umbral = -np.partition(-valores, k - 1)[k - 1]
+        candidatos = np.flatnonzero(valores >= umbral)
+        mayores = candidatos[np.lexsort((candidatos, -valores[candidatos]))][:k]
+
+    return {
+        "total_productos": n,
+        "unidades_totales": int(cant.sum()),
+        "valor_total": float(valores.sum()),
+        "valor_promedio": float(valores.mean()),
+        "percentiles": dict(zip(PERCENTILES, map(float, np.percentile(valores, PERCENTILES)))),
+        "stock_bajo": [ids[i] for i in np.flatnonzero(cant < umbral_stock_bajo)],
+        "top": [(ids[i], float(valores[i])) for i in mayores],
+    }
+
+
+def _calcular_python(ids, cantidades, precios, umbral_stock_bajo, top_n):
+    """Versión en Python puro, usada cuando NumPy no está disponible."""
+    valores = [c * p for c, p in zip(cantidades, precios)]
+    n = len(valores)
+    valor_total = sum(valores)
+    ordenados = sorted(valores)
+    mayores = heapq.nsmallest(top_n, range(n), key=lambda i: (-valores[i], i))
+
+    return {
+        "total_productos": n,
+        "unidades_totales": sum(cantidades),
+        "valor_total": float(valor_total),
+        "valor_promedio": valor_total / n,
+        "percentiles": {p: _percentil(ordenados, p) for p in PERCENTILES},
+        "stock_bajo": [ids[i] for i, c in enumerate(cantidades) if c < umbral_stock_bajo],
+        "top": [(ids[i], float(valores[i])) for i in mayores],
+    }
+
+
+def _percentil(ordenados, p):
+    """Percentil con interpolación lineal (mismo criterio que numpy.percentile)."""
+    posicion = (len(ordenados) - 1) * p / 100
+    inferior = int(posicion)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    fraccion = posicion - inferior
+    return float(ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * fraccion)
@@ -0,0 +1,313 @@
+"""
+Módulo: instrumentacion.py
+Descripción: Mediciones opcionales del Inventario para saber en qué se va el
+             tiempo cuando la caja se siente lenta.
+
+- Instrumentacion: por operación cuenta llamadas, acumula el tiempo, arma un
+  histograma de latencias (escalas de 10 µs a 2,5 s) y suma los bytes
+  escritos. envolver()/instrumentar() reemplazan los métodos de UNA
+  instancia por versiones medidas, así la clase no cambia y un Inventario
+  sin instrumentar no paga nada.
+- InstrumentacionNula: misma interfaz, no mide nada.
+- sesion_perfilada(): ejecuta un bloque bajo cProfile (y tracemalloc) y
+  guarda el perfil (.prof, se abre con "python -m pstats") más un resumen en
+  texto con las funciones más costosas y las líneas que más memoria piden.
+
+Los tiempos de una operación incluyen los de las que llama (por ejemplo,
+agregar incluye el guardado del archivo).
+"""
+
+import bisect
+import functools
+import io
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# Límites superiores (segundos) de cada casilla del histograma; la última es "más"
+LIMITES = (10e-6, 25e-6, 50e-6, 100e-6, 250e-6, 500e-6,
+           1e-3, 2.5e-3, 5e-3, 10e-3, 25e-3, 50e-3,
+           0.1, 0.25, 0.5, 1.0, 2.5)
+BARRAS = " ▁▂▃▄▅▆▇█"
+
+
+def _formatear_tiempo(segundos):
+    """Tiempo legible con la unidad adecuada (µs, ms o s)."""
+    if segundos < 1e-3:
+        return f"{segundos * 1e6:.0f} µs"
+    if segundos < 1:
+        return f"{segundos * 1e3:.1f} ms"
+    return f"{segundos:.2f} s"
+
+
+def _formatear_bytes(cantidad):
+    """Bytes legibles (B, KB, MB, GB)."""
+    for unidad in ("B", "KB", "MB"):
+        if cantidad < 1024:
+            return f"{cantidad:.0f} {unidad}" if unidad == "B" else f"{cantidad:.1f} {unidad}"
+        cantidad /= 1024
+    return f"{cantidad:.1f} GB"
+
+
+class _Medidas:
+    """Acumulados de una operación."""
+
+    __slots__ = ("conteo", "total", "minimo", "maximo", "bytes", "casillas")
+
+    def __init__(self):
+        self.conteo = 0
+        self.total = 0.0
+        self.minimo = float("inf")
+        self.maximo = 0.0
+        self.bytes = 0
+        self.casillas = [0] * (len(LIMITES) + 1)
+
+    def percentil(self, p):
+        """
+        Percentil aproximado a partir del histograma: el límite superior de
+        la casilla donde cae (nunca mayor que el máximo observado).
+        """
+        objetivo = self.conteo * p / 100
+        acumulado = 0
+        for i, conteo in enumerate(self.casillas):
+            acumulado += conteo
+            if acumulado >= objetivo and conteo:
+                return min(LIMITES[i] if i < len(LIMITES) else self.maximo, self.maximo)
+        return self.maximo
+
+
+class Instrumentacion:
+    """
+    Registro de métricas por operación, seguro para usar desde varios hilos.
+
+    Uso:
+        instrumentacion = Instrumentacion()
+        with instrumentacion.medir("guardar"):
+            ...
+        instrumentacion.instrumentar(inventario, ["buscar_por_nombre"])
+        print(instrumentacion.reporte())
+    """
+
+    activa = True
+
+    def __init__(self):
+        self._medidas = {}
+        self._cerrojo = threading.Lock()
+
+    def registrar(self, operacion, segundos, bytes_escritos=0):
+        """
+        Agrega una medición.
+
+        Args:
+            operacion (str): Nombre de la operación
+            segundos (float): Duración de la llamada
+            bytes_escritos (int): Bytes escritos a disco por la llamada
+        """
+        casilla = bisect.bisect_left(LIMITES, segundos)
+        with self._cerrojo:
+            medidas = self._medidas.get(operacion)
+            if medidas is None:
+                medidas = self._medidas[operacion] = _Medidas()
+            medidas.conteo += 1
+            medidas.total += segundos
+            medidas.minimo = min(medidas.minimo, segundos)
+            medidas.maximo = max(medidas.maximo, segundos)
+            medidas.bytes += bytes_escritos
+            medidas.casillas[casilla] += 1
+
+    def sumar_bytes(self, operacion, cantidad):
+        """Suma bytes escritos a una operación ya medida (o por medir)."""
+        with self._cerrojo:
+            medidas = self._medidas.get(operacion)
+            if medidas is None:
+                medidas = self._medidas[operacion] = _Medidas()
+            medidas.bytes += cantidad
+
+    @contextmanager
+    def medir(self, operacion):
+        """Mide la duración del bloque 'with' como una llamada a 'operacion'."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(operacion, time.perf_counter() - inicio)
+
+    def envolver(self, operacion, funcion, bytes_de=None):
+        """
+        Retorna una versión de 'funcion' que registra cada llamada.
+
+        Args:
+            operacion (str): Nombre con el que se registra
+            funcion (callable): Función o método ligado a envolver
+            bytes_de (callable): Opcional; tras cada llamada retorna cuántos
+                                 bytes se escribieron (por ejemplo, el tamaño
+                                 del archivo reescrito)
+        """
+        @functools.wraps(funcion)
+        def medida(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                segundos = time.perf_counter() - inicio
+                self.registrar(operacion, segundos, bytes_de() if bytes_de else 0)
+        return medida
+
+    def instrumentar(self, objeto, nombres, prefijo="", bytes_de=None):
+        """
+        Reemplaza, solo en esta instancia, cada método de 'nombres' por su
+        versión medida.
+
+        Args:
+            objeto: Instancia cuyos métodos se miden
+            nombres (iterable): Nombres de los métodos
+            prefijo (str): Se antepone al nombre en el reporte
+            bytes_de (dict): Nombre del método → callable de bytes escritos
+        """
+        bytes_de = bytes_de or {}
+        for nombre in nombres:
+            setattr(objeto, nombre, self.envolver(prefijo + nombre, getattr(objeto, nombre),
+                                                  bytes_de.get(nombre)))
+
+    def reiniciar(self):
+        """Borra todas las mediciones."""
+        with self._cerrojo:
+            self._medidas.clear()
+
+    def datos(self):
+        """
+        Métricas en un diccionario apto para JSON.
+
+        Returns:
+            dict: operación → conteo, total_s, promedio_us, p50_us, p95_us,
+                  p99_us, max_us, bytes e histograma [[límite_s, conteo], ...]
+                  (límite None = casilla "más de 2,5 s")
+        """
+        with self._cerrojo:
+            copia = {op: (m.conteo, m.total, m.maximo, m.bytes, list(m.casillas),
+                          [m.percentil(p) for p in (50, 95, 99)])
+                     for op, m in self._medidas.items()}
+        resultado = {}
+        for op, (conteo, total, maximo, escritos, casillas, percentiles) in copia.items():
+            resultado[op] = {
+                "conteo": conteo,
+                "total_s": total,
+                "promedio_us": total / conteo * 1e6 if conteo else 0.0,
+                "p50_us": percentiles[0] * 1e6,
+                "p95_us": percentiles[1] * 1e6,
+                "p99_us": percentiles[2] * 1e6,
+                "max_us": maximo * 1e6,
+                "bytes": escritos,
+                "histograma": [[limite, n] for limite, n in
+                               zip(LIMITES + (None,), casillas) if n],
+            }
+        return resultado
+
+    def reporte(self):
+        """
+        Tabla con las operaciones ordenadas por tiempo total y un mini
+        histograma por fila (una barra por casilla, de 10 µs a más de 2,5 s).
+
+        Returns:
+            str: El reporte listo para imprimir
+        """
+        with self._cerrojo:
+            filas = sorted(self._medidas.items(), key=lambda par: -par[1].total)
+            lineas = [
+                "=" * 110,
+                f"{'Operación':<30} {'Llamadas':>8} {'Total':>10} {'Prom.':>9} {'p50':>9} "
+                f"{'p95':>9} {'p99':>9} {'Escrito':>10}  Histograma",
+                "=" * 110,
+            ]
+            for operacion, m in filas:
+                mayor = max(m.casillas) or 1
+                histograma = "".join(BARRAS[max(1, round(n / mayor * (len(BARRAS) - 1)))]
+                                     if n else "·" for n in m.casillas)
+                lineas.append(
+                    f"{operacion[:30]:<30} {m.conteo:>8} {_formatear_tiempo(m.total):>10} "
+                    f"{_formatear_tiempo(m.total / m.conteo if m.conteo else 0):>9} "
+                    f"{_formatear_tiempo(m.percentil(50)):>9} "
+                    f"{_formatear_tiempo(m.percentil(95)):>9} "
+                    f"{_formatear_tiempo(m.percentil(99)):>9} "
+                    f"{_formatear_bytes(m.bytes) if m.bytes else '—':>10}  {histograma}")
+        if not filas:
+            lineas.append("  (sin mediciones todavía)")
+        lineas.append("=" * 110)
+        lineas.append("Histograma: 10µs 25 50 100 250 500 1ms 2.5 5 10 25 50 100 250 500 1s 2.5 +")
+        return "\n".join(lineas)
+
+
+class InstrumentacionNula:
+    """Misma interfaz que Instrumentacion, sin medir nada."""
+
+    activa = False
+
+    def registrar(self, operacion, segundos, bytes_escritos=0):
+        pass
+
+    def sumar_bytes(self, operacion, cantidad):
+        pass
+
+    def medir(self, operacion):
+        return nullcontext()
+
+    def envolver(self, operacion, funcion, bytes_de=None):
+        return funcion
+
+    def instrumentar(self, objeto, nombres, prefijo="", bytes_de=None):
+        pass
+
+    def reiniciar(self):
+        pass
+
+    def datos(self):
+        return {}
+
+    def reporte(self):
+        return "  La instrumentación está desactivada (inicie con --instrumentar)."
+
+
+@contextmanager
+def sesion_perfilada(ruta, memoria=True, lineas=25):
+    """
+    Ejecuta el bloque 'with' bajo cProfile y, si 'memoria' es True, bajo
+    tracemalloc. Al terminar guarda:
+      - ruta:         estadísticas de cProfile (python -m pstats ruta)
+      - ruta + .txt:  las funciones con más tiempo acumulado y, con memoria,
+                      las líneas que más memoria reservaron y el pico
+
+    Args:
+        ruta (str): Archivo del perfil (por ejemplo 'sesion.prof')
+        memoria (bool): Seguir también las reservas de memoria (más lento)
+        lineas (int): Cuántas funciones / líneas incluir en el resumen
+    """
+    # Se importan aquí: solo se usan al perfilar y pstats tarda en cargarse,
+    # lo que retrasaría el inicio de cada ejecución normal
+    import cProfile
+    import pstats
+    import tracemalloc
+
+    if memoria:
+        tracemalloc.start()
+    perfil = cProfile.Profile()
+    perfil.enable()
+    try:
+        yield perfil
+    finally:
+        perfil.disable()
+        perfil.dump_stats(ruta)
+
+        resumen = io.StringIO()
+        pstats.Stats(perfil, stream=resumen).sort_stats("cumulative").print_stats(lineas)
+        if memoria:
+            instantanea = tracemalloc.take_snapshot()
+            actual, pico = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            resumen.write(f"\nMemoria: actual {_formatear_bytes(actual)}, "
+                          f"pico {_formatear_bytes(pico)}\n")
+            resumen.write("Líneas que más memoria reservaron:\n")
+            for estadistica in instantanea.statistics("lineno")[:lineas]:
+                resumen.write(f"  {estadistica}\n")
+        with open(ruta + ".txt", "w", encoding="utf-8") as archivo:
+            archivo.write(resumen.getvalue())
+        print(f"✅ Perfil guardado en '{ruta}' (resumen en '{ruta}.txt').")
@@ -5,31 +5,96 @@ Descripción: Define la clase Inventario que gestiona la colección de productos
 Autor: Sistema de Gestión de Inventarios
 """
 
+import math
+import os
+
+from estadisticas import calcular_estadisticas
+from indice_nombres import IndiceNombres
+from instrumentacion import Instrumentacion, InstrumentacionNula
+from paginacion import FILAS_POR_PAGINA, Paginador, escribir_lineas
 from producto import Producto
 
 # Nombre del archivo donde se guardará el inventario
 ARCHIVO_INVENTARIO = "inventario.txt"
 
+# Máximo de errores de carga que se muestran en consola (el resto queda en errores_carga)
+MAX_ERRORES_MOSTRADOS = 5
+
+# Métodos que se miden con instrumentar=True (ver instrumentacion.py)
+OPERACIONES_MEDIDAS = (
+    "agregar_producto", "eliminar_producto", "actualizar_cantidad", "actualizar_precio",
+    "buscar_por_nombre", "mostrar_todos_productos", "mostrar_pagina", "obtener_estadisticas",
+    "_cargar_desde_archivo", "_guardar_en_archivo",
+)
+
+# Claves de ordenación del listado; el ID desempata los valores repetidos.
+# El orden por ID sale de _posiciones sin convertir las líneas perezosas.
+CLAVES_ORDEN = {
+    "id": None,
+    "nombre": lambda p: (p.obtener_nombre().lower(), p.obtener_id()),
+    "cantidad": lambda p: (p.obtener_cantidad(), p.obtener_id()),
+    "precio": lambda p: (p.obtener_precio(), p.obtener_id()),
+    "valor": lambda p: (p.obtener_cantidad() * p.obtener_precio(), p.obtener_id()),
+}
+
 
 class Inventario:
     """
     Clase que gestiona el inventario de productos de la tienda.
 
     Atributos:
-        _productos (list): Lista de objetos Producto almacenados en el inventario
+        _productos (list): Lista de objetos Producto en orden de inserción.
+                           Las posiciones eliminadas quedan como None (hueco)
+                           hasta la siguiente compactación. En carga perezosa,
+                           una posición puede ser una tupla (id, nombre, cantidad,
+                           precio) que se convierte en Producto al primer acceso.
+        _posiciones (dict): Índice hash ID → posición en _productos (búsqueda O(1))
+        _huecos (int): Cantidad de posiciones None dentro de _productos
         _archivo (str): Ruta del archivo de texto donde se persisten los datos
+        _indice_nombres (IndiceNombres): Índice de tokens/trigramas para buscar_por_nombre
+        _ordenes (dict): Clave de orden → lista de IDs ya ordenada. Se calcula
+                         al primer listado con esa clave y se reutiliza hasta
+                         que un cambio la descarta
+        _unidades_totales (int), _valor_total (float), _conteo_categorias (dict):
+            Agregados mantenidos en O(1) en cada alta, baja o actualización
+        errores_carga (list): Tuplas (número de línea, motivo, contenido) de las
+                              líneas del archivo que no se pudieron cargar
+        instrumentacion (Instrumentacion): Métricas por operación; una
+                              InstrumentacionNula si no se pidió medir
     """
 
-    def __init__(self, archivo=ARCHIVO_INVENTARIO):
+    def __init__(self, archivo=ARCHIVO_INVENTARIO, carga_perezosa=False, instrumentar=False):
         """
         Constructor de la clase Inventario.
         Inicializa la lista de productos y carga los datos desde el archivo.
 
         Args:
             archivo (str): Ruta del archivo de inventario (por defecto 'inventario.txt')
+            carga_perezosa (bool): Si es True, al cargar cada línea solo se valida
+                                   y el Producto se crea al primer acceso
+            instrumentar (bool): Si es True, registra llamadas, latencias y bytes
+                                 escritos de las operaciones principales
         """
         self._productos = []
+        self._posiciones = {}
+        self._huecos = 0
+        self._perezosos = 0
+        self._carga_perezosa = carga_perezosa
         self._archivo = archivo
+        self.errores_carga = []
+        # Agregados incrementales para las estadísticas
+        self._unidades_totales = 0
+        self._valor_total = 0.0
+        self._conteo_categorias = {}
+        # Índice invertido de nombres (claves = objetos Producto)
+        self._indice_nombres = IndiceNombres()
+        # Ordenaciones para el listado por páginas
+        self._ordenes = {}
+        # Métricas opcionales: se envuelven los métodos antes de cargar para medir la carga
+        self.instrumentacion = Instrumentacion() if instrumentar else InstrumentacionNula()
+        self.instrumentacion.instrumentar(
+            self, OPERACIONES_MEDIDAS,
+            bytes_de={"_guardar_en_archivo": self._tamano_archivo})
         # Al iniciar, se cargan automáticamente los productos guardados
         self._cargar_desde_archivo()
 
@@ -38,46 +103,34 @@ class Inventario:
     def _cargar_desde_archivo(self):
         """
         Carga los productos desde el archivo de inventario al iniciar el programa.
+        Lee el archivo línea por línea (sin readlines), por lo que la memoria
+        usada no depende del tamaño del archivo. Las líneas inválidas se
+        registran en errores_carga y se muestra un solo resumen al final.
         Si el archivo no existe, lo crea vacío.
         Maneja excepciones de archivo no encontrado y permisos.
         """
         try:
+            lineas_leidas = 0
+            productos_cargados = 0
             with open(self._archivo, "r", encoding="utf-8") as f:
-                lineas = f.readlines()
+                for numero_linea, linea in enumerate(f, start=1):
+                    lineas_leidas += 1
+                    linea = linea.strip()
+                    # Ignorar líneas vacías o comentarios
+                    if not linea or linea.startswith("#"):
+                        continue
+                    if self._carga_perezosa:
+                        productos_cargados += self._registrar_linea_perezosa(numero_linea, linea)
+                    else:
+                        productos_cargados += self._registrar_linea(numero_linea, linea)
 
             # Si el archivo está vacío, no hay nada que cargar
-            if not lineas:
+            if not lineas_leidas:
                 print("📂 Archivo de inventario encontrado pero vacío. Empezando sin productos.")
                 return
 
-            productos_cargados = 0
-            for numero_linea, linea in enumerate(lineas, start=1):
-                linea = linea.strip()
-                # Ignorar líneas vacías o comentarios
-                if not linea or linea.startswith("#"):
-                    continue
-                try:
-                    # Formato esperado: id,nombre,cantidad,precio
-                    partes = linea.split(",")
-                    if len(partes) != 4:
-                        print(f"⚠️  Línea {numero_linea} ignorada (formato incorrecto): '{linea}'")
-                        continue
-
-                    id_producto = int(partes[0].strip())
-                    nombre = partes[1].strip()
-                    cantidad = int(partes[2].strip())
-                    precio = float(partes[3].strip())
-
-                    # Agregar producto directamente sin guardar (evitar escritura al cargar)
-                    nuevo_producto = Producto(id_producto, nombre, cantidad, precio)
-                    self._productos.append(nuevo_producto)
-                    productos_cargados += 1
-
-                except ValueError:
-                    # Línea con datos inválidos o corruptos
-                    print(f"⚠️  Línea {numero_linea} ignorada (datos corruptos): '{linea}'")
-
             print(f"✅ Inventario cargado desde '{self._archivo}': {productos_cargados} producto(s) recuperado(s).")
+            self._reportar_errores_carga()
 
         except FileNotFoundError:
             # El archivo no existe aún, se crea uno nuevo vacío
@@ -94,6 +147,96 @@ class Inventario:
             print(f"❌ Error al abrir el archivo '{self._archivo}': {e}. "
                   f"El inventario funcionará solo en memoria.")
 
+    def _leer_campos(self, numero_linea, linea):
+        """
+        Separa y convierte los campos de una línea 'id,nombre,cantidad,precio'.
+
+        Returns:
+            tuple: (id, nombre, cantidad, precio), o None si la línea es
+                   inválida (el motivo se agrega a errores_carga)
+        """
+        partes = linea.split(",")
+        if len(partes) != 4:
+            self.errores_carga.append((numero_linea, "formato incorrecto", linea))
+            return None
+        try:
+            return (int(partes[0].strip()), partes[1].strip(),
+                    int(partes[2].strip()), float(partes[3].strip()))
+        except ValueError:
+            # Línea con datos inválidos o corruptos
+            self.errores_carga.append((numero_linea, "datos corruptos", linea))
+            return None
+
+    def _parsear_linea(self, numero_linea, linea):
+        """
+        Convierte una línea 'id,nombre,cantidad,precio' en un Producto.
+
+        Returns:
+            Producto: El producto leído, o None si la línea es inválida
+                      (el motivo se agrega a errores_carga)
+        """
+        campos = self._leer_campos(numero_linea, linea)
+        return None if campos is None else Producto(*campos)
+
+    def _registrar_linea(self, numero_linea, linea):
+        """Carga una línea de inmediato. Retorna 1 si se agregó un producto, 0 si no."""
+        producto = self._parsear_linea(numero_linea, linea)
+        if producto is None:
+            return 0
+        if self._id_existe(producto.obtener_id()):
+            self.errores_carga.append((numero_linea, f"ID {producto.obtener_id()} repetido", linea))
+            return 0
+        # Agregar producto directamente sin guardar (evitar escritura al cargar)
+        self._insertar(producto)
+        return 1
+
+    def _registrar_linea_perezosa(self, numero_linea, linea):
+        """
+        Valida la línea como _registrar_linea (mismos errores), pero solo
+        reserva el ID y guarda los campos leídos: el Producto, el índice de
+        nombres y los agregados se crean al primer acceso. Así una línea inválida no
+        ocupa un ID ni cuenta como producto.
+        Retorna 1 si se registró la línea, 0 si no.
+        """
+        campos = self._leer_campos(numero_linea, linea)
+        if campos is None:
+            return 0
+        id_producto = campos[0]
+        if self._id_existe(id_producto):
+            self.errores_carga.append((numero_linea, f"ID {id_producto} repetido", linea))
+            return 0
+        self._posiciones[id_producto] = len(self._productos)
+        self._productos.append(campos)
+        self._perezosos += 1
+        return 1
+
+    def _materializar(self, posicion):
+        """
+        Retorna el Producto de la posición indicada, creándolo si todavía es
+        una línea pendiente (carga perezosa; sus campos ya se validaron al
+        cargar).
+        """
+        registro = self._productos[posicion]
+        if not isinstance(registro, tuple):
+            return registro
+
+        self._perezosos -= 1
+        producto = Producto(*registro)
+        self._productos[posicion] = producto
+        self._indice_nombres.agregar(producto, producto.obtener_nombre())
+        self._sumar_agregados(producto, 1)
+        return producto
+
+    def _reportar_errores_carga(self):
+        """Muestra un resumen de las líneas ignoradas al cargar el archivo."""
+        if not self.errores_carga:
+            return
+        print(f"⚠️  {len(self.errores_carga)} línea(s) ignorada(s) al cargar:")
+        for numero_linea, motivo, linea in self.errores_carga[:MAX_ERRORES_MOSTRADOS]:
+            print(f"    Línea {numero_linea} ({motivo}): '{linea}'")
+        if len(self.errores_carga) > MAX_ERRORES_MOSTRADOS:
+            print(f"    ... y {len(self.errores_carga) - MAX_ERRORES_MOSTRADOS} más.")
+
     def _crear_archivo_vacio(self):
         """
         Crea el archivo de inventario vacío con un encabezado explicativo.
@@ -111,10 +254,21 @@ class Inventario:
         except OSError as e:
             print(f"❌ Error al crear el archivo '{self._archivo}': {e}.")
 
+    def _tamano_archivo(self):
+        """Tamaño en bytes del archivo de inventario (0 si no existe)."""
+        try:
+            return os.path.getsize(self._archivo)
+        except OSError:
+            return 0
+
     def _guardar_en_archivo(self):
         """
         Guarda todos los productos actuales en el archivo de inventario.
         Sobrescribe el archivo con el estado actual del inventario.
+        En carga perezosa, las líneas que aún no se convirtieron se escriben
+        desde sus campos, sin crear el Producto: el archivo queda igual que
+        con la carga completa (las líneas inválidas no llegan a guardarse) y
+        guardar un cambio no obliga a convertir todo el archivo.
         Maneja excepciones de permisos y otros errores de escritura.
 
         Returns:
@@ -126,6 +280,11 @@ class Inventario:
                 f.write("# Archivo de inventario - Formato: id,nombre,cantidad,precio\n")
                 # Escribir cada producto en una línea
                 for producto in self._productos:
+                    if producto is None:
+                        continue
+                    if isinstance(producto, tuple):
+                        f.write("{},{},{},{}\n".format(*producto))
+                        continue
                     linea = (f"{producto.obtener_id()},"
                              f"{producto.obtener_nombre()},"
                              f"{producto.obtener_cantidad()},"
@@ -174,7 +333,7 @@ class Inventario:
 
         # Crear y añadir el producto en memoria
         nuevo_producto = Producto(id_producto, nombre, cantidad, precio)
-        self._productos.append(nuevo_producto)
+        self._insertar(nuevo_producto)
 
         # Guardar el inventario actualizado en el archivo
         if self._guardar_en_archivo():
@@ -194,21 +353,29 @@ class Inventario:
         Returns:
             bool: True si se eliminó exitosamente, False si no se encontró
         """
-        for i, producto in enumerate(self._productos):
-            if producto.obtener_id() == id_producto:
-                nombre = producto.obtener_nombre()
-                self._productos.pop(i)
+        posicion = self._posiciones.get(id_producto)
+        producto = None if posicion is None else self._materializar(posicion)
+        if producto is None:
+            print(f"❌ Error: No se encontró producto con ID {id_producto}.")
+            return False
 
-                # Guardar el inventario actualizado en el archivo
-                if self._guardar_en_archivo():
-                    print(f"✅ Producto '{nombre}' (ID: {id_producto}) eliminado y archivo actualizado.")
-                else:
-                    print(f"⚠️  Producto '{nombre}' eliminado en memoria, pero no se pudo actualizar el archivo.")
+        del self._posiciones[id_producto]
+        nombre = producto.obtener_nombre()
+        # Se deja un hueco en lugar de list.pop(i), que desplazaría todo lo posterior
+        self._productos[posicion] = None
+        self._huecos += 1
+        self._indice_nombres.eliminar(producto)
+        self._sumar_agregados(producto, -1)
+        self._ordenes.clear()
+        self._compactar_si_hace_falta()
 
-                return True
+        # Guardar el inventario actualizado en el archivo
+        if self._guardar_en_archivo():
+            print(f"✅ Producto '{nombre}' (ID: {id_producto}) eliminado y archivo actualizado.")
+        else:
+            print(f"⚠️  Producto '{nombre}' eliminado en memoria, pero no se pudo actualizar el archivo.")
 
-        print(f"❌ Error: No se encontró producto con ID {id_producto}.")
-        return False
+        return True
 
     def actualizar_cantidad(self, id_producto, nueva_cantidad):
         """
@@ -229,6 +396,9 @@ class Inventario:
         if producto:
             cantidad_anterior = producto.obtener_cantidad()
             producto.establecer_cantidad(nueva_cantidad)
+            self._unidades_totales += nueva_cantidad - cantidad_anterior
+            self._ajustar_valor((nueva_cantidad - cantidad_anterior) * producto.obtener_precio())
+            self._descartar_ordenes("cantidad", "valor")
 
             # Guardar el inventario actualizado en el archivo
             if self._guardar_en_archivo():
@@ -260,6 +430,8 @@ class Inventario:
         if producto:
             precio_anterior = producto.obtener_precio()
             producto.establecer_precio(nuevo_precio)
+            self._ajustar_valor(producto.obtener_cantidad() * (nuevo_precio - precio_anterior))
+            self._descartar_ordenes("precio", "valor")
 
             # Guardar el inventario actualizado en el archivo
             if self._guardar_en_archivo():
@@ -272,70 +444,305 @@ class Inventario:
         print(f"❌ Error: No se encontró producto con ID {id_producto}.")
         return False
 
-    def buscar_por_nombre(self, nombre_busqueda):
+    def buscar_por_nombre(self, nombre_busqueda, limite=None):
         """
         Busca productos cuyo nombre contenga la cadena de búsqueda (case-insensitive).
+        Usa el índice de trigramas, por lo que no recorre toda la lista.
 
         Args:
             nombre_busqueda (str): Parte del nombre a buscar
+            limite (int): Máximo de resultados a retornar (None = todos)
 
         Returns:
-            list: Lista de productos encontrados
+            list: Lista de productos encontrados, ordenados por relevancia
+        """
+        # Los nombres de las líneas aún no convertidas no están indexados
+        self._materializar_pendientes()
+        return self._indice_nombres.buscar(nombre_busqueda, limite)
+
+    def mostrar_todos_productos(self, clave=None, descendente=False):
         """
-        nombre_busqueda = nombre_busqueda.lower()
-        return [
-            producto for producto in self._productos
-            if nombre_busqueda in producto.obtener_nombre().lower()
-        ]
+        Muestra todos los productos en el inventario de forma formateada.
+        Las filas se generan de a una y se escriben en bloques (ver paginacion.py).
 
-    def mostrar_todos_productos(self):
-        """ Muestra todos los productos en el inventario de forma formateada."""
-        if not self._productos:
+        Args:
+            clave (str): Orden del listado (ver CLAVES_ORDEN); None = orden de inserción
+            descendente (bool): Listar de mayor a menor
+        """
+        if not self._posiciones:
             print("\n  El inventario está vacío.\n")
             return
 
-        print("\n" + "=" * 80)
-        print(f"{'ID':<5} {'Nombre':<25} {'Cantidad':<12} {'Precio':<15} {'Total':<15}")
-        print("=" * 80)
+        if clave is None:
+            productos = self._iterar_productos()
+            if descendente:
+                productos = reversed(list(productos))
+        else:
+            paginador = Paginador(self.ordenar_ids(clave), clave, descendente)
+            productos = self._productos_de(paginador)
+        escribir_lineas(self._lineas_listado(productos))
+
+    def ordenar_ids(self, clave="id"):
+        """
+        IDs de los productos ordenados por 'clave', de menor a mayor. La lista
+        se calcula una sola vez y se reutiliza hasta que un cambio la descarta;
+        no se debe modificar. El orden por ID no convierte las líneas
+        pendientes de la carga perezosa; los demás sí.
+
+        Args:
+            clave (str): Una de CLAVES_ORDEN
+
+        Returns:
+            list: Lista de IDs ordenada
+
+        Raises:
+            ValueError: Si la clave no existe
+        """
+        if clave not in CLAVES_ORDEN:
+            raise ValueError(f"Orden '{clave}' desconocido.")
+        ids = self._ordenes.get(clave)
+        if ids is None:
+            if clave == "id":
+                ids = sorted(self._posiciones)
+            else:
+                productos = sorted(self._iterar_productos(), key=CLAVES_ORDEN[clave])
+                ids = [producto.obtener_id() for producto in productos]
+            self._ordenes[clave] = ids
+        return ids
 
-        total_valor = 0
-        for producto in self._productos:
-            valor_producto = producto.obtener_cantidad() * producto.obtener_precio()
-            total_valor += valor_producto
-            print(f"{producto.obtener_id():<5} "
-                  f"{producto.obtener_nombre():<25} "
-                  f"{producto.obtener_cantidad():<12} "
-                  f"${producto.obtener_precio():<14.2f} "
-                  f"${valor_producto:<14.2f}")
+    def paginar_productos(self, clave="id", descendente=False, por_pagina=FILAS_POR_PAGINA):
+        """
+        Cursor por páginas sobre los IDs ordenados por 'clave'.
 
-        print("=" * 80)
-        print(f"{'VALOR TOTAL DEL INVENTARIO:':<57} ${total_valor:.2f}")
-        print("=" * 80 + "\n")
+        Args:
+            clave (str): Una de CLAVES_ORDEN
+            descendente (bool): Recorrer de mayor a menor
+            por_pagina (int): Productos por página
+
+        Returns:
+            Paginador: Posicionado en la primera página
+        """
+        return Paginador(self.ordenar_ids(clave), clave, descendente, por_pagina)
+
+    def mostrar_pagina(self, paginador):
+        """
+        Muestra la página actual de un Paginador con el mismo formato que
+        mostrar_todos_productos. Solo se buscan (y en carga perezosa se
+        convierten) los productos de esa página; el valor total aparece en
+        la última.
+
+        Args:
+            paginador (Paginador): Cursor creado con paginar_productos
+        """
+        if not paginador.total:
+            print("\n  El inventario está vacío.\n")
+            return
+
+        lineas = self._encabezado_listado()
+        productos = map(self._buscar_producto_por_id, paginador.actual())
+        lineas.extend(self._formatear_fila(p) for p in productos if p is not None)
+        lineas.append("=" * 80)
+        if paginador.es_ultima():
+            lineas.append(f"{'VALOR TOTAL DEL INVENTARIO:':<57} "
+                          f"${self.obtener_valor_total_inventario():.2f}")
+        lineas.append(paginador.resumen())
+        escribir_lineas(lineas)
+
+    def _productos_de(self, paginador):
+        """Genera los productos de todas las páginas, en el orden del paginador."""
+        for id_producto in paginador:
+            producto = self._buscar_producto_por_id(id_producto)
+            if producto is not None:
+                yield producto
+
+    def _lineas_listado(self, productos):
+        """Genera las líneas del listado completo (encabezado, filas y total)."""
+        yield from self._encabezado_listado()
+        yield from map(self._formatear_fila, productos)
+        yield "=" * 80
+        yield f"{'VALOR TOTAL DEL INVENTARIO:':<57} ${self.obtener_valor_total_inventario():.2f}"
+        yield "=" * 80 + "\n"
+
+    @staticmethod
+    def _encabezado_listado():
+        """Líneas de encabezado de la tabla de productos."""
+        return ["", "=" * 80,
+                f"{'ID':<5} {'Nombre':<25} {'Cantidad':<12} {'Precio':<15} {'Total':<15}",
+                "=" * 80]
+
+    @staticmethod
+    def _formatear_fila(producto):
+        """Fila de la tabla de productos."""
+        cantidad = producto.obtener_cantidad()
+        precio = producto.obtener_precio()
+        return (f"{producto.obtener_id():<5} "
+                f"{producto.obtener_nombre():<25} "
+                f"{cantidad:<12} "
+                f"${precio:<14.2f} "
+                f"${cantidad * precio:<14.2f}")
 
     # ============== MÉTODOS PRIVADOS (AUXILIARES) ==============
 
     def _id_existe(self, id_producto):
-        """Verifica si ya existe un producto con el ID especificado."""
-        return any(producto.obtener_id() == id_producto for producto in self._productos)
+        """Verifica si ya existe un producto con el ID especificado (O(1))."""
+        return id_producto in self._posiciones
 
     def _buscar_producto_por_id(self, id_producto):
-        """Busca un producto por su ID. Retorna el producto o None si no existe."""
-        for producto in self._productos:
-            if producto.obtener_id() == id_producto:
-                return producto
-        return None
+        """Busca un producto por su ID en O(1). Retorna el producto o None si no existe."""
+        posicion = self._posiciones.get(id_producto)
+        if posicion is None:
+            return None
+        return self._materializar(posicion)
+
+    def _insertar(self, producto):
+        """Agrega el producto al final de la lista y lo registra en los índices."""
+        self._posiciones[producto.obtener_id()] = len(self._productos)
+        self._productos.append(producto)
+        self._indice_nombres.agregar(producto, producto.obtener_nombre())
+        self._sumar_agregados(producto, 1)
+        self._ordenes.clear()
+
+    def _materializar_pendientes(self):
+        """En carga perezosa, convierte todas las líneas que aún no son Producto."""
+        if self._perezosos:
+            for _ in self._iterar_productos():
+                pass
+
+    def _iterar_productos(self):
+        """Recorre los productos en orden de inserción, saltando los huecos."""
+        if not self._perezosos:
+            return (producto for producto in self._productos if producto is not None)
+        return (
+            producto for producto in map(self._materializar, range(len(self._productos)))
+            if producto is not None
+        )
+
+    def _compactar_si_hace_falta(self):
+        """
+        Cuando más de la mitad de la lista son huecos, la reconstruye sin ellos
+        y recalcula las posiciones. El costo O(n) se reparte entre las n/2
+        eliminaciones previas, así que eliminar sigue siendo O(1) amortizado.
+        """
+        if self._huecos * 2 <= len(self._productos):
+            return
+        # Las líneas pendientes (tuplas) se conservan sin convertir
+        self._productos = [registro for registro in self._productos if registro is not None]
+        self._posiciones = {
+            (registro[0] if isinstance(registro, tuple) else registro.obtener_id()): posicion
+            for posicion, registro in enumerate(self._productos)
+        }
+        self._huecos = 0
+
+    def _descartar_ordenes(self, *claves):
+        """Descarta las ordenaciones guardadas que dependen de un dato que cambió."""
+        for clave in claves:
+            self._ordenes.pop(clave, None)
 
     def obtener_cantidad_productos(self):
         """Retorna la cantidad total de productos diferentes en el inventario."""
-        return len(self._productos)
+        return len(self._posiciones)
 
-    def obtener_valor_total_inventario(self):
-        """Retorna el valor total de todos los productos en el inventario."""
-        return sum(
-            producto.obtener_cantidad() * producto.obtener_precio()
-            for producto in self._productos
-        )
+    def _columnas(self):
+        """
+        Extrae los datos del inventario como tres listas paralelas en una sola pasada.
+
+        Returns:
+            tuple: (ids, cantidades, precios)
+        """
+        ids, cantidades, precios = [], [], []
+        for producto in self._iterar_productos():
+            ids.append(producto.obtener_id())
+            cantidades.append(producto.obtener_cantidad())
+            precios.append(producto.obtener_precio())
+        return ids, cantidades, precios
+
+    def obtener_estadisticas(self, umbral_stock_bajo=5, top_n=5):
+        """
+        Calcula todas las estadísticas del inventario de una vez (ver estadisticas.py).
 
+        Args:
+            umbral_stock_bajo (int): Cantidad por debajo de la cual se alerta stock bajo
+            top_n (int): Cuántos productos de mayor valor retornar
+
+        Returns:
+            dict: Totales, promedio, percentiles, IDs con stock bajo y top por valor
+        """
+        ids, cantidades, precios = self._columnas()
+        return calcular_estadisticas(ids, cantidades, precios, umbral_stock_bajo, top_n)
 
+    # ============== AGREGADOS INCREMENTALES ==============
 
+    @staticmethod
+    def _categoria(nombre):
+        """Categoría de un producto: la primera palabra de su nombre."""
+        palabras = nombre.split()
+        return palabras[0].lower() if palabras else ""
 
+    def _sumar_agregados(self, producto, signo):
+        """
+        Suma (signo=1) o resta (signo=-1) un producto de los agregados en O(1).
+        Los agregados solo son correctos si los cambios pasan por el Inventario
+        (agregar, eliminar, actualizar), no por los setters de Producto.
+        """
+        cantidad = producto.obtener_cantidad()
+        self._unidades_totales += signo * cantidad
+        self._ajustar_valor(signo * cantidad * producto.obtener_precio())
+        categoria = self._categoria(producto.obtener_nombre())
+        conteo = self._conteo_categorias.get(categoria, 0) + signo
+        if conteo:
+            self._conteo_categorias[categoria] = conteo
+        else:
+            del self._conteo_categorias[categoria]
+
+    def _ajustar_valor(self, diferencia):
+        """
+        Suma 'diferencia' al valor total mantenido (después de actualizar las
+        unidades). Sin unidades en stock el valor es exactamente 0, así que
+        se reinicia y no queda el error de redondeo acumulado (por ejemplo
+        -2.3e-14, que se mostraría como "$-0.00").
+        """
+        if self._unidades_totales:
+            self._valor_total += diferencia
+        else:
+            self._valor_total = 0.0
+
+    def obtener_unidades_totales(self):
+        """Retorna el total de unidades en stock (O(1))."""
+        self._materializar_pendientes()
+        return self._unidades_totales
+
+    def obtener_conteo_categorias(self):
+        """Retorna una copia de {categoría: cantidad de productos} (O(1) por consulta)."""
+        self._materializar_pendientes()
+        return dict(self._conteo_categorias)
+
+    def verificar_agregados(self):
+        """
+        Recalcula los agregados recorriendo todo el inventario y los compara con
+        los valores mantenidos de forma incremental.
+
+        Returns:
+            bool: True si coinciden, False si hay alguna diferencia
+        """
+        unidades, valor, categorias = 0, 0.0, {}
+        for producto in self._iterar_productos():
+            unidades += producto.obtener_cantidad()
+            valor += producto.obtener_cantidad() * producto.obtener_precio()
+            categoria = self._categoria(producto.obtener_nombre())
+            categorias[categoria] = categorias.get(categoria, 0) + 1
+
+        correcto = (unidades == self._unidades_totales
+                    and math.isclose(valor, self._valor_total, rel_tol=1e-9)
+                    and categorias == self._conteo_categorias)
+        if not correcto:
+            print(f"⚠️  Agregados inconsistentes: unidades {self._unidades_totales} vs {unidades}, "
+                  f"valor {self._valor_total:.2f} vs {valor:.2f}")
+        return correcto
+
+    def obtener_valor_total_inventario(self):
+        """
+        Retorna el valor total de todos los productos en el inventario (O(1)),
+        redondeado a centavos (+ 0.0 convierte un -0.0 en 0.0).
+        """
+        self._materializar_pendientes()
+        return round(self._valor_total, 2) + 0.0
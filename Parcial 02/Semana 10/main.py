@@ -2,10 +2,26 @@
 Módulo: main.py
 Descripción: Interfaz de usuario en consola para el Sistema de Gestión de Inventarios.
              Los datos se cargan automáticamente desde el archivo 'inventario.txt' al iniciar.
+Uso: python main.py [--instrumentar] [--perfil sesion.prof] [--perezosa] [--timing]
+     --instrumentar  mide cada operación (opción 7 del menú muestra el reporte)
+     --perfil        ejecuta la sesión bajo cProfile/tracemalloc y guarda el perfil
+     --perezosa      inicio rápido: al cargar cada línea solo se valida y cada
+                     producto se convierte cuando se usa
+     --timing        informa cuánto tardó la carga del inventario
 Autor: Sistema de Gestión de Inventarios
 """
 
+import argparse
+import json
+import time
+from contextlib import nullcontext
+
+from instrumentacion import sesion_perfilada
 from inventario_modificado import Inventario
+from paginacion import leer_orden, navegar
+
+# Archivo donde la opción de rendimiento guarda las métricas en JSON
+ARCHIVO_METRICAS = "rendimiento.json"
 
 
 def mostrar_menu_principal():
@@ -19,7 +35,8 @@ def mostrar_menu_principal():
     print("4. 🔍 Buscar producto por nombre")
     print("5. 📊 Ver todos los productos")
     print("6. 📈 Ver estadísticas del inventario")
-    print("7. 🚪 Salir")
+    print("7. ⏱️  Ver reporte de rendimiento")
+    print("8. 🚪 Salir")
     print("=" * 60)
 
 
@@ -30,15 +47,28 @@ class InterfazInventario:
     Al iniciar, carga automáticamente los datos desde el archivo de inventario.
     """
 
-    def __init__(self):
+    def __init__(self, instrumentar=False, carga_perezosa=False, timing=False):
         """
         Constructor que inicializa el inventario.
         La carga de datos desde el archivo ocurre automáticamente dentro de Inventario.__init__().
+
+        Args:
+            instrumentar (bool): Medir las operaciones del inventario (ver instrumentacion.py)
+            carga_perezosa (bool): Solo validar las líneas al iniciar (ver Inventario)
+            timing (bool): Mostrar cuánto tardó la carga
         """
         print("\n¡Bienvenido al Sistema de Gestión de Inventarios!")
         print("-" * 60)
         # El constructor de Inventario ya se encarga de cargar el archivo
-        self.inventario = Inventario()
+        inicio = time.perf_counter()
+        self.inventario = Inventario(carga_perezosa=carga_perezosa, instrumentar=instrumentar)
+        if timing:
+            # process_time() cuenta la CPU desde que arrancó el proceso: incluye
+            # el inicio de Python y los imports, no solo la carga del inventario
+            modo = "perezosa" if carga_perezosa else "completa"
+            print(f"⏱️  Carga {modo} de {self.inventario.obtener_cantidad_productos()} productos: "
+                  f"{(time.perf_counter() - inicio) * 1000:.0f} ms "
+                  f"(CPU desde el inicio del proceso: {time.process_time() * 1000:.0f} ms)")
 
     def opcion_agregar_producto(self):
         """Maneja la opción de agregar un nuevo producto."""
@@ -134,23 +164,69 @@ class InterfazInventario:
     def opcion_ver_todos(self):
         """Maneja la opción de ver todos los productos."""
         print("\n--- TODOS LOS PRODUCTOS EN EL INVENTARIO ---")
-        self.inventario.mostrar_todos_productos()
+        try:
+            clave, descendente = leer_orden(input(
+                "Ordenar por id, nombre, cantidad, precio o valor ('-' delante = descendente) [id]: "))
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+            return
+        navegar(self.inventario.paginar_productos(clave, descendente),
+                self.inventario.mostrar_pagina)
 
     def opcion_estadisticas(self):
-        """Muestra estadísticas generales del inventario."""
+        """Muestra estadísticas generales del inventario (calculadas en una sola pasada)."""
         print("\n--- ESTADÍSTICAS DEL INVENTARIO ---")
         print("=" * 60)
+        # Totales en O(1): el inventario los mantiene actualizados en cada cambio
         cantidad_productos = self.inventario.obtener_cantidad_productos()
         valor_total = self.inventario.obtener_valor_total_inventario()
 
         print(f"Total de productos diferentes: {cantidad_productos}")
+        print(f"Total de unidades en stock: {self.inventario.obtener_unidades_totales()}")
         print(f"Valor total del inventario: ${valor_total:.2f}")
 
         if cantidad_productos > 0:
             print(f"Valor promedio por producto: ${valor_total / cantidad_productos:.2f}")
 
+            categorias = self.inventario.obtener_conteo_categorias()
+            principales = sorted(categorias.items(), key=lambda c: (-c[1], c[0]))[:5]
+            print("Categorías principales: "
+                  + ", ".join(f"{nombre} ({conteo})" for nombre, conteo in principales))
+
+            # Percentiles, top y stock bajo sí requieren recorrer los datos
+            estadisticas = self.inventario.obtener_estadisticas()
+            percentiles = " | ".join(f"P{p}: ${v:.2f}" for p, v in estadisticas["percentiles"].items())
+            print(f"Percentiles del valor por producto: {percentiles}")
+
+            print("\nProductos de mayor valor:")
+            for id_producto, valor in estadisticas["top"]:
+                print(f"  ID {id_producto:<6} ${valor:.2f}")
+
+            stock_bajo = estadisticas["stock_bajo"]
+            print(f"\nProductos con stock bajo (< 5 unidades): {len(stock_bajo)}")
+            if stock_bajo:
+                print("  IDs: " + ", ".join(str(i) for i in stock_bajo[:20])
+                      + (" ..." if len(stock_bajo) > 20 else ""))
+
         print("=" * 60 + "\n")
 
+    def opcion_rendimiento(self):
+        """Muestra las métricas de cada operación y permite guardarlas en JSON."""
+        print("\n--- REPORTE DE RENDIMIENTO ---")
+        instrumentacion = self.inventario.instrumentacion
+        print(instrumentacion.reporte())
+        if not instrumentacion.activa:
+            return
+
+        guardar = input(f"\n¿Guardar las métricas en '{ARCHIVO_METRICAS}'? (s/n): ").lower()
+        if guardar == 's':
+            try:
+                with open(ARCHIVO_METRICAS, "w", encoding="utf-8") as f:
+                    json.dump(instrumentacion.datos(), f, indent=4, ensure_ascii=False)
+                print(f"✅ Métricas guardadas en '{ARCHIVO_METRICAS}'.")
+            except OSError as e:
+                print(f"❌ Error al escribir '{ARCHIVO_METRICAS}': {e}.")
+
     def ejecutar(self):
         """
         Ejecuta el loop principal de la aplicación.
@@ -158,7 +234,7 @@ class InterfazInventario:
         """
         while True:
             mostrar_menu_principal()
-            opcion = input("Seleccione una opción (1-7): ").strip()
+            opcion = input("Seleccione una opción (1-8): ").strip()
 
             if opcion == "1":
                 self.opcion_agregar_producto()
@@ -173,19 +249,34 @@ class InterfazInventario:
             elif opcion == "6":
                 self.opcion_estadisticas()
             elif opcion == "7":
+                self.opcion_rendimiento()
+            elif opcion == "8":
                 print("\n✅ ¡Gracias por usar el Sistema de Gestión de Inventarios!")
                 print("   Los datos han sido guardados automáticamente. ¡Hasta luego!\n")
                 break
             else:
-                print("❌ Opción no válida. Por favor, seleccione una opción entre 1 y 7.")
+                print("❌ Opción no válida. Por favor, seleccione una opción entre 1 y 8.")
 
             input("\nPresione Enter para continuar...")
 
 
 def main():
     """Función principal que inicia la aplicación."""
-    aplicacion = InterfazInventario()
-    aplicacion.ejecutar()
+    parser = argparse.ArgumentParser(description="Sistema de Gestión de Inventarios")
+    parser.add_argument("--instrumentar", action="store_true",
+                        help="medir llamadas, latencias y bytes escritos")
+    parser.add_argument("--perfil", metavar="ARCHIVO",
+                        help="perfilar la sesión con cProfile y tracemalloc")
+    parser.add_argument("--perezosa", action="store_true",
+                        help="inicio rápido: convertir cada producto recién cuando se usa")
+    parser.add_argument("--timing", action="store_true",
+                        help="mostrar cuánto tardó la carga del inventario")
+    args = parser.parse_args()
+
+    with sesion_perfilada(args.perfil) if args.perfil else nullcontext():
+        aplicacion = InterfazInventario(instrumentar=args.instrumentar,
+                                        carga_perezosa=args.perezosa, timing=args.timing)
+        aplicacion.ejecutar()
 
 
 if __name__ == "__main__":
@@ -16,6 +16,10 @@ class Producto:
         precio (float): Precio unitario del producto
     """
 
+    # Sin __dict__ por instancia: los atributos se guardan en espacios fijos,
+    # lo que reduce la memoria por producto y acelera el acceso
+    __slots__ = ("_id", "_nombre", "_cantidad", "_precio")
+
     def __init__(self, id_producto, nombre, cantidad, precio):
         """
         Constructor de la clase Producto.
@@ -9,10 +9,78 @@ Colecciones utilizadas:
 - Conjunto (set): registro de IDs usados para evitar duplicados rápidamente
 - Lista (list): resultados de búsquedas temporales
 - Tupla (tuple): representación inmutable de un snapshot de producto
+
+Modo diario (opcional, "python Inventario.py --diario"):
+  En lugar de reescribir todo inventario.json en cada cambio, cada operación
+  se agrega como una línea JSON al final de inventario.log (O(1) por cambio).
+  Al iniciar se carga el snapshot y se reproducen las operaciones del diario;
+  cuando el diario crece, un hilo en segundo plano lo compacta en un nuevo
+  snapshot.
+
+Autoguardado (opcional, "python Inventario.py --autoguardado"):
+  Los cambios solo marcan el inventario como modificado y un hilo en segundo
+  plano agrupa las escrituras (como máximo una cada 500 ms o cada 100
+  cambios). Al salir con la opción 8 o con SIGTERM se guarda lo pendiente.
+
+Varias cajas (procesos) con los mismos archivos:
+  Cada guardado toma un bloqueo entre procesos (inventario.json.lock) y
+  antes de escribir incorpora lo que otras cajas guardaron, detectado por la
+  firma del archivo (inodo, mtime, tamaño). En el menú, antes de cada opción
+  se llama a recargar(), que solo toca los productos que cambiaron.
+
+Almacenamiento (ver almacenamiento.py):
+  Por defecto los datos se guardan en inventario.json. Con "--sqlite" se usa
+  inventario.db (cada cambio actualiza solo su fila) y con "--texto" el
+  formato inventario.txt de Semana 10.
+
+Rendimiento (ver instrumentacion.py):
+  Con "--instrumentar" se cuentan llamadas, latencias y bytes escritos de
+  cada operación (opción 6 del menú). Con "--perfil sesion.prof" toda la
+  sesión corre bajo cProfile y tracemalloc.
+
+Inicio rápido ("python Inventario.py --perezosa"):
+  Al iniciar solo se arma el diccionario por ID con las tuplas leídas del
+  disco; cada Producto se crea cuando se usa y los índices de nombres,
+  cantidad y precio se arman de una vez en la primera búsqueda, consulta
+  por rango, estadística o listado ordenado. Con "--timing" se informa
+  cuánto tardó la carga.
+  Con JSON o texto, en este modo junto al archivo se guarda un índice
+  auxiliar (inventario.json.idx, ver indice_archivo.py) con la posición de
+  cada producto en el archivo y las palabras de cada nombre: al iniciar no
+  hace falta leer el archivo, cada producto se lee de su posición cuando se
+  usa y la búsqueda por nombre funciona sin completar la carga.
+
+Movimientos de stock (ver movimientos.py):
+  Cada alta, baja, venta, reposición o ajuste de cantidad se registra en
+  movimientos.db con su instante y motivo, junto con totales por hora y por
+  día ("python movimientos.py --dias 30" lista las unidades vendidas).
+  Con esas ventas, la opción 7 del menú sugiere qué pedir (pronostico.py).
 """
 
+from __future__ import annotations
+
+import argparse
 import json
 import os
+import signal
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+from almacenamiento import (Almacenamiento, AlmacenamientoJSON,
+                            AlmacenamientoSQLite, AlmacenamientoTexto)
+from cerrojos import (CerrojoLecturaEscritura, CerrojoNulo, CerrojosPorProducto,
+                      FranjasNulas)
+from indice_nombres import IndiceNombres
+from indices_ordenados import IndiceOrdenado
+from instrumentacion import Instrumentacion, InstrumentacionNula, sesion_perfilada
+from movimientos import (AJUSTE, ALTA, ARCHIVO_MOVIMIENTOS, BAJA, REPOSICION, VENTA,
+                         LibroMovimientos)
+from paginacion import (CLAVES_ORDEN, FILAS_POR_PAGINA, LINEAS_POR_ESCRITURA, Paginador,
+                        escribir_lineas, leer_orden, navegar)
+from snapshot_binario import SnapshotBinario, escribir_snapshot
 
 # ─────────────────────────────────────────────
 # CLASE PRODUCTO
@@ -20,6 +88,11 @@ import os
 class Producto:
     """Representa un producto dentro del inventario."""
 
+    # Sin __dict__ por instancia: con cientos de miles de productos el ahorro
+    # de memoria es grande. Los nombres con __ se transforman igual que los
+    # atributos (_Producto__id_producto, ...).
+    __slots__ = ("__id_producto", "__nombre", "__cantidad", "__precio")
+
     def __init__(self, id_producto: str, nombre: str, cantidad: int, precio: float):
         self.__id_producto = id_producto   # Atributo privado – ID único
         self.__nombre = nombre
@@ -74,6 +147,81 @@ class Producto:
                 f"Cantidad: {self.__cantidad:<6} | Precio: ${self.__precio:.2f}")
 
 
+# ─────────────────────────────────────────────
+# CLASE AUTOGUARDADO
+# ─────────────────────────────────────────────
+class AutoGuardado:
+    """
+    Hilo en segundo plano que agrupa (debounce) las escrituras a disco.
+
+    Cada cambio llama a marcar(); el hilo espera hasta que pasen
+    'intervalo_ms' desde el primer cambio pendiente o se acumulen
+    'max_cambios', y entonces llama una sola vez a la función 'guardar'.
+    """
+
+    def __init__(self, guardar, intervalo_ms: int = 500, max_cambios: int = 100):
+        self.__guardar = guardar
+        self.__intervalo = intervalo_ms / 1000
+        self.__max_cambios = max_cambios
+        self.__condicion = threading.Condition()
+        self.__cerrojo_guardado = threading.Lock()   # Evita dos guardados simultáneos
+        self.__cambios = 0
+        self.__primer_cambio = 0.0
+        self.__activo = True
+        self.__hilo = threading.Thread(target=self.__trabajar, name="autoguardado", daemon=True)
+        self.__hilo.start()
+
+    def marcar(self, cambios: int = 1):
+        """Registra cambios pendientes de guardar (no escribe nada)."""
+        with self.__condicion:
+            if not self.__cambios:
+                self.__primer_cambio = time.monotonic()
+            self.__cambios += cambios
+            self.__condicion.notify()
+
+    def vaciar(self):
+        """Guarda de inmediato si hay cambios pendientes."""
+        with self.__condicion:
+            pendientes, self.__cambios = self.__cambios, 0
+        if pendientes:
+            self.__ejecutar_guardado()
+
+    def detener(self):
+        """Guarda lo pendiente y termina el hilo."""
+        with self.__condicion:
+            self.__activo = False
+            self.__condicion.notify()
+        self.__hilo.join()
+
+    def __ejecutar_guardado(self):
+        with self.__cerrojo_guardado:
+            try:
+                self.__guardar()
+            except OSError as e:
+                print(f"\n⚠  Autoguardado fallido: {e}. Se reintentará con el próximo cambio.")
+
+    def __trabajar(self):
+        while True:
+            with self.__condicion:
+                while self.__activo and not self.__cambios:
+                    self.__condicion.wait()
+                # Esperar a que se acumulen más cambios o se cumpla el intervalo
+                while self.__activo and self.__cambios < self.__max_cambios:
+                    restante = self.__primer_cambio + self.__intervalo - time.monotonic()
+                    if restante <= 0:
+                        break
+                    self.__condicion.wait(restante)
+                # Se reinicia el contador ANTES de copiar los datos: un cambio
+                # posterior vuelve a marcar y provoca otro guardado
+                pendientes, self.__cambios = self.__cambios, 0
+                activo = self.__activo
+
+            if pendientes:
+                self.__ejecutar_guardado()
+            if not activo:
+                return
+
+
 # ─────────────────────────────────────────────
 # CLASE INVENTARIO
 # ─────────────────────────────────────────────
@@ -82,92 +230,734 @@ class Inventario:
     Gestiona la colección de productos.
 
     Colecciones internas:
-    - self.__productos (dict):  clave = ID, valor = objeto Producto
+    - self.__productos (dict):  clave = ID, valor = objeto Producto (o, con
+                                carga perezosa, la tupla leída del disco
+                                o su posición en el índice auxiliar hasta
+                                que se usa)
     - self.__ids_usados (set):  conjunto de IDs ya registrados (búsqueda O(1))
+    - self.__indice_nombres:    índice invertido de tokens/trigramas para
+                                buscar_por_nombre sin recorrer todo el dict
+    - self.__por_cantidad / self.__por_precio: listas ordenadas (valor, id)
+                                para consultas por rango en O(log n + k)
+    - self.__ordenes (dict):    órdenes por id, nombre y valor para el listado
+                                por páginas, reutilizados mientras no cambie
+                                la versión de la que dependen
+
+    Con hilos_seguros=True se puede usar desde varios hilos: las consultas
+    toman el cerrojo de lectura (muchas a la vez), las altas, bajas y cargas
+    el de escritura (exclusivo), y los cambios de stock o precio el de
+    lectura más la franja del producto, así ventas de productos distintos
+    no se esperan entre sí. Las operaciones se escriben a disco desde una
+    cola, en el mismo orden en que se aplicaron en memoria.
     """
 
-    ARCHIVO_DATOS = "inventario.json"
+    ARCHIVO_DATOS = "inventario.json"    # Backend por defecto (AlmacenamientoJSON)
+    ARCHIVO_BINARIO = "inventario.bin"   # Snapshot columnar (snapshot_binario.py)
+    ARCHIVO_JSONL = "inventario.jsonl"   # Exportación JSON Lines (un producto por línea)
+    ARCHIVO_DIARIO = "inventario.log"    # Diario de operaciones (modo diario)
+    LIMITE_DIARIO = 1000                 # Entradas antes de compactar
+    LOTE_IMPORTACION = 5000              # Líneas por escritura al importar JSON Lines
+    COPIAS_SNAPSHOT = 3                  # Snapshots anteriores: inventario.json.1 .. .3
+    OPERACIONES_MEDIDAS = (              # Métodos que se miden con instrumentar=True
+        "agregar_producto", "eliminar_producto", "actualizar_producto", "ajustar_cantidad",
+        "renombrar_producto", "agregar_muchos", "actualizar_muchos", "buscar_por_nombre",
+        "productos_por_cantidad", "productos_por_precio", "alerta_stock_bajo",
+        "mostrar_todos", "mostrar_pagina", "estadisticas", "guardar_en_archivo", "cargar_desde_archivo",
+        "recargar", "compactar", "sugerir_pedidos",
+    )
 
-    def __init__(self):
+    def __init__(self, modo_diario: bool = False, autoguardado_ms: int = None,
+                 autoguardado_cambios: int = 100, almacenamiento: Almacenamiento = None,
+                 hilos_seguros: bool = False, instrumentar: bool = False,
+                 movimientos: LibroMovimientos = None, carga_perezosa: bool = False):
         self.__productos: dict[str, Producto] = {}   # Diccionario principal
         self.__ids_usados: set[str] = set()           # Conjunto de IDs
+        self.__indice_nombres = IndiceNombres()       # Búsqueda por nombre
+        self.__por_cantidad = IndiceOrdenado()        # Rango de stock
+        self.__por_precio = IndiceOrdenado()          # Rango de precio
+        self.__ordenes: dict[str, tuple] = {}         # Clave → (versión, IDs ordenados)
+        self.__version_catalogo = 0                   # Cambia con altas, bajas y nombres
+        self.__version_stock = 0                      # Cambia con cantidades y precios
+
+        # Carga perezosa: al iniciar, el diccionario guarda las tuplas leídas
+        # del disco y solo se crea el Producto de los que se usan. Mientras
+        # __completo sea False los índices de nombres, cantidad y precio están
+        # vacíos; se arman de una vez al primer uso (ver __completar)
+        self.__completo = not carga_perezosa
+        # Índice auxiliar del archivo (indice_archivo.py) con el que se hizo
+        # la carga perezosa: los valores int del diccionario son posiciones
+        # en él. Mientras la carga no esté completa, __nombres_cambiados
+        # tiene los IDs cuyo nombre puede no ser el del índice
+        self.__indice_archivo = None
+        self.__nombres_cambiados: set[str] = set()
+        self.__posiciones = (None, {})                # (versión, ID → orden de alta)
+
+        # Concurrencia entre hilos (sin costo si hilos_seguros es False)
+        self.__cerrojo = CerrojoLecturaEscritura() if hilos_seguros else CerrojoNulo()
+        self.__franjas = CerrojosPorProducto() if hilos_seguros else FranjasNulas()
+        self.__cerrojo_indices = threading.Lock() if hilos_seguros else nullcontext()
+        self.__cola: deque[dict] = deque()           # Operaciones por escribir, en orden
+        self.__cerrojo_persistencia = threading.Lock()
+
+        # Dónde se guardan los datos; si el backend guarda fila por fila
+        # (SQLite), el diario y el autoguardado no aportan nada y se ignoran
+        self.__almacenamiento = almacenamiento or AlmacenamientoJSON(
+            self.ARCHIVO_DATOS, self.COPIAS_SNAPSHOT)
+        por_fila = self.__almacenamiento.por_fila
+        if carga_perezosa:    # Al guardar se escribe también el índice auxiliar
+            self.__almacenamiento.indexar = True
+
+        # Estado del modo diario (append-only log)
+        self.__modo_diario = modo_diario and not por_fila
+        self.__cerrojo_diario = threading.Lock()
+        self.__archivo_diario = None                  # Manejador abierto en modo "ab"
+        self.__entradas_diario = 0
+        self.__inodo_diario = None                    # Diario leído hasta esta posición
+        self.__posicion_diario = 0
+        self.__tamano_rotado = None                   # inventario.log.1 al leerlo (None: no existía)
+        self.__hilo_compactacion: threading.Thread | None = None
+
+        # Cambios de otras cajas (procesos) sobre los mismos archivos
+        self.__firma = None                           # Versión del disco reflejada en memoria
+        self.__sucios: set[str] = set()               # IDs cambiados aquí y aún no guardados
+        self.__cerrojo_sucios = threading.Lock()
+
+        # Estado de lotes (transacciones): operaciones pendientes de guardar
+        self.__profundidad_lote = 0
+        self.__hilo_lote = None                       # Hilo dueño del lote en curso
+        self.__pendientes: list[dict] = []
+
+        # Libro de movimientos opcional: se registran al escribir la cola,
+        # así lo que un lote deshace nunca llega al libro
+        self.__libro = movimientos
+        self.__cola_movimientos: deque[tuple] = deque()
+        self.__movimientos_lote: list[tuple] = []
+
+        # Métricas opcionales: se reemplazan los métodos de esta instancia por
+        # versiones medidas (antes de cargar, para medir también la carga)
+        self.__instrumentacion = Instrumentacion() if instrumentar else InstrumentacionNula()
+        self.__instrumentacion.instrumentar(self, self.OPERACIONES_MEDIDAS)
+        self.__instrumentacion.instrumentar(
+            self.__almacenamiento, ("guardar_todo", "aplicar"), prefijo="almacenamiento.",
+            bytes_de={"guardar_todo": self.__almacenamiento.tamano})
 
         # Cargar datos persistidos si existen
         self.cargar_desde_archivo()
 
+        # Autoguardado en segundo plano (solo tiene sentido sin diario ni
+        # backend por fila, que ya escriben en O(1) por cambio)
+        self.__autoguardado: AutoGuardado | None = None
+        if autoguardado_ms is not None and not modo_diario and not por_fila:
+            self.__autoguardado = AutoGuardado(self.guardar_en_archivo,
+                                               autoguardado_ms, autoguardado_cambios)
+
     # ── Añadir producto ───────────────────────
     def agregar_producto(self, id_producto: str, nombre: str,
-                         cantidad: int, precio: float):
-        """Añade un nuevo producto al inventario."""
-        if id_producto in self.__ids_usados:
-            print(f"\n  Ya existe un producto con el ID '{id_producto}'.")
-            return
+                         cantidad: int, precio: float) -> bool:
+        """Añade un nuevo producto al inventario. Retorna False si el ID ya existe."""
+        with self.__cambio(id_producto):
+            if id_producto in self.__ids_usados:
+                print(f"\n  Ya existe un producto con el ID '{id_producto}'.")
+                return False
 
-        producto = Producto(id_producto, nombre, cantidad, precio)
-        self.__productos[id_producto] = producto   # Inserción en diccionario
-        self.__ids_usados.add(id_producto)          # Registro en conjunto
-        self.guardar_en_archivo()
+            producto = Producto(id_producto, nombre, cantidad, precio)
+            self.__registrar(producto)
+            self._persistir({"op": "agregar", "producto": producto.a_diccionario()})
+            self.__movimiento(id_producto, producto.get_cantidad(), ALTA)
         print(f"\n✔  Producto '{nombre}' agregado correctamente.")
+        return True
 
     # ── Eliminar producto ─────────────────────
-    def eliminar_producto(self, id_producto: str):
-        """Elimina un producto del inventario por su ID."""
-        if id_producto not in self.__ids_usados:
-            print(f"\n No se encontró ningún producto con ID '{id_producto}'.")
-            return
+    def eliminar_producto(self, id_producto: str) -> bool:
+        """Elimina un producto del inventario por su ID. Retorna False si no existe."""
+        with self.__cambio(id_producto):
+            if id_producto not in self.__ids_usados:
+                print(f"\n No se encontró ningún producto con ID '{id_producto}'.")
+                return False
 
-        nombre = self.__productos[id_producto].get_nombre()
-        del self.__productos[id_producto]
-        self.__ids_usados.discard(id_producto)
-        self.guardar_en_archivo()
+            producto = self.__producto(id_producto)
+            nombre = producto.get_nombre()
+            self.__desregistrar(id_producto)
+            self._persistir({"op": "eliminar", "id": id_producto})
+            self.__movimiento(id_producto, -producto.get_cantidad(), BAJA)
         print(f"\n✔  Producto '{nombre}' (ID: {id_producto}) eliminado.")
+        return True
 
     # ── Actualizar producto ───────────────────
     def actualizar_producto(self, id_producto: str,
                             nueva_cantidad: int = None,
-                            nuevo_precio: float = None):
-        """Actualiza la cantidad y/o el precio de un producto."""
-        if id_producto not in self.__ids_usados:
-            print(f"\n No se encontró ningún producto con ID '{id_producto}'.")
+                            nuevo_precio: float = None) -> bool:
+        """Actualiza la cantidad y/o el precio de un producto. Retorna False si no existe."""
+        # Solo cambia este producto: cerrojo compartido + franja del producto
+        with self.__cambio(id_producto, exclusivo=False):
+            if id_producto not in self.__ids_usados:
+                print(f"\n No se encontró ningún producto con ID '{id_producto}'.")
+                return False
+
+            producto = self.__producto(id_producto)
+            anterior = producto.get_cantidad()
+            self.__modificar(producto, nueva_cantidad, nuevo_precio)
+
+            self._persistir({"op": "actualizar", "producto": producto.a_diccionario()})
+            self.__movimiento(id_producto, producto.get_cantidad() - anterior, AJUSTE)
+        print(f"\n✔  Producto '{producto.get_nombre()}' actualizado correctamente.")
+        return True
+
+    # ── Venta / reposición ────────────────────
+    def ajustar_cantidad(self, id_producto: str, diferencia: int,
+                         motivo: str = None) -> int | None:
+        """
+        Suma 'diferencia' al stock: negativa para una venta, positiva para una
+        reposición. Leer y escribir la cantidad ocurre dentro de la franja del
+        producto, así dos hilos que venden el mismo producto a la vez no
+        pierden ninguna actualización. Lanza ValueError si no hay stock
+        suficiente. Retorna la nueva cantidad.
+
+        'motivo' es el que queda en el libro de movimientos; por defecto
+        "venta" si la diferencia es negativa y "reposición" si es positiva.
+        """
+        with self.__cambio(id_producto, exclusivo=False):
+            producto = self.__producto(id_producto)
+            if producto is None:
+                print(f"\n No se encontró ningún producto con ID '{id_producto}'.")
+                return None
+
+            nueva_cantidad = producto.get_cantidad() + diferencia
+            if nueva_cantidad < 0:
+                raise ValueError(f"Stock insuficiente de '{producto.get_nombre()}' "
+                                 f"(hay {producto.get_cantidad()}).")
+            self.__modificar(producto, nueva_cantidad)
+            self._persistir({"op": "actualizar", "producto": producto.a_diccionario()})
+            self.__movimiento(id_producto, diferencia,
+                              motivo or (VENTA if diferencia < 0 else REPOSICION))
+        print(f"\n✔  Stock de '{producto.get_nombre()}': {nueva_cantidad} unidades.")
+        return nueva_cantidad
+
+    # ── Renombrar producto ────────────────────
+    def renombrar_producto(self, id_producto: str, nuevo_nombre: str) -> bool:
+        """
+        Cambia el nombre de un producto y actualiza el índice de búsqueda.
+        Retorna False si no existe.
+        """
+        with self.__cambio(id_producto):
+            if id_producto not in self.__ids_usados:
+                print(f"\n No se encontró ningún producto con ID '{id_producto}'.")
+                return False
+
+            producto = self.__producto(id_producto)
+            self.__renombrar(producto, nuevo_nombre)
+            self._persistir({"op": "actualizar", "producto": producto.a_diccionario()})
+        print(f"\n✔  Producto '{id_producto}' renombrado a '{producto.get_nombre()}'.")
+        return True
+
+    # ── Registro interno (dict + set + índices) ─
+    def __registrar(self, producto: Producto):
+        """Inserta un producto en todas las colecciones internas."""
+        id_producto = producto.get_id()
+        self.__productos[id_producto] = producto    # Inserción en diccionario
+        self.__ids_usados.add(id_producto)          # Registro en conjunto
+        self.__version_catalogo += 1
+        if self.__completo:
+            self.__indice_nombres.agregar(id_producto, producto.get_nombre())
+            self.__por_cantidad.agregar(producto.get_cantidad(), id_producto)
+            self.__por_precio.agregar(producto.get_precio(), id_producto)
+        else:
+            self.__nombres_cambiados.add(id_producto)
+
+    def __desregistrar(self, id_producto: str):
+        """Quita un producto de todas las colecciones internas (si existe)."""
+        producto = self.__productos.pop(id_producto, None)
+        if producto is None:
             return
+        self.__ids_usados.discard(id_producto)
+        self.__version_catalogo += 1
+        if self.__completo:
+            self.__indice_nombres.eliminar(id_producto)
+            self.__por_cantidad.eliminar(producto.get_cantidad(), id_producto)
+            self.__por_precio.eliminar(producto.get_precio(), id_producto)
+        else:
+            self.__nombres_cambiados.discard(id_producto)
 
-        producto = self.__productos[id_producto]
+    def __modificar(self, producto: Producto, nueva_cantidad: int = None,
+                    nuevo_precio: float = None):
+        """
+        Cambia cantidad y/o precio mediante set_cantidad/set_precio y mantiene
+        sincronizados los índices ordenados. Los cambios de stock o precio
+        deben pasar por aquí (no llamar a los setters del Producto directamente).
+        Con hilos_seguros se llama con la franja del producto tomada.
+        """
+        id_producto = producto.get_id()
         if nueva_cantidad is not None:
+            anterior = producto.get_cantidad()
             producto.set_cantidad(nueva_cantidad)
+            with self.__cerrojo_indices:   # Otros productos cambian a la vez
+                if self.__completo:
+                    self.__por_cantidad.actualizar(anterior, nueva_cantidad, id_producto)
+                self.__version_stock += 1
         if nuevo_precio is not None:
+            anterior = producto.get_precio()
             producto.set_precio(nuevo_precio)
+            with self.__cerrojo_indices:
+                if self.__completo:
+                    self.__por_precio.actualizar(anterior, nuevo_precio, id_producto)
+                self.__version_stock += 1
 
-        self.guardar_en_archivo()
-        print(f"\n✔  Producto '{producto.get_nombre()}' actualizado correctamente.")
+    def __renombrar(self, producto: Producto, nuevo_nombre: str):
+        """Cambia el nombre mediante set_nombre y mantiene el índice de nombres."""
+        producto.set_nombre(nuevo_nombre)
+        if self.__completo:
+            self.__indice_nombres.renombrar(producto.get_id(), producto.get_nombre())
+        else:
+            self.__nombres_cambiados.add(producto.get_id())
+        self.__version_catalogo += 1
+
+    def __limpiar_colecciones(self):
+        """Vacía el diccionario, el conjunto y todos los índices."""
+        self.__productos = {}
+        self.__ids_usados = set()
+        self.__nombres_cambiados = set()
+        self.__indice_nombres.limpiar()
+        self.__por_cantidad.limpiar()
+        self.__por_precio.limpiar()
+        self.__version_catalogo += 1
+        self.__version_stock += 1
+
+    # ── Carga perezosa ────────────────────────
+    def __producto(self, id_producto: str) -> Producto | None:
+        """
+        Producto con ese ID (None si no existe). En carga perezosa se crea
+        desde la tupla leída del disco (o desde su registro en el archivo)
+        la primera vez que se pide.
+        """
+        producto = self.__productos.get(id_producto)
+        if producto is not None and type(producto) is not Producto:
+            with self.__cerrojo_indices:   # Un solo Producto aunque lo pidan dos hilos
+                producto = self.__productos[id_producto]
+                if type(producto) is not Producto:
+                    producto = self.__productos[id_producto] = Producto(*self.__tupla(producto))
+        return producto
+
+    def __tupla(self, producto) -> tuple:
+        """
+        (id, nombre, cantidad, precio) de un Producto, de una tupla aún sin
+        convertir o de una posición del índice auxiliar.
+        """
+        if type(producto) is int:
+            return self.__indice_archivo.registro(producto)
+        return producto if type(producto) is tuple else producto.a_tupla()
+
+    def __nombre(self, producto) -> str:
+        """Nombre de un valor del diccionario sin crear el Producto."""
+        if type(producto) is int:
+            return self.__indice_archivo.nombre(producto)
+        return producto[1] if type(producto) is tuple else producto.get_nombre()
+
+    def __completar(self):
+        """
+        Convierte en Producto las tuplas que quedan de la carga perezosa y
+        arma los índices de nombres, cantidad y precio. Los índices ordenados
+        se construyen ordenando todo junto (O(n log n)) en vez de insertar
+        producto por producto. Toma el cerrojo de escritura, así que se llama
+        antes de tomar el de lectura.
+        """
+        if self.__completo:
+            return
+        with self.__cerrojo.escritura(), self.__instrumentacion.medir("completar_carga"):
+            if self.__completo:
+                return
+            productos = self.__productos
+            for id_producto, producto in productos.items():
+                if type(producto) is not Producto:
+                    productos[id_producto] = producto = Producto(*self.__tupla(producto))
+                self.__indice_nombres.agregar(id_producto, producto.get_nombre())
+            self.__por_cantidad.construir((p.get_cantidad(), i) for i, p in productos.items())
+            self.__por_precio.construir((p.get_precio(), i) for i, p in productos.items())
+            self.__nombres_cambiados = set()
+            self.__completo = True
+
+    def __cargar_registros(self, estado: dict, solo_posiciones: bool = False):
+        """
+        Reemplaza el contenido con los registros {id: tupla | posición en
+        el índice auxiliar | None} dados: solo llena el diccionario por ID y
+        el conjunto de IDs. 'estado' pasa a ser el diccionario (no se copia).
+        solo_posiciones=True indica que todos los registros son posiciones.
+        Si el inventario no estaba en carga perezosa, los productos e índices
+        se completan enseguida.
+        """
+        completar = self.__completo
+        self.__limpiar_colecciones()
+        self.__completo = False
+        if not solo_posiciones and None in estado.values():
+            estado = {i: registro for i, registro in estado.items() if registro is not None}
+        self.__productos = estado
+        self.__ids_usados = set(estado)
+        if self.__indice_archivo is not None and not solo_posiciones:
+            # Las tuplas (del diario o de un lote deshecho) pueden tener otro nombre
+            self.__nombres_cambiados = {i for i, registro in estado.items()
+                                        if type(registro) is not int}
+        if completar:
+            self.__completar()
+
+    def __buscar_en_indice_archivo(self, termino: str, limite: int = None) -> list[str]:
+        """
+        buscar_por_nombre() antes de completar la carga, con el índice
+        auxiliar: los candidatos son los productos que el índice encuentra
+        por las palabras del término más los de __nombres_cambiados, y se
+        revisa el nombre de cada uno. Mismo resultado y orden que
+        IndiceNombres.buscar(). Se llama con el cerrojo de lectura tomado.
+        """
+        termino = termino.lower().strip()
+        productos = self.__productos
+        ids = self.__indice_archivo.ids
+        candidatos = {ids[p] for p in self.__indice_archivo.buscar(termino)}
+        candidatos |= self.__nombres_cambiados
+
+        version, posiciones = self.__posiciones
+        if version != self.__version_catalogo:
+            posiciones = {id_producto: k for k, id_producto in enumerate(productos)}
+            self.__posiciones = (self.__version_catalogo, posiciones)
+
+        resultados = []
+        for id_producto in candidatos:
+            producto = productos.get(id_producto)
+            if producto is None:
+                continue
+            nombre = self.__nombre(producto).lower()
+            if termino not in nombre:
+                continue
+            palabras = nombre.split()
+            if termino in palabras:
+                rango = 0
+            elif any(palabra.startswith(termino) for palabra in palabras):
+                rango = 1
+            else:
+                rango = 2
+            resultados.append((rango, posiciones[id_producto], id_producto))
+
+        resultados.sort()
+        if limite is not None:
+            resultados = resultados[:limite]
+        return [id_producto for _, _, id_producto in resultados]
+
+    # ── Lotes (transacciones) ─────────────────
+    @contextmanager
+    def lote(self):
+        """
+        Agrupa varios cambios en una sola escritura a disco.
+
+        Uso:
+            with inventario.lote():
+                inventario.actualizar_producto("1", 10)
+                inventario.actualizar_producto("2", 25)
+
+        Al salir sin errores se guarda una sola vez (o se agregan todas las
+        líneas juntas al diario). Si ocurre una excepción, el diccionario y
+        el conjunto vuelven al estado previo y no se escribe nada. Los lotes
+        anidados se integran en el lote exterior. Con hilos_seguros, el lote
+        tiene el cerrojo de escritura de principio a fin.
+        """
+        if self.__en_lote():
+            self.__profundidad_lote += 1
+            try:
+                yield self
+            finally:
+                self.__profundidad_lote -= 1
+            return
+
+        with self.__cambio():
+            # Respaldo inmutable (tuplas; las posiciones del índice auxiliar
+            # no cambian) para poder deshacer los cambios
+            respaldo = {i: p.a_tupla() if type(p) is Producto else p
+                        for i, p in self.__productos.items()}
+            self.__profundidad_lote = 1
+            self.__hilo_lote = threading.get_ident()
+            self.__pendientes = []
+            self.__movimientos_lote = []
+            try:
+                yield self
+            except BaseException:
+                self.__cargar_registros(respaldo)
+                raise
+            else:
+                # Se escriben al salir de __cambio(), todas juntas
+                self.__cola.extend(self.__pendientes)
+                self.__cola_movimientos.extend(self.__movimientos_lote)
+            finally:
+                self.__profundidad_lote = 0
+                self.__hilo_lote = None
+                self.__pendientes = []
+                self.__movimientos_lote = []
+
+    def __en_lote(self) -> bool:
+        """True si el hilo actual está dentro de un lote."""
+        return bool(self.__profundidad_lote) and self.__hilo_lote == threading.get_ident()
+
+    @contextmanager
+    def __cambio(self, id_producto: str = None, exclusivo: bool = True):
+        """
+        Sección crítica de una modificación. Con hilos_seguros toma primero
+        la franja del producto (si se indica) y luego el cerrojo de lectura
+        o escritura: compartido si el cambio solo toca ese producto,
+        exclusivo si cambia la estructura. Al salir de la sección más
+        externa se escriben las operaciones encoladas.
+        """
+        franja = nullcontext()
+        if id_producto is not None and not self.__cerrojo.escribiendo():
+            franja = self.__franjas.para(id_producto)
+        try:
+            with franja, (self.__cerrojo.escritura() if exclusivo else self.__cerrojo.lectura()):
+                yield
+        finally:
+            if self.__cerrojo.libre():
+                self.__vaciar_cola()
+
+    def agregar_muchos(self, filas: list[tuple]) -> int:
+        """
+        Agrega varios productos (id, nombre, cantidad, precio) de una vez.
+        Primero valida todas las filas; si alguna es inválida lanza
+        ValueError y no se agrega ninguna. Retorna cuántos se agregaron.
+        """
+        errores: list[str] = []
+        nuevos: set[str] = set()
+        with self.__cambio():
+            for id_producto, nombre, cantidad, precio in filas:
+                if id_producto in self.__ids_usados or id_producto in nuevos:
+                    errores.append(f"ID duplicado '{id_producto}'")
+                elif not str(nombre).strip():
+                    errores.append(f"ID '{id_producto}': nombre vacío")
+                elif cantidad < 0 or precio < 0:
+                    errores.append(f"ID '{id_producto}': cantidad/precio negativos")
+                nuevos.add(id_producto)
+            if errores:
+                raise ValueError(f"{len(errores)} fila(s) inválida(s): " + "; ".join(errores[:5]))
+
+            with self.lote():
+                for id_producto, nombre, cantidad, precio in filas:
+                    producto = Producto(id_producto, nombre.strip(), cantidad, precio)
+                    self.__registrar(producto)
+                    self._persistir({"op": "agregar", "producto": producto.a_diccionario()})
+                    self.__movimiento(id_producto, producto.get_cantidad(), ALTA)
+
+        print(f"\n✔  {len(filas)} producto(s) agregados en lote.")
+        return len(filas)
+
+    def actualizar_muchos(self, cambios: list[tuple]) -> int:
+        """
+        Actualiza varios productos (id, nueva_cantidad, nuevo_precio) de una
+        vez; None deja el campo sin cambios. Valida todo antes de aplicar y
+        lanza ValueError si algún ID no existe o algún valor es negativo.
+        Retorna cuántos productos se actualizaron.
+        """
+        errores: list[str] = []
+        with self.__cambio():
+            for id_producto, nueva_cantidad, nuevo_precio in cambios:
+                if id_producto not in self.__ids_usados:
+                    errores.append(f"ID inexistente '{id_producto}'")
+                elif (nueva_cantidad is not None and nueva_cantidad < 0) or \
+                        (nuevo_precio is not None and nuevo_precio < 0):
+                    errores.append(f"ID '{id_producto}': cantidad/precio negativos")
+            if errores:
+                raise ValueError(f"{len(errores)} cambio(s) inválido(s): " + "; ".join(errores[:5]))
+
+            with self.lote():
+                for id_producto, nueva_cantidad, nuevo_precio in cambios:
+                    producto = self.__producto(id_producto)
+                    anterior = producto.get_cantidad()
+                    self.__modificar(producto, nueva_cantidad, nuevo_precio)
+                    self._persistir({"op": "actualizar", "producto": producto.a_diccionario()})
+                    self.__movimiento(id_producto, producto.get_cantidad() - anterior, AJUSTE)
+
+        print(f"\n✔  {len(cambios)} producto(s) actualizados en lote.")
+        return len(cambios)
 
     # ── Buscar por nombre ─────────────────────
-    def buscar_por_nombre(self, termino: str) -> list:
+    def buscar_por_nombre(self, termino: str, limite: int = None) -> list:
         """
         Busca productos cuyo nombre contenga el término (sin distinción de
-        mayúsculas/minúsculas). Retorna una lista de Producto.
+        mayúsculas/minúsculas). Retorna una lista de Producto ordenada por
+        relevancia (palabra exacta, luego prefijo, luego subcadena), con a
+        lo sumo 'limite' resultados si se indica.
+
+        Usa el índice de trigramas: solo se revisan los nombres que comparten
+        todos los trigramas del término, no el inventario completo. Antes de
+        completar la carga perezosa se usa el índice auxiliar del archivo.
         """
-        termino = termino.lower().strip()
-        # Comprensión de lista – crea una lista temporal con resultados
-        resultados: list[Producto] = [
-            p for p in self.__productos.values()
-            if termino in p.get_nombre().lower()
-        ]
+        if not self.__completo and self.__indice_archivo is not None and termino.strip():
+            with self.__cerrojo.lectura():
+                if not self.__completo:
+                    ids = self.__buscar_en_indice_archivo(termino, limite)
+                    return [self.__producto(i) for i in ids]
+        self.__completar()
+        with self.__cerrojo.lectura():
+            ids = self.__indice_nombres.buscar(termino, limite)
+            # Comprensión de lista – crea una lista temporal con resultados
+            resultados: list[Producto] = [self.__productos[i] for i in ids]
         return resultados
 
+    # ── Consulta por ID ───────────────────────
+    def obtener_producto(self, id_producto: str) -> tuple | None:
+        """
+        Tupla (id, nombre, cantidad, precio) del producto, o None si no
+        existe. Es una copia: se puede usar fuera del cerrojo sin que otro
+        hilo la cambie a medias.
+        """
+        # Mismo orden que __cambio(): primero la franja, luego el cerrojo
+        with self.__franjas.para(id_producto), self.__cerrojo.lectura():
+            producto = self.__productos.get(id_producto)
+            return self.__tupla(producto) if producto is not None else None
+
+    # ── Pertenencia ───────────────────────────
+    def __contains__(self, id_producto: str) -> bool:
+        """Permite escribir 'id in inventario' (consulta O(1) en el conjunto)."""
+        with self.__cerrojo.lectura():
+            return id_producto in self.__ids_usados
+
+    def __len__(self) -> int:
+        with self.__cerrojo.lectura():
+            return len(self.__productos)
+
+    # ── Consultas por rango ───────────────────
+    def productos_por_cantidad(self, minimo: int = None, maximo: int = None) -> list:
+        """Productos con minimo <= cantidad <= maximo, de menor a mayor stock."""
+        self.__completar()
+        with self.__cerrojo.lectura():
+            with self.__cerrojo_indices:
+                ids = self.__por_cantidad.rango(minimo, maximo)
+            return [self.__productos[i] for i in ids]
+
+    def productos_por_precio(self, minimo: float = None, maximo: float = None) -> list:
+        """Productos con minimo <= precio <= maximo, del más barato al más caro."""
+        self.__completar()
+        with self.__cerrojo.lectura():
+            with self.__cerrojo_indices:
+                ids = self.__por_precio.rango(minimo, maximo)
+            return [self.__productos[i] for i in ids]
+
+    def alerta_stock_bajo(self, umbral: int = 10) -> list:
+        """Productos con cantidad < umbral (los de menor stock primero)."""
+        self.__completar()
+        with self.__cerrojo.lectura():
+            with self.__cerrojo_indices:
+                ids = self.__por_cantidad.rango(None, umbral, incluir_maximo=False)
+            return [self.__productos[i] for i in ids]
+
     # ── Mostrar todos los productos ───────────
-    def mostrar_todos(self):
-        """Imprime todos los productos del inventario."""
-        if not self.__productos:
+    def mostrar_todos(self, clave: str = None, descendente: bool = False):
+        """
+        Imprime todos los productos del inventario, en orden de alta o
+        según 'clave' (id, nombre, cantidad, precio o valor). Las filas se
+        arman por bloques y se escriben con una llamada por bloque.
+        """
+        if clave not in (None, "id"):
+            self.__completar()
+        # Se copian los IDs bajo el cerrojo; cada bloque se lee aparte
+        with self.__cerrojo.lectura():
+            ids = list(self.__productos) if clave is None else self.__orden(clave)
+        if not ids:
             print("\n  (El inventario está vacío)")
             return
+        bloques = Paginador(ids, clave or "id", descendente, LINEAS_POR_ESCRITURA)
+        escribir_lineas(self.__lineas_listado(bloques))
 
-        print("\n" + "═" * 75)
-        print(f"  {'INVENTARIO COMPLETO':^71}")
-        print("═" * 75)
-        for producto in self.__productos.values():
-            print(producto)
-        print("═" * 75)
-        print(f"  Total de productos distintos: {len(self.__productos)}")
+    def __lineas_listado(self, bloques: Paginador):
+        """Genera las líneas de mostrar_todos, leyendo un bloque de productos por vez."""
+        yield ""
+        yield "═" * 75
+        yield f"  {'INVENTARIO COMPLETO':^71}"
+        yield "═" * 75
+        mostrados = 0
+        while True:
+            with self.__cerrojo.lectura():
+                productos = [p for p in map(self.__producto, bloques.actual())
+                             if p is not None]
+            mostrados += len(productos)
+            yield from map(str, productos)
+            if not bloques.siguiente():
+                break
+        yield "═" * 75
+        yield f"  Total de productos distintos: {mostrados}"
+
+    # ── Listado por páginas ───────────────────
+    def paginar_productos(self, clave: str = "id", descendente: bool = False,
+                          por_pagina: int = FILAS_POR_PAGINA) -> Paginador:
+        """
+        Cursor por páginas sobre los IDs ordenados por 'clave' (id, nombre,
+        cantidad, precio o valor). Cada página se imprime con mostrar_pagina().
+        El orden por ID no necesita completar la carga perezosa.
+        """
+        if clave != "id":
+            self.__completar()
+        with self.__cerrojo.lectura():
+            return Paginador(self.__orden(clave), clave, descendente, por_pagina)
+
+    def mostrar_pagina(self, paginador: Paginador):
+        """Imprime solo los productos de la página actual del paginador."""
+        if not paginador.total:
+            print("\n  (El inventario está vacío)")
+            return
+        with self.__cerrojo.lectura():
+            productos = [p for p in map(self.__producto, paginador.actual())
+                         if p is not None]
+        lineas = ["", "═" * 75, f"  {'INVENTARIO COMPLETO':^71}", "═" * 75]
+        lineas.extend(map(str, productos))
+        lineas.append("═" * 75)
+        lineas.append(f"  {paginador.resumen()}")
+        escribir_lineas(lineas)
+
+    def __orden(self, clave: str) -> list[str]:
+        """
+        IDs ordenados por 'clave' (se llama con el cerrojo de lectura tomado).
+        Cantidad y precio salen de los índices ordenados. Id, nombre y valor
+        se ordenan al pedirlos y se reutilizan mientras no haya altas, bajas
+        o cambios de nombre (y, para valor, de stock o precio). La lista no
+        se modifica después: los cambios crean una nueva.
+        """
+        if clave not in CLAVES_ORDEN:
+            raise ValueError(f"Orden '{clave}' desconocido.")
+        if clave in ("cantidad", "precio"):
+            indice = self.__por_cantidad if clave == "cantidad" else self.__por_precio
+            with self.__cerrojo_indices:
+                return indice.rango()
+
+        version = (self.__version_catalogo,
+                   self.__version_stock if clave == "valor" else 0)
+        guardado = self.__ordenes.get(clave)
+        if guardado is not None and guardado[0] == version:
+            return guardado[1]
+
+        productos = self.__productos
+        if clave == "id":
+            ids = sorted(productos)
+        elif clave == "nombre":
+            ids = sorted(productos, key=lambda i: (productos[i].get_nombre().lower(), i))
+        else:
+            ids = sorted(productos, key=lambda i: (productos[i].get_cantidad()
+                                                   * productos[i].get_precio(), i))
+        self.__ordenes[clave] = (version, ids)
+        return ids
+
+    # ── Estadísticas ──────────────────────────
+    def estadisticas(self, umbral_stock_bajo: int = 10) -> dict:
+        """
+        Totales del inventario en una sola pasada: productos distintos,
+        unidades, valor (cantidad × precio) y cuántos productos tienen menos
+        de 'umbral_stock_bajo' unidades (consultado en el índice ordenado).
+        """
+        self.__completar()
+        with self.__cerrojo.lectura():
+            unidades = 0
+            valor = 0.0
+            for producto in self.__productos.values():
+                cantidad = producto.get_cantidad()
+                unidades += cantidad
+                valor += cantidad * producto.get_precio()
+            with self.__cerrojo_indices:
+                stock_bajo = len(self.__por_cantidad.rango(None, umbral_stock_bajo,
+                                                           incluir_maximo=False))
+            return {"total_productos": len(self.__productos),
+                    "unidades_totales": unidades,
+                    "valor_total": round(valor, 2),
+                    "stock_bajo": stock_bajo}
 
     # ── Resumen de categorías únicas ──────────
     def categorias_nombres(self) -> set:
@@ -175,45 +965,653 @@ class Inventario:
         Devuelve un conjunto con los nombres únicos de los primeros 'tokens'
         (palabras iniciales) de cada producto.  Ejemplo de uso de set.
         """
-        return {p.get_nombre().split()[0] for p in self.__productos.values()}
+        self.__completar()
+        with self.__cerrojo.lectura():
+            return {p.get_nombre().split()[0] for p in self.__productos.values()}
 
     # ── Guardar en archivo ────────────────────
     def guardar_en_archivo(self):
         """
-        Serializa el diccionario de productos a JSON y lo escribe en disco.
-        Cada Producto se convierte a dict mediante su metodo a_diccionario() para asegurar compatibilidad con JSON.
+        Escribe el inventario completo en el almacenamiento (inventario.json
+        por defecto, de forma atómica y con copias de respaldo).
+        Cada Producto se convierte a tupla mediante su metodo a_tupla().
+        Las tuplas se generan una a una mientras se escribe, sin armar
+        antes una lista completa (la memoria extra no depende del tamaño).
+
+        Todo ocurre con el bloqueo entre procesos tomado. Si otra caja guardó
+        desde la última lectura, primero se incorporan sus cambios (salvo en
+        los productos modificados aquí y aún no guardados) para no pisarlos.
         """
-        datos = [p.a_diccionario() for p in self.__productos.values()]
-        with open(self.ARCHIVO_DATOS, "w", encoding="utf-8") as archivo:
-            json.dump(datos, archivo, ensure_ascii=False, indent=4)
+        with self.__cerrojo.escritura(), self.__almacenamiento.bloqueo():
+            with self.__cerrojo_sucios:
+                sucios, self.__sucios = self.__sucios, set()
+            try:
+                externos = self.__sincronizar(conservar=sucios)
+                if externos:
+                    print(f"\n↻  {externos} cambio(s) de otra caja incorporados antes de guardar.")
+                self.__almacenamiento.guardar_todo(self.__generar_tuplas())
+            except BaseException:
+                with self.__cerrojo_sucios:
+                    self.__sucios |= sucios
+                raise
+            self.__firma = self.__almacenamiento.firma()
 
     # ── Cargar desde archivo ──────────────────
     def cargar_desde_archivo(self):
         """
-        Deserializa el inventario desde el archivo JSON, reconstruyendo los
+        Lee el inventario desde el almacenamiento, reconstruyendo los
         objetos Producto y repoblando el diccionario y el conjunto de IDs.
+        Después reproduce las operaciones pendientes del diario, si existen.
+
+        Con el backend JSON, como guardar_en_archivo() reemplaza el archivo de
+        forma atómica, no hace falta validar nada extra al iniciar: solo si
+        inventario.json no se puede leer se recurre a las copias .1, .2, ...
+        """
+        with self.__cerrojo.escritura(), self.__almacenamiento.bloqueo():
+            # En carga perezosa, los IDs salen del índice auxiliar sin
+            # interpretar el archivo (si no hay uno válido, se arma)
+            indice = None
+            if not self.__completo and not self.__productos:
+                indice = self.__almacenamiento.indice()
+            estado, reproducidas = self.__estado_en_disco(indice)
+            if self.__productos:
+                self.__fusionar(estado, completo=True)
+            else:
+                if self.__indice_archivo is not None:
+                    self.__indice_archivo.cerrar()
+                self.__indice_archivo = indice
+                self.__cargar_registros(estado, solo_posiciones=indice is not None
+                                        and not reproducidas)
+
+        if self.__productos or reproducidas:
+            print(f"✔  Inventario cargado: {len(self.__productos)} productos encontrados.")
+        if reproducidas:
+            print(f"   ({reproducidas} operaciones recuperadas del diario)")
+
+    # ── Cambios de otros procesos ─────────────
+    def hay_cambios_externos(self) -> bool:
+        """True si otro proceso guardó desde la última lectura (solo un os.stat)."""
+        return self.__almacenamiento.firma() != self.__firma
+
+    def recargar(self) -> int:
+        """
+        Incorpora lo que otras cajas guardaron desde la última lectura. Si
+        nada cambió solo cuesta comparar la firma del archivo. En modo
+        diario se leen únicamente las líneas nuevas del log; en los demás
+        modos se relee el archivo, pero en memoria solo se tocan los
+        productos que difieren. Retorna cuántos productos cambiaron.
+        """
+        with self.__cerrojo.escritura(), self.__almacenamiento.bloqueo():
+            with self.__cerrojo_sucios:
+                conservar = set(self.__sucios)
+            modificados = self.__sincronizar(conservar)
+        if modificados:
+            print(f"\n↻  {modificados} producto(s) actualizados por otra caja.")
+        return modificados
+
+    def __sincronizar(self, conservar=frozenset()) -> int:
+        """
+        Trae a memoria los cambios externos; se llama con el bloqueo tomado.
+        Los IDs en 'conservar' mantienen la versión en memoria.
+        """
+        if self.__modo_diario:
+            nuevas = self.__operaciones_nuevas_diario()
+            if nuevas is not None:
+                cambios: dict[str, tuple | None] = {}
+                for operacion in nuevas:
+                    self.__aplicar_a_estado(cambios, operacion)
+                self.__entradas_diario += len(nuevas)
+                return self.__fusionar(cambios, completo=False, conservar=conservar)
+        elif not self.hay_cambios_externos():
+            return 0
+
+        estado, _ = self.__estado_en_disco()
+        return self.__fusionar(estado, completo=True, conservar=conservar)
+
+    def __estado_en_disco(self, indice=None) -> tuple[dict, int]:
+        """
+        Lee el snapshot y los diarios a un dict {id: tupla | None (eliminado)}
+        sin tocar las colecciones. Retorna (estado, operaciones del diario).
+        Con 'indice' (índice auxiliar del snapshot) el snapshot no se lee:
+        cada ID queda con su posición en el índice.
+        """
+        if indice is not None:
+            estado = dict(zip(indice.ids, range(len(indice))))
+        else:
+            estado = {registro[0]: tuple(registro) for registro in self.__almacenamiento.cargar()}
+        self.__firma = self.__almacenamiento.firma()
+        self.__inodo_diario, self.__posicion_diario = None, 0
+        self.__tamano_rotado = self.__tamano_diario_rotado()
+
+        # El diario rotado (compactación interrumpida) va antes que el actual
+        reproducidas = aplicadas = 0
+        for ruta in (self.ARCHIVO_DIARIO + ".1", self.ARCHIVO_DIARIO):
+            aplicadas = 0
+            for operacion in self.__leer_diario(ruta):
+                self.__aplicar_a_estado(estado, operacion)
+                aplicadas += 1
+            reproducidas += aplicadas
+        self.__entradas_diario = aplicadas     # Las del diario actual
+        return estado, reproducidas
+
+    def __fusionar(self, cambios: dict, completo: bool, conservar=frozenset()) -> int:
+        """
+        Lleva a memoria registros leídos del disco tocando solo los que
+        difieren (así los índices se actualizan por producto, no enteros).
+        cambios = {id: tupla | None}. Con completo=True, 'cambios' es todo el
+        estado y los productos que no aparecen se eliminan. Los IDs en
+        'conservar' no se tocan. Retorna cuántos productos cambiaron.
+        """
+        modificados = 0
+        if completo:
+            for id_producto in [i for i in self.__productos
+                                if i not in cambios and i not in conservar]:
+                self.__desregistrar(id_producto)
+                modificados += 1
+
+        for id_producto, registro in cambios.items():
+            if id_producto in conservar:
+                continue
+            actual = self.__productos.get(id_producto)
+            if registro is None:
+                if actual is not None:
+                    self.__desregistrar(id_producto)
+                    modificados += 1
+            elif actual is None:
+                self.__registrar(Producto(*registro))
+                modificados += 1
+            elif type(actual) is not Producto:
+                # Aún sin convertir (carga perezosa): basta con reemplazar la tupla
+                if self.__tupla(actual) != registro:
+                    self.__productos[id_producto] = tuple(registro)
+                    self.__nombres_cambiados.add(id_producto)
+                    self.__version_catalogo += 1
+                    modificados += 1
+            elif actual.a_tupla() != registro:
+                _, nombre, cantidad, precio = registro
+                if nombre != actual.get_nombre():
+                    actual.set_nombre(nombre)
+                    if self.__completo:
+                        self.__indice_nombres.renombrar(id_producto, actual.get_nombre())
+                    else:
+                        self.__nombres_cambiados.add(id_producto)
+                    self.__version_catalogo += 1
+                self.__modificar(actual, cantidad, precio)
+                modificados += 1
+        return modificados
+
+    # ── Snapshot binario ──────────────────────
+    def guardar_en_binario(self, ruta: str = None):
+        """Guarda el inventario en el formato binario columnar (ver snapshot_binario.py)."""
+        with self.__cerrojo.lectura():
+            escribir_snapshot(ruta or self.ARCHIVO_BINARIO,
+                              map(self.__tupla, self.__productos.values()))
+
+    def cargar_desde_binario(self, ruta: str = None):
+        """
+        Reemplaza el contenido del inventario con el de un snapshot binario.
+        El archivo se abre con mmap: no hay que interpretar JSON, solo leer
+        columnas de ancho fijo y la tabla de cadenas. Los cambios se guardan
+        y llegan al libro de movimientos como los de importar_jsonl(). Lanza
+        ValueError (sin tocar el inventario) si el archivo no es un snapshot
+        válido: vacío, truncado o de otro formato.
+        """
+        omitidos = 0
+
+        def filas(snap):
+            nonlocal omitidos
+            for registro in snap:
+                fila = self.__fila_valida(*registro)
+                if fila is None:
+                    omitidos += 1
+                else:
+                    yield fila
+
+        with SnapshotBinario(ruta or self.ARCHIVO_BINARIO) as snap:
+            self.__reemplazar_contenido(filas(snap))
+        print(f"✔  Inventario cargado (binario): {len(self.__productos)} productos encontrados"
+              + (f" ({omitidos} inválido(s) omitidos)." if omitidos else "."))
+
+    # ── JSON Lines ────────────────────────────
+    def exportar_jsonl(self, ruta: str = None) -> int:
+        """
+        Exporta el inventario en formato JSON Lines: un objeto JSON por línea.
+        Se escribe producto por producto desde un generador, así la memoria
+        usada es constante y otras herramientas pueden leer el archivo línea a
+        línea (por ejemplo con tail o importador.py). Retorna cuántos se exportaron.
+        """
+        ruta = ruta or self.ARCHIVO_JSONL
+        total = 0
+        with self.__cerrojo.lectura(), open(ruta, "w", encoding="utf-8") as archivo:
+            for d in self.__generar_diccionarios():
+                archivo.write(json.dumps(d, ensure_ascii=False) + "\n")
+                total += 1
+        print(f"\n✔  {total} producto(s) exportados a '{ruta}'.")
+        return total
+
+    def importar_jsonl(self, ruta: str = None) -> int:
+        """
+        Reemplaza el contenido del inventario con el de un archivo JSON Lines,
+        leyendo una línea a la vez. Las líneas vacías o inválidas (campos
+        faltantes, nombre vacío, cantidad o precio negativos) se omiten; si
+        un ID se repite, vale la última línea. Retorna cuántos productos
+        quedaron.
+        """
+        ruta = ruta or self.ARCHIVO_JSONL
+        omitidas = 0
+
+        def filas(archivo):
+            nonlocal omitidas
+            for linea in archivo:
+                if not linea.strip():
+                    continue
+                fila = self.__fila_jsonl(linea)
+                if fila is None:
+                    omitidas += 1
+                else:
+                    yield fila
+
+        with open(ruta, "r", encoding="utf-8") as archivo:
+            self.__reemplazar_contenido(filas(archivo))
+
+        print(f"\n✔  {len(self.__productos)} producto(s) importados desde '{ruta}'"
+              + (f" ({omitidas} línea(s) inválida(s) omitidas)." if omitidas else "."))
+        return len(self.__productos)
+
+    @classmethod
+    def __fila_jsonl(cls, linea: str) -> tuple | None:
+        """Línea de JSON Lines → (id, nombre, cantidad, precio), o None si es inválida."""
+        try:
+            d = json.loads(linea)
+            return cls.__fila_valida(d["id"], d["nombre"], d["cantidad"], d["precio"])
+        except (json.JSONDecodeError, KeyError, TypeError):
+            return None
+
+    @staticmethod
+    def __fila_valida(id_producto, nombre, cantidad, precio) -> tuple | None:
+        """La fila con el nombre sin espacios de más, o None si no es válida."""
+        try:
+            nombre = nombre.strip()
+            valida = (type(id_producto) is str and nombre
+                      and cantidad >= 0 and precio >= 0)
+        except (AttributeError, TypeError):
+            return None
+        return (id_producto, nombre, cantidad, precio) if valida else None
+
+    def __reemplazar_contenido(self, filas):
+        """
+        Deja en el inventario exactamente las filas dadas (ya validadas; si
+        un ID se repite vale la última). Se aplican por bloques de
+        LOTE_IMPORTACION, cada uno con una sola escritura a disco, así la
+        memoria extra depende del bloque y no de cuántas filas haya. Los
+        productos que ya existían se actualizan en su lugar (el libro de
+        movimientos recibe solo la diferencia de stock) y al final se
+        eliminan los que no aparecieron.
+        """
+        importados: set[str] = set()
+        bloque: list[tuple] = []
+        for fila in filas:
+            bloque.append(fila)
+            if len(bloque) >= self.LOTE_IMPORTACION:
+                self.__importar_bloque(bloque)
+                importados.update(fila[0] for fila in bloque)
+                bloque = []
+        self.__importar_bloque(bloque)
+        importados.update(fila[0] for fila in bloque)
+
+        with self.__cambio():
+            for id_producto in [i for i in self.__productos if i not in importados]:
+                cantidad = self.__tupla(self.__productos[id_producto])[2]
+                self.__desregistrar(id_producto)
+                self._persistir({"op": "eliminar", "id": id_producto})
+                self.__movimiento(id_producto, -cantidad, BAJA)
+
+    def __importar_bloque(self, filas: list[tuple]):
+        """
+        Aplica un bloque de __reemplazar_contenido(): altas y
+        actualizaciones como las de agregar_producto() y actualizar_producto(),
+        con una sola escritura al salir de la sección crítica.
+        """
+        with self.__cambio():
+            for id_producto, nombre, cantidad, precio in filas:
+                producto = self.__producto(id_producto)
+                if producto is None:
+                    producto = Producto(id_producto, nombre, cantidad, precio)
+                    self.__registrar(producto)
+                    self._persistir({"op": "agregar", "producto": producto.a_diccionario()})
+                    self.__movimiento(id_producto, cantidad, ALTA)
+                    continue
+                if producto.a_tupla() == (id_producto, nombre, cantidad, precio):
+                    continue    # Sin cambios: no se escribe nada
+                anterior = producto.get_cantidad()
+                if producto.get_nombre() != nombre:
+                    self.__renombrar(producto, nombre)
+                self.__modificar(producto, cantidad, precio)
+                self._persistir({"op": "actualizar", "producto": producto.a_diccionario()})
+                self.__movimiento(id_producto, cantidad - anterior, AJUSTE)
+
+    def __generar_diccionarios(self):
+        """
+        Genera el diccionario de cada producto sin construir una lista de
+        diccionarios. list() sobre values() copia solo las referencias y es
+        atómico con el GIL, así el hilo de autoguardado no choca con cambios
+        simultáneos del diccionario.
+        """
+        for producto in list(self.__productos.values()):
+            if type(producto) is not Producto:    # Aún sin convertir (carga perezosa)
+                producto = Producto(*self.__tupla(producto))
+            yield producto.a_diccionario()
+
+    def __generar_tuplas(self):
+        """
+        Igual que __generar_diccionarios(), pero con las tuplas de a_tupla().
+        Lo que sigue sin usar desde la carga perezosa se escribe sin crear
+        el Producto.
+        """
+        for producto in list(self.__productos.values()):
+            yield self.__tupla(producto)
+
+    # ── Diario de operaciones ─────────────────
+    def _persistir(self, operacion: dict):
+        """
+        Punto único de persistencia tras cada cambio: dentro de un lote solo
+        se acumula la operación; si el backend guarda por fila (SQLite) se
+        aplica solo esa fila; en modo diario se agrega al log; con
+        autoguardado se marca como pendiente; en modo normal se reescribe el
+        archivo completo.
+        """
+        if self.__en_lote():
+            self.__pendientes.append(operacion)
+            return
+
+        # Se encola dentro de la sección crítica del cambio (así el orden de
+        # la cola es el orden real) y se escribe al salir de ella
+        self.__cola.append(operacion)
+
+    def __movimiento(self, id_producto: str, diferencia: int, motivo: str):
+        """
+        Encola un movimiento de stock para el libro (si hay libro y la
+        cantidad cambió). Como _persistir(), dentro de un lote se acumula y
+        solo pasa a la cola si el lote termina sin errores.
+        """
+        if self.__libro is None or not diferencia:
+            return
+        movimiento = (id_producto, diferencia, time.time(), motivo)
+        if self.__en_lote():
+            self.__movimientos_lote.append(movimiento)
+        else:
+            self.__cola_movimientos.append(movimiento)
+
+    def __vaciar_cola(self):
+        """
+        Escribe las operaciones encoladas en orden. Un solo hilo vacía a la
+        vez y lo hace con el cerrojo de escritura, porque guardar puede
+        incorporar cambios de otras cajas. La cola se toma ya con la
+        escritura: así incluye todo cambio hecho en memoria y la
+        sincronización no pisa productos con operaciones aún sin escribir.
+        Los movimientos se registran después, sin el cerrojo de escritura
+        (el libro tiene su propia transacción).
+        """
+        with self.__cerrojo_persistencia:
+            if not self.__cola and not self.__cola_movimientos:
+                return
+            with self.__cerrojo.escritura():
+                operaciones = []
+                while self.__cola:
+                    operaciones.append(self.__cola.popleft())
+                movimientos = []
+                while self.__cola_movimientos:
+                    movimientos.append(self.__cola_movimientos.popleft())
+                if operaciones:
+                    self.__aplicar_persistencia(operaciones)
+            if movimientos:
+                self.__libro.registrar(movimientos)
+
+    def __aplicar_persistencia(self, operaciones: list[dict]):
+        if self.__almacenamiento.por_fila:
+            self.__almacenamiento.aplicar(operaciones)
+        elif self.__modo_diario:
+            self.__escribir_diario(operaciones)
+        else:
+            # Estos productos tienen prioridad si otra caja guardó entretanto
+            with self.__cerrojo_sucios:
+                self.__sucios.update(map(self.__id_de_operacion, operaciones))
+            if self.__autoguardado is not None:
+                self.__autoguardado.marcar(len(operaciones))
+            else:
+                self.guardar_en_archivo()
+
+    @staticmethod
+    def __id_de_operacion(operacion: dict) -> str:
+        if operacion["op"] == "eliminar":
+            return operacion["id"]
+        return operacion["producto"]["id"]
+
+    def __escribir_diario(self, operaciones: list[dict]):
+        """
+        Agrega las operaciones al final del diario y compacta si hace falta.
+        Antes de escribir se leen las líneas que otras cajas agregaron, para
+        que la memoria siga el mismo orden que el archivo.
         """
-        if not os.path.exists(self.ARCHIVO_DATOS):
-            return  # Primera ejecución – no hay archivo todavía
+        with self.__instrumentacion.medir("diario.codificar_json"):
+            datos = "".join(json.dumps(op, ensure_ascii=False) + "\n"
+                            for op in operaciones).encode("utf-8")
+        with self.__almacenamiento.bloqueo():
+            self.__sincronizar(conservar={self.__id_de_operacion(op) for op in operaciones})
+            with self.__cerrojo_diario:
+                self.__abrir_diario()
+                with self.__instrumentacion.medir("diario.escribir"):
+                    self.__archivo_diario.write(datos)
+                    self.__archivo_diario.flush()
+                self.__instrumentacion.sumar_bytes("diario.escribir", len(datos))
+                self.__posicion_diario = self.__archivo_diario.tell()
+                self.__entradas_diario += len(operaciones)
+                compactar = self.__entradas_diario >= self.LIMITE_DIARIO
 
-        with open(self.ARCHIVO_DATOS, "r", encoding="utf-8") as archivo:
+        if compactar:
+            self.compactar()
+
+    def __abrir_diario(self):
+        """
+        Deja abierto el diario para agregar al final. Si otra caja lo rotó
+        (compactación), el manejador viejo apunta al archivo anterior y se
+        vuelve a abrir.
+        """
+        if self.__archivo_diario is not None:
             try:
-                datos: list[dict] = json.load(archivo)
-            except json.JSONDecodeError:
-                print("⚠  El archivo de datos está corrupto. Iniciando inventario vacío.")
+                actual = os.stat(self.ARCHIVO_DIARIO).st_ino
+            except FileNotFoundError:
+                actual = None
+            if actual == os.fstat(self.__archivo_diario.fileno()).st_ino:
                 return
+            self.__archivo_diario.close()
+
+        self.__archivo_diario = open(self.ARCHIVO_DIARIO, "ab")
+        tamano = os.path.getsize(self.ARCHIVO_DIARIO)
+        if tamano:
+            # Una línea incompleta (cierre abrupto) no debe pegarse a la siguiente
+            with open(self.ARCHIVO_DIARIO, "rb") as archivo:
+                archivo.seek(tamano - 1)
+                if archivo.read(1) != b"\n":
+                    self.__archivo_diario.write(b"\n")
+        self.__inodo_diario = os.fstat(self.__archivo_diario.fileno()).st_ino
+
+    def __leer_diario(self, ruta: str, desde: int = 0):
+        """
+        Genera las operaciones guardadas en 'ruta' a partir del byte 'desde'.
+        Al terminar de leer el diario actual recuerda hasta dónde llegó
+        (inodo y posición), así la próxima lectura empieza ahí.
+        """
+        if not os.path.exists(ruta):
+            return
+        with open(ruta, "rb") as archivo:
+            archivo.seek(desde)
+            for linea in archivo:
+                try:
+                    yield json.loads(linea)
+                except ValueError:
+                    # Última línea a medio escribir por un cierre abrupto
+                    continue
+            if ruta == self.ARCHIVO_DIARIO:
+                self.__inodo_diario = os.fstat(archivo.fileno()).st_ino
+                self.__posicion_diario = archivo.tell()
 
-        for d in datos:
-            producto = Producto(d["id"], d["nombre"], d["cantidad"], d["precio"])
-            self.__productos[d["id"]] = producto
-            self.__ids_usados.add(d["id"])
+    def __operaciones_nuevas_diario(self) -> list[dict] | None:
+        """
+        Operaciones que otras cajas agregaron al diario desde la última
+        lectura. Retorna None si el snapshot cambió o el diario fue creado o
+        rotado por otro proceso: en ese caso hay que releer todo. Toda
+        rotación crea o agranda inventario.log.1, así que su tamaño la delata
+        aunque el diario nuevo reutilice el inodo del anterior.
+        """
+        if self.hay_cambios_externos() or self.__tamano_diario_rotado() != self.__tamano_rotado:
+            return None
+        try:
+            estado = os.stat(self.ARCHIVO_DIARIO)
+        except FileNotFoundError:
+            estado = None
+        inodo = estado.st_ino if estado is not None else None
+        if inodo != self.__inodo_diario:
+            return None
+        if estado is None or estado.st_size == self.__posicion_diario:
+            return []
+        return list(self.__leer_diario(self.ARCHIVO_DIARIO, self.__posicion_diario))
+
+    def __tamano_diario_rotado(self) -> int | None:
+        try:
+            return os.path.getsize(self.ARCHIVO_DIARIO + ".1")
+        except FileNotFoundError:
+            return None
 
-        print(f"✔  Inventario cargado: {len(self.__productos)} productos encontrados.")
+    @staticmethod
+    def __aplicar_a_estado(estado: dict, operacion: dict):
+        """
+        Aplica una operación del diario sobre un dict {id: tupla | None}.
+        Todas las operaciones son absolutas (insertar/reemplazar/borrar), así
+        que reproducir de nuevo una entrada ya incluida en el snapshot no
+        altera el resultado.
+        """
+        if operacion["op"] == "eliminar":
+            estado[operacion["id"]] = None
+        else:  # "agregar" o "actualizar" llevan el producto completo
+            d = operacion["producto"]
+            estado[d["id"]] = (d["id"], d["nombre"], d["cantidad"], d["precio"])
+
+    def compactar(self, en_segundo_plano: bool = True):
+        """
+        Vuelca el estado actual en un nuevo snapshot y descarta el diario.
+
+        Bajo el cerrojo solo se copian los datos y se rota el log a
+        inventario.log.1 (operación rápida); la escritura del snapshot se
+        hace en un hilo aparte para no bloquear la caja. Si el programa se
+        cierra a mitad, al iniciar se reproduce inventario.log.1 de nuevo.
+
+        Con varias cajas: antes de copiar se incorporan sus líneas nuevas, y
+        si otra caja escribe un snapshot más reciente mientras tanto, el de
+        esta caja se descarta (el log rotado se conserva; reproducirlo es
+        inofensivo).
+        """
+        rotado = self.ARCHIVO_DIARIO + ".1"
+        with self.__cerrojo.escritura(), self.__almacenamiento.bloqueo():
+            self.__sincronizar()
+            with self.__cerrojo_diario:
+                if self.__hilo_compactacion is not None and self.__hilo_compactacion.is_alive():
+                    return  # Ya hay una compactación en curso
+
+                datos = [self.__tupla(p) for p in self.__productos.values()]
+                if self.__archivo_diario is not None:
+                    self.__archivo_diario.close()
+                    self.__archivo_diario = None
+                if os.path.exists(self.ARCHIVO_DIARIO):
+                    if os.path.exists(rotado):
+                        # Quedó un log rotado de una compactación anterior
+                        # interrumpida: se conserva concatenando el actual
+                        with open(rotado, "a", encoding="utf-8") as destino, \
+                                open(self.ARCHIVO_DIARIO, "r", encoding="utf-8") as origen:
+                            destino.write(origen.read())
+                        os.remove(self.ARCHIVO_DIARIO)
+                    else:
+                        os.replace(self.ARCHIVO_DIARIO, rotado)
+                self.__entradas_diario = 0
+                self.__inodo_diario, self.__posicion_diario = None, 0
+                self.__tamano_rotado = tamano_rotado = self.__tamano_diario_rotado()
+                firma_previa = self.__firma
+
+                # La firma en memoria no se actualiza al terminar: la próxima
+                # sincronización relee todo, por si otra caja rotó entretanto
+                def tarea():
+                    with self.__almacenamiento.bloqueo():
+                        if self.__almacenamiento.firma() != firma_previa:
+                            return  # Otra caja compactó después con datos más nuevos
+                        self.__almacenamiento.guardar_todo(datos)
+                        # Si otra caja agregó líneas al log rotado, se conserva
+                        if os.path.exists(rotado) and os.path.getsize(rotado) == tamano_rotado:
+                            os.remove(rotado)
+
+                if en_segundo_plano:
+                    self.__hilo_compactacion = threading.Thread(target=tarea, daemon=True)
+                    self.__hilo_compactacion.start()
+                    return
+
+        tarea()
+
+    # ── Rendimiento ───────────────────────────
+    def reporte_rendimiento(self) -> str:
+        """Tabla de llamadas, latencias (p50/p95/p99), bytes e histogramas."""
+        return self.__instrumentacion.reporte()
+
+    def metricas(self) -> dict:
+        """Las mismas métricas como diccionario (vacío si no se instrumentó)."""
+        return self.__instrumentacion.datos()
+
+    # ── Movimientos de stock ──────────────────
+    def libro_movimientos(self) -> LibroMovimientos | None:
+        """El libro de movimientos (None si el inventario no lleva uno)."""
+        return self.__libro
+
+    def sugerir_pedidos(self, **parametros) -> list[dict]:
+        """
+        Productos a pedir según la demanda suavizada del libro de
+        movimientos (ver pronostico.py; 'parametros' pasa plazo, cobertura
+        o z). Sin libro no hay ventas y retorna una lista vacía.
+        """
+        if self.__libro is None:
+            return []
+        from pronostico import pronosticar    # Solo aquí: con NumPy, importarlo tarda
+
+        with self.__cerrojo.lectura():
+            ids = list(self.__productos)
+            cantidades = [self.__tupla(producto)[2] for producto in self.__productos.values()]
+        return pronosticar(ids, cantidades, self.__libro.demanda_suavizada(), **parametros)
+
+    def cerrar(self):
+        """
+        Deja todo guardado antes de salir: vacía el autoguardado, cierra el
+        diario, espera a que termine cualquier compactación y cierra el
+        almacenamiento, el índice auxiliar y el libro de movimientos.
+        """
+        if self.__autoguardado is not None:
+            self.__autoguardado.detener()
+            self.__autoguardado = None
+        with self.__cerrojo_diario:
+            if self.__archivo_diario is not None:
+                self.__archivo_diario.close()
+                self.__archivo_diario = None
+            hilo = self.__hilo_compactacion
+        if hilo is not None:
+            hilo.join()
+        self.__almacenamiento.cerrar()
+        if self.__indice_archivo is not None:
+            self.__indice_archivo.cerrar()
+        if self.__libro is not None:
+            self.__libro.cerrar()
 
 
 # ─────────────────────────────────────────────
 # FUNCIONES DE INTERFAZ DE USUARIO
 # ─────────────────────────────────────────────
+ARCHIVO_METRICAS = "rendimiento.json"   # Destino de la opción "Reporte de rendimiento"
+
 
 def leer_entero(mensaje: str, minimo: int = 0) -> int:
     """Lee un entero validado desde la consola."""
@@ -289,6 +1687,33 @@ def menu_buscar(inventario: Inventario):
         print("─" * 75)
 
 
+def menu_mostrar(inventario: Inventario):
+    print("\n── MOSTRAR TODOS LOS PRODUCTOS ──")
+    clave, descendente = leer_orden(input(
+        "  Ordenar por id, nombre, cantidad, precio o valor ('-' = descendente) [id]: "))
+    navegar(inventario.paginar_productos(clave, descendente), inventario.mostrar_pagina)
+
+
+def menu_rendimiento(inventario: Inventario):
+    print("\n── REPORTE DE RENDIMIENTO ──")
+    print(inventario.reporte_rendimiento())
+    metricas = inventario.metricas()
+    if metricas and input(f"  ¿Guardar en '{ARCHIVO_METRICAS}'? (s/n): ").strip().lower() == "s":
+        with open(ARCHIVO_METRICAS, "w", encoding="utf-8") as archivo:
+            json.dump(metricas, archivo, indent=4, ensure_ascii=False)
+        print(f"\n✔  Métricas guardadas en '{ARCHIVO_METRICAS}'.")
+
+
+def menu_pedidos(inventario: Inventario):
+    print("\n── SUGERENCIAS DE PEDIDO ──")
+    if inventario.libro_movimientos() is None:
+        print("\n⚠  El inventario no registra movimientos: no hay ventas para pronosticar.")
+        return
+    from pronostico import imprimir_pedidos
+
+    imprimir_pedidos(inventario.sugerir_pedidos())
+
+
 def mostrar_menu():
     print("\n" + "═" * 45)
     print("   SISTEMA DE GESTIÓN DE INVENTARIO")
@@ -298,29 +1723,87 @@ def mostrar_menu():
     print("  3. Actualizar producto")
     print("  4. Buscar producto por nombre")
     print("  5. Mostrar todos los productos")
-    print("  6. Salir")
+    print("  6. Reporte de rendimiento")
+    print("  7. Sugerencias de pedido")
+    print("  8. Salir")
     print("═" * 45)
 
 
 # ─────────────────────────────────────────────
 # PUNTO DE ENTRADA PRINCIPAL
 # ─────────────────────────────────────────────
+def leer_argumentos(argumentos: list[str] = None) -> argparse.Namespace:
+    """Opciones de la línea de comandos (una opción desconocida termina con error)."""
+    parser = argparse.ArgumentParser(description="Sistema Avanzado de Gestión de Inventario")
+    almacen = parser.add_mutually_exclusive_group()
+    almacen.add_argument("--sqlite", action="store_true", help="usar inventario.db")
+    almacen.add_argument("--texto", action="store_true", help="usar inventario.txt")
+    parser.add_argument("--diario", action="store_true",
+                        help="agregar cada cambio a inventario.log en lugar de reescribir")
+    parser.add_argument("--autoguardado", action="store_true",
+                        help="agrupar las escrituras en un hilo (cada 500 ms o 100 cambios)")
+    parser.add_argument("--instrumentar", action="store_true",
+                        help="medir llamadas, latencias y bytes escritos")
+    parser.add_argument("--perfil", metavar="ARCHIVO", nargs="?", const="sesion.prof",
+                        help="perfilar la sesión con cProfile y tracemalloc (sesion.prof)")
+    parser.add_argument("--perezosa", action="store_true",
+                        help="inicio rápido: crear cada producto recién cuando se usa")
+    parser.add_argument("--timing", action="store_true",
+                        help="mostrar cuánto tardó la carga del inventario")
+    return parser.parse_args(argumentos)
+
+
 def main():
-    inventario = Inventario()
+    args = leer_argumentos()
+    with sesion_perfilada(args.perfil) if args.perfil else nullcontext():
+        ejecutar_menu(args)
+
+
+def ejecutar_menu(args: argparse.Namespace):
+    almacenamiento = None
+    if args.sqlite:
+        almacenamiento = AlmacenamientoSQLite("inventario.db")
+    elif args.texto:
+        almacenamiento = AlmacenamientoTexto("inventario.txt")
+    inicio = time.perf_counter()
+    inventario = Inventario(modo_diario=args.diario,
+                            autoguardado_ms=500 if args.autoguardado else None,
+                            almacenamiento=almacenamiento,
+                            instrumentar=args.instrumentar,
+                            movimientos=LibroMovimientos(ARCHIVO_MOVIMIENTOS),
+                            carga_perezosa=args.perezosa)
+    if args.timing:
+        # process_time() cuenta la CPU desde que arrancó el proceso: incluye
+        # el inicio de Python y los imports, no solo la carga del inventario
+        modo = "perezosa" if args.perezosa else "completa"
+        print(f"⏱  Carga {modo} de {len(inventario)} productos: "
+              f"{(time.perf_counter() - inicio) * 1000:.0f} ms "
+              f"(CPU desde el inicio del proceso: {time.process_time() * 1000:.0f} ms)")
+
+    def al_recibir_sigterm(_senal, _marco):
+        inventario.cerrar()
+        print("\n  Señal de terminación recibida. Datos guardados.\n")
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, al_recibir_sigterm)
 
     opciones = {
         "1": menu_agregar,
         "2": menu_eliminar,
         "3": menu_actualizar,
         "4": menu_buscar,
-        "5": lambda inv: inv.mostrar_todos(),
+        "5": menu_mostrar,
+        "6": menu_rendimiento,
+        "7": menu_pedidos,
     }
 
     while True:
+        inventario.recargar()      # Cambios guardados por otras cajas
         mostrar_menu()
         opcion = input("  Selecciona una opción: ").strip()
 
-        if opcion == "6":
+        if opcion == "8":
+            inventario.cerrar()
             print("\n  ¡Hasta luego! Los datos han sido guardados.\n")
             break
         elif opcion in opciones:
@@ -0,0 +1,552 @@
+"""
+Backends de almacenamiento intercambiables para el Inventario.
+
+El Inventario no sabe cómo se guardan los datos: solo usa esta interfaz.
+- AlmacenamientoJSON   → inventario.json (formato de Semana 11, por defecto)
+- AlmacenamientoTexto  → inventario.txt  (formato id,nombre,cantidad,precio de Semana 10)
+- AlmacenamientoSQLite → inventario.db   (sqlite3 en modo WAL; cada cambio
+                         actualiza solo su fila, sin reescribir todo)
+
+Los registros viajan como tuplas (id, nombre, cantidad, precio) y los cambios
+por fila con el mismo formato de operación que el diario:
+    {"op": "agregar" | "actualizar", "producto": {...}}  /  {"op": "eliminar", "id": ...}
+
+Varias cajas (procesos) pueden compartir los mismos archivos: bloqueo()
+entrega un cerrojo exclusivo entre procesos y firma() una "versión" del
+contenido guardado, para que el Inventario detecte cambios hechos por otros.
+
+Con indexar = True (el Inventario lo activa en carga perezosa), JSON y texto
+guardan además un índice auxiliar (inventario.json.idx, inventario.txt.idx;
+ver indice_archivo.py) que indice() entrega para esa carga.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from json.encoder import encode_basestring
+
+from indice_archivo import Posiciones, cargar_indice, descartar_indice
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# ─────────────────────────────────────────────
+# INTERFAZ
+# ─────────────────────────────────────────────
+class Almacenamiento(ABC):
+    """Interfaz que implementa cada backend."""
+
+    # True si el backend puede aplicar cambios fila por fila (aplicar());
+    # si es False, el Inventario reescribe todo con guardar_todo()
+    por_fila = False
+
+    # True si guardar_todo() escribe también el índice auxiliar para la
+    # carga perezosa (solo JSON y texto; lo activa el Inventario)
+    indexar = False
+
+    @abstractmethod
+    def cargar(self):
+        """Genera las tuplas (id, nombre, cantidad, precio) guardadas."""
+
+    @abstractmethod
+    def guardar_todo(self, registros):
+        """Reemplaza todo el contenido guardado por los registros dados."""
+
+    def aplicar(self, operaciones: list[dict]):
+        """Aplica cambios individuales (solo backends con por_fila = True)."""
+        raise NotImplementedError(f"{type(self).__name__} no guarda cambios por fila.")
+
+    def cerrar(self):
+        """Libera los recursos del backend (conexiones, archivos)."""
+
+    def bloqueo(self):
+        """
+        Cerrojo exclusivo entre procesos que el Inventario toma para leer,
+        comparar y reescribir sin que otra caja escriba en medio.
+        """
+        return nullcontext()
+
+    def firma(self):
+        """
+        Valor que cambia cada vez que otro proceso modifica lo guardado
+        (None si el backend no puede saberlo).
+        """
+        return None
+
+    def tamano(self) -> int:
+        """Bytes que ocupan los datos guardados (0 si el backend no lo sabe)."""
+        return 0
+
+    def indice(self):
+        """
+        Índice auxiliar de los datos guardados (indice_archivo.IndiceArchivo):
+        ID → registro en el archivo y palabras del nombre → productos. None
+        si el backend no tiene uno o no se pudo armar.
+        """
+        return None
+
+
+# ─────────────────────────────────────────────
+# BLOQUEO ENTRE PROCESOS
+# ─────────────────────────────────────────────
+class BloqueoArchivo:
+    """
+    Cerrojo exclusivo (advisory) sobre un archivo auxiliar, p. ej.
+    "inventario.json.lock". Usa fcntl.flock en POSIX y msvcrt.locking en
+    Windows. Es reentrante y también excluye a los hilos del mismo proceso.
+
+    Uso:
+        with bloqueo:
+            ...   # ninguna otra caja escribe mientras tanto
+    """
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self._hilos = threading.RLock()
+        self._profundidad = 0
+        self._archivo = None
+
+    def __enter__(self):
+        self._hilos.acquire()
+        if not self._profundidad:
+            try:
+                self._archivo = open(self.ruta, "a+b")
+                _bloquear(self._archivo)
+            except BaseException:
+                if self._archivo is not None:
+                    self._archivo.close()
+                    self._archivo = None
+                self._hilos.release()
+                raise
+        self._profundidad += 1
+        return self
+
+    def __exit__(self, *_):
+        self._profundidad -= 1
+        if not self._profundidad:
+            # Cerrar el archivo libera el cerrojo del sistema operativo
+            self._archivo.close()
+            self._archivo = None
+        self._hilos.release()
+
+
+def _bloquear(archivo):
+    if fcntl is not None:
+        fcntl.flock(archivo.fileno(), fcntl.LOCK_EX)
+        return
+    archivo.seek(0)
+    while True:
+        try:
+            msvcrt.locking(archivo.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            continue  # LK_LOCK se rinde tras ~10 s; se vuelve a intentar
+
+
+def _firma_de_archivo(ruta: str):
+    """
+    (inodo, mtime en ns, tamaño) del archivo, o None si no existe. Cada
+    guardado atómico crea un archivo nuevo, así que cualquier escritura de
+    otro proceso cambia al menos uno de los tres valores.
+    """
+    try:
+        estado = os.stat(ruta)
+    except FileNotFoundError:
+        return None
+    return estado.st_ino, estado.st_mtime_ns, estado.st_size
+
+
+def _saltar_espacios(texto: str, i: int) -> int:
+    """Primera posición desde i que no es un espacio en blanco de JSON."""
+    while i < len(texto) and texto[i] in " \t\n\r":
+        i += 1
+    return i
+
+
+# Un producto tal como lo escribe json.dump(lista, indent=4, ensure_ascii=False)
+_PLANTILLA_JSON = ('{{\n        "id": {},\n        "nombre": {},\n'
+                   '        "cantidad": {},\n        "precio": {}\n    }}')
+
+
+def _objeto_json(id_producto, nombre, cantidad, precio) -> str:
+    """
+    Texto de un producto dentro del arreglo JSON. Los casos comunes se
+    arman con la plantilla (mucho más rápido que un json.dumps por
+    producto); cualquier otro valor (bool, NaN, ...) pasa por json.dumps.
+    """
+    if (type(id_producto) is str and type(nombre) is str and type(cantidad) is int
+            and (type(precio) is int or (type(precio) is float and math.isfinite(precio)))):
+        return _PLANTILLA_JSON.format(encode_basestring(id_producto), encode_basestring(nombre),
+                                      cantidad, repr(precio))
+    d = {"id": id_producto, "nombre": nombre, "cantidad": cantidad, "precio": precio}
+    return json.dumps(d, ensure_ascii=False, indent=4).replace("\n", "\n    ")
+
+
+def _tamano_de_archivo(ruta: str) -> int:
+    try:
+        return os.path.getsize(ruta)
+    except FileNotFoundError:
+        return 0
+
+
+# ─────────────────────────────────────────────
+# ESCRITURA ATÓMICA (compartida por JSON y texto)
+# ─────────────────────────────────────────────
+def escribir_atomico(ruta: str, escribir, copias: int = 0, cerrojo=None):
+    """
+    Escribe 'ruta' de forma atómica: escribir(archivo) vuelca el contenido en
+    un temporal de la misma carpeta, se hace fsync y os.replace() lo pone en
+    su lugar. Si el programa se interrumpe a mitad, 'ruta' sigue siendo la
+    versión anterior completa, nunca un archivo truncado. Con copias > 0, la
+    versión previa se conserva como ruta.1 (y las anteriores como .2, .3, ...).
+    """
+    carpeta = os.path.dirname(os.path.abspath(ruta))
+    descriptor, ruta_temporal = tempfile.mkstemp(
+        prefix=os.path.basename(ruta) + ".", suffix=".tmp", dir=carpeta)
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as archivo:
+            escribir(archivo)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+
+        with cerrojo or nullcontext():
+            _rotar_copias(ruta, copias)
+            os.replace(ruta_temporal, ruta)
+            _sincronizar_carpeta(carpeta)
+    except BaseException:
+        if os.path.exists(ruta_temporal):
+            os.remove(ruta_temporal)
+        raise
+
+
+def _rotar_copias(ruta: str, copias: int):
+    """Desplaza ruta → .1 → .2 ... descartando la copia más antigua."""
+    if copias <= 0 or not os.path.exists(ruta):
+        return
+    for n in range(copias - 1, 0, -1):
+        anterior = f"{ruta}.{n}"
+        if os.path.exists(anterior):
+            os.replace(anterior, f"{ruta}.{n + 1}")
+    # Enlace duro: el archivo principal nunca deja de existir durante el cambio
+    try:
+        os.link(ruta, f"{ruta}.1")
+    except OSError:
+        shutil.copy2(ruta, f"{ruta}.1")
+
+
+def _sincronizar_carpeta(carpeta: str):
+    """fsync de la carpeta para que el rename sobreviva a un corte de luz (POSIX)."""
+    if os.name == "nt":
+        return  # Windows no permite abrir carpetas con os.open
+    descriptor = os.open(carpeta, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+# ─────────────────────────────────────────────
+# JSON
+# ─────────────────────────────────────────────
+class AlmacenamientoJSON(Almacenamiento):
+    """
+    Arreglo JSON con sangría (inventario.json). Se guarda de forma atómica
+    con copias rotativas; al cargar, si el archivo principal no se puede
+    leer, se usa la copia íntegra más reciente (.1, .2, ...).
+    """
+
+    def __init__(self, ruta: str = "inventario.json", copias: int = 3):
+        self.ruta = ruta
+        self.copias = copias
+        self._bloqueo = BloqueoArchivo(ruta + ".lock")   # Una escritura a la vez
+
+    def cargar(self):
+        candidatos = [self.ruta] + [f"{self.ruta}.{n}" for n in range(1, self.copias + 1)]
+        existentes = [ruta for ruta in candidatos if os.path.exists(ruta)]
+        if not existentes:
+            return  # Primera ejecución – no hay archivo todavía
+
+        for ruta in existentes:
+            with open(ruta, "r", encoding="utf-8") as archivo:
+                try:
+                    datos: list[dict] = json.load(archivo)
+                except json.JSONDecodeError:
+                    print(f"⚠  El archivo '{ruta}' está corrupto.")
+                    continue
+            if ruta != self.ruta:
+                print(f"⚠  Se restauró la copia de respaldo '{ruta}'.")
+            for d in datos:
+                yield d["id"], d["nombre"], d["cantidad"], d["precio"]
+            return
+
+        print("⚠  No hay ningún snapshot válido. Iniciando inventario vacío.")
+
+    def guardar_todo(self, registros):
+        posiciones = Posiciones() if self.indexar else None
+        escribir_atomico(self.ruta,
+                         lambda archivo: self.volcar_json(registros, archivo, posiciones),
+                         self.copias, self._bloqueo)
+        with self._bloqueo:
+            if posiciones is None:
+                descartar_indice(self.ruta)
+            else:
+                posiciones.guardar(self.ruta)
+
+    def indice(self):
+        return cargar_indice(self.ruta, self._leer_registro, self._recorrer)
+
+    def bloqueo(self):
+        return self._bloqueo
+
+    def firma(self):
+        return _firma_de_archivo(self.ruta)
+
+    def tamano(self) -> int:
+        return _tamano_de_archivo(self.ruta)
+
+    @staticmethod
+    def volcar_json(registros, archivo, posiciones: Posiciones = None):
+        """
+        Escribe los registros como arreglo JSON, elemento por elemento (sin
+        armar una lista completa). El resultado es idéntico a
+        json.dump(lista, indent=4). Con 'posiciones' se anota además dónde
+        queda cada producto, para el índice auxiliar.
+        """
+        if posiciones is not None:
+            archivo = posiciones.envolver(archivo)
+        primero = True
+        for id_producto, nombre, cantidad, precio in registros:
+            texto = _objeto_json(id_producto, nombre, cantidad, precio)
+            archivo.write("[\n    " if primero else ",\n    ")
+            if posiciones is None:
+                archivo.write(texto)
+            else:
+                posiciones.registro(texto, id_producto, nombre)
+            primero = False
+        archivo.write("[]" if primero else "\n]")
+
+    @staticmethod
+    def _leer_registro(datos: bytes) -> tuple:
+        """Un objeto del arreglo (tal como quedó en el archivo) → tupla."""
+        d = json.loads(datos.decode("utf-8"))
+        return d["id"], d["nombre"], d["cantidad"], d["precio"]
+
+    @staticmethod
+    def _recorrer(datos: bytes):
+        """
+        Genera (inicio, largo, tupla) de cada objeto del arreglo, con las
+        posiciones en bytes. Lanza ValueError si el archivo no es un arreglo
+        JSON válido.
+        """
+        texto = datos.decode("utf-8")
+        solo_ascii = len(texto) == len(datos)
+        decodificador = json.JSONDecoder()
+        caracter = byte = 0   # Última posición convertida de caracteres a bytes
+
+        i = _saltar_espacios(texto, 0)
+        if texto[i:i + 1] != "[":
+            raise ValueError("Se esperaba un arreglo JSON.")
+        i = _saltar_espacios(texto, i + 1)
+        cierre = texto[i:i + 1] == "]"
+        while not cierre:
+            d, fin = decodificador.raw_decode(texto, i)
+            if solo_ascii:
+                inicio, largo = i, fin - i
+            else:
+                inicio = byte + len(texto[caracter:i].encode("utf-8"))
+                largo = len(texto[i:fin].encode("utf-8"))
+                caracter, byte = fin, inicio + largo
+            yield inicio, largo, (d["id"], d["nombre"], d["cantidad"], d["precio"])
+
+            i = _saltar_espacios(texto, fin)
+            cierre = texto[i:i + 1] == "]"
+            if not cierre:
+                if texto[i:i + 1] != ",":
+                    raise ValueError(f"Se esperaba ',' o ']' en la posición {i}.")
+                i = _saltar_espacios(texto, i + 1)
+        if _saltar_espacios(texto, i + 1) != len(texto):
+            raise ValueError("Hay datos después del arreglo JSON.")
+
+
+# ─────────────────────────────────────────────
+# TEXTO (formato de Semana 10)
+# ─────────────────────────────────────────────
+class AlmacenamientoTexto(Almacenamiento):
+    """
+    Archivo de texto con una línea 'id,nombre,cantidad,precio' por producto,
+    compatible con inventario.txt de Semana 10. Los nombres no pueden
+    contener comas. Las líneas inválidas se omiten al cargar.
+    """
+
+    ENCABEZADO = "# Archivo de inventario - Formato: id,nombre,cantidad,precio\n"
+
+    def __init__(self, ruta: str = "inventario.txt"):
+        self.ruta = ruta
+        self._bloqueo = BloqueoArchivo(ruta + ".lock")
+
+    def cargar(self):
+        if not os.path.exists(self.ruta):
+            return
+        omitidas = 0
+        with open(self.ruta, "r", encoding="utf-8") as archivo:
+            for linea in archivo:
+                linea = linea.strip()
+                if not linea or linea.startswith("#"):
+                    continue
+                try:
+                    yield self._interpretar(linea)
+                except ValueError:
+                    omitidas += 1
+        if omitidas:
+            print(f"⚠  {omitidas} línea(s) inválida(s) omitidas en '{self.ruta}'.")
+
+    @staticmethod
+    def _interpretar(linea: str) -> tuple:
+        """'id,nombre,cantidad,precio' → tupla. Lanza ValueError si la línea no es válida."""
+        partes = linea.split(",")
+        if len(partes) != 4:
+            raise ValueError(f"Se esperaban 4 campos: '{linea}'")
+        return (partes[0].strip(), partes[1].strip(),
+                int(partes[2].strip()), float(partes[3].strip()))
+
+    def guardar_todo(self, registros):
+        posiciones = Posiciones() if self.indexar else None
+
+        def escribir(archivo):
+            if posiciones is None:
+                archivo.write(self.ENCABEZADO)
+                for id_producto, nombre, cantidad, precio in registros:
+                    archivo.write(f"{id_producto},{nombre},{cantidad},{precio}\n")
+                return
+            archivo = posiciones.envolver(archivo)
+            archivo.write(self.ENCABEZADO)
+            for id_producto, nombre, cantidad, precio in registros:
+                linea = f"{id_producto},{nombre},{cantidad},{precio}\n"
+                try:
+                    # Se anota lo mismo que cargar() leerá de esta línea
+                    leido = self._interpretar(linea.strip())
+                except ValueError:
+                    archivo.write(linea)          # cargar() la omitirá
+                    continue
+                posiciones.registro(linea, leido[0], leido[1])
+
+        escribir_atomico(self.ruta, escribir, cerrojo=self._bloqueo)
+        with self._bloqueo:
+            if posiciones is None:
+                descartar_indice(self.ruta)
+            else:
+                posiciones.guardar(self.ruta)
+
+    def indice(self):
+        return cargar_indice(self.ruta, self._leer_registro, self._recorrer)
+
+    @classmethod
+    def _leer_registro(cls, datos: bytes) -> tuple:
+        return cls._interpretar(datos.decode("utf-8").strip())
+
+    @classmethod
+    def _recorrer(cls, datos: bytes):
+        """Genera (inicio, largo, tupla) de cada línea válida, como cargar()."""
+        inicio = 0
+        for linea in datos.splitlines(keepends=True):
+            texto = linea.decode("utf-8").strip()
+            if texto and not texto.startswith("#"):
+                try:
+                    yield inicio, len(linea), cls._interpretar(texto)
+                except ValueError:
+                    pass
+            inicio += len(linea)
+
+    def bloqueo(self):
+        return self._bloqueo
+
+    def firma(self):
+        return _firma_de_archivo(self.ruta)
+
+    def tamano(self) -> int:
+        return _tamano_de_archivo(self.ruta)
+
+
+# ─────────────────────────────────────────────
+# SQLITE
+# ─────────────────────────────────────────────
+class AlmacenamientoSQLite(Almacenamiento):
+    """
+    Base de datos SQLite (módulo estándar sqlite3) en modo WAL. Cada cambio
+    del inventario es un INSERT/UPDATE/DELETE de una sola fila, así que el
+    costo de guardar no depende del tamaño del catálogo. La tabla tiene
+    clave primaria en id e índice en nombre. SQLite ya coordina a los
+    procesos que escriben, así que no hace falta bloqueo() propio.
+    """
+
+    por_fila = True
+
+    def __init__(self, ruta: str = "inventario.db"):
+        self.ruta = ruta
+        # check_same_thread=False: el autoguardado o la compactación pueden
+        # llamar desde otro hilo; el cerrojo serializa el acceso
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self._cerrojo = threading.Lock()
+        with self._cerrojo, self._conexion:
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            self._conexion.execute("PRAGMA synchronous=NORMAL")
+            self._conexion.execute(
+                "CREATE TABLE IF NOT EXISTS productos ("
+                " id TEXT PRIMARY KEY,"
+                " nombre TEXT NOT NULL,"
+                " cantidad INTEGER NOT NULL,"
+                " precio REAL NOT NULL)")
+            self._conexion.execute(
+                "CREATE INDEX IF NOT EXISTS idx_productos_nombre ON productos(nombre)")
+
+    def cargar(self):
+        with self._cerrojo:
+            filas = self._conexion.execute(
+                "SELECT id, nombre, cantidad, precio FROM productos ORDER BY rowid").fetchall()
+        yield from filas
+
+    def guardar_todo(self, registros):
+        with self._cerrojo, self._conexion:
+            self._conexion.execute("DELETE FROM productos")
+            self._conexion.executemany(
+                "INSERT INTO productos (id, nombre, cantidad, precio) VALUES (?, ?, ?, ?)",
+                registros)
+
+    def aplicar(self, operaciones: list[dict]):
+        """Aplica todas las operaciones en una sola transacción."""
+        with self._cerrojo, self._conexion:
+            for operacion in operaciones:
+                if operacion["op"] == "eliminar":
+                    self._conexion.execute("DELETE FROM productos WHERE id = ?", (operacion["id"],))
+                else:
+                    d = operacion["producto"]
+                    self._conexion.execute(
+                        "INSERT INTO productos (id, nombre, cantidad, precio) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(id) DO UPDATE SET nombre = excluded.nombre, "
+                        "cantidad = excluded.cantidad, precio = excluded.precio",
+                        (d["id"], d["nombre"], d["cantidad"], d["precio"]))
+
+    def firma(self):
+        # data_version cambia solo cuando OTRA conexión confirma cambios
+        with self._cerrojo:
+            return self._conexion.execute("PRAGMA data_version").fetchone()[0]
+
+    def tamano(self) -> int:
+        # Con WAL los cambios recientes están en inventario.db-wal hasta el checkpoint
+        return _tamano_de_archivo(self.ruta) + _tamano_de_archivo(self.ruta + "-wal")
+
+    def cerrar(self):
+        with self._cerrojo:
+            self._conexion.close()
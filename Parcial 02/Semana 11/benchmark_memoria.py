@@ -0,0 +1,64 @@
+"""
+Benchmark de memoria: Producto con __slots__ frente a la versión anterior
+con __dict__ por instancia.
+
+Uso: python benchmark_memoria.py [cantidad_productos]   (por defecto 1.000.000)
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+
+from Inventario import Producto
+
+
+class ProductoConDict:
+    """Copia de la representación anterior (atributos en __dict__), solo para comparar."""
+
+    def __init__(self, id_producto: str, nombre: str, cantidad: int, precio: float):
+        self.__id_producto = id_producto
+        self.__nombre = nombre
+        self.__cantidad = cantidad
+        self.__precio = precio
+
+    def get_cantidad(self) -> int:
+        return self.__cantidad
+
+    def get_precio(self) -> float:
+        return self.__precio
+
+
+def medir(clase, cantidad: int) -> tuple:
+    """Crea 'cantidad' productos y retorna (MB usados, segundos de creación, segundos de recorrido)."""
+    # Las cadenas se crean antes de medir: solo interesa el costo de los objetos
+    ids = [str(i) for i in range(cantidad)]
+    gc.collect()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    productos = [clase(i, "Producto", 10, 1.5) for i in ids]
+    t_creacion = time.perf_counter() - inicio
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    inicio = time.perf_counter()
+    sum(p.get_cantidad() * p.get_precio() for p in productos)
+    t_recorrido = time.perf_counter() - inicio
+    del productos
+    return memoria / 1024 / 1024, t_creacion, t_recorrido
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"\nMemoria con {cantidad} productos")
+    print("═" * 66)
+    print(f"  {'Representación':<22} {'Memoria (MB)':>12} {'Crear (s)':>12} {'Recorrer (s)':>13}")
+    print("═" * 66)
+    for nombre, clase in (("__dict__ (anterior)", ProductoConDict), ("__slots__", Producto)):
+        memoria, t_creacion, t_recorrido = medir(clase, cantidad)
+        print(f"  {nombre:<22} {memoria:>12.1f} {t_creacion:>12.3f} {t_recorrido:>13.3f}")
+    print("═" * 66 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Cerrojos para usar el Inventario desde varios hilos (por ejemplo, detrás de
+un servicio).
+
+- CerrojoLecturaEscritura: muchos lectores a la vez (búsquedas, listados) o
+  un solo escritor (altas, bajas, cargas). Da preferencia a los escritores
+  que esperan, así no se quedan sin turno aunque lleguen lectores sin parar.
+- CerrojosPorProducto: un grupo fijo de cerrojos repartidos por hash del ID
+  (lock striping). Dos ventas del mismo producto se serializan; ventas de
+  productos distintos casi nunca compiten por el mismo cerrojo.
+- CerrojoNulo / FranjasNulas: misma interfaz sin costo, para el modo normal
+  de un solo hilo.
+"""
+
+import threading
+from contextlib import contextmanager, nullcontext
+
+
+# ─────────────────────────────────────────────
+# LECTURA / ESCRITURA
+# ─────────────────────────────────────────────
+class CerrojoLecturaEscritura:
+    """
+    Cerrojo de lectores/escritor reentrante: el hilo que escribe puede volver
+    a tomar lectura o escritura, y un lector puede volver a leer. Pasar de
+    lectura a escritura no está permitido (dos lectores que lo intentaran a
+    la vez se bloquearían para siempre) y lanza RuntimeError.
+
+    Uso:
+        with cerrojo.lectura():
+            ...
+        with cerrojo.escritura():
+            ...
+    """
+
+    def __init__(self):
+        self._condicion = threading.Condition(threading.Lock())
+        self._lectores = 0                  # Hilos distintos leyendo
+        self._escritor = None               # Ident del hilo que escribe
+        self._escritores_esperando = 0
+        self._local = threading.local()     # Pila de tomas del hilo actual
+
+    def _pila(self) -> list:
+        pila = getattr(self._local, "pila", None)
+        if pila is None:
+            pila = self._local.pila = []
+        return pila
+
+    def adquirir_lectura(self):
+        pila = self._pila()
+        if pila:
+            # El hilo ya lee o escribe: esperar aquí a un escritor sería un interbloqueo
+            pila.append("anidada")
+            return
+        with self._condicion:
+            while self._escritor is not None or self._escritores_esperando:
+                self._condicion.wait()
+            self._lectores += 1
+        pila.append("lectura")
+
+    def adquirir_escritura(self):
+        pila = self._pila()
+        yo = threading.get_ident()
+        if self._escritor == yo:
+            pila.append("anidada")
+            return
+        if pila:
+            raise RuntimeError("No se puede pasar de lectura a escritura sin soltar la lectura.")
+        with self._condicion:
+            self._escritores_esperando += 1
+            try:
+                while self._escritor is not None or self._lectores:
+                    self._condicion.wait()
+            finally:
+                self._escritores_esperando -= 1
+            self._escritor = yo
+        pila.append("escritura")
+
+    def liberar(self):
+        tipo = self._pila().pop()
+        if tipo == "anidada":
+            return
+        with self._condicion:
+            if tipo == "lectura":
+                self._lectores -= 1
+            else:
+                self._escritor = None
+            self._condicion.notify_all()
+
+    def escribiendo(self) -> bool:
+        """True si el hilo actual tiene la escritura."""
+        return self._escritor == threading.get_ident()
+
+    def libre(self) -> bool:
+        """True si el hilo actual no tiene ni lectura ni escritura."""
+        return not self._pila()
+
+    @contextmanager
+    def lectura(self):
+        self.adquirir_lectura()
+        try:
+            yield
+        finally:
+            self.liberar()
+
+    @contextmanager
+    def escritura(self):
+        self.adquirir_escritura()
+        try:
+            yield
+        finally:
+            self.liberar()
+
+
+class CerrojoNulo:
+    """Misma interfaz que CerrojoLecturaEscritura, sin sincronizar nada."""
+
+    def lectura(self):
+        return nullcontext()
+
+    def escritura(self):
+        return nullcontext()
+
+    def escribiendo(self) -> bool:
+        return False
+
+    def libre(self) -> bool:
+        return True
+
+
+# ─────────────────────────────────────────────
+# FRANJAS POR PRODUCTO (LOCK STRIPING)
+# ─────────────────────────────────────────────
+class CerrojosPorProducto:
+    """
+    'franjas' cerrojos fijos; el de un producto es hash(id) % franjas. La
+    memoria no crece con el inventario y no hay que crear ni borrar
+    cerrojos al agregar o eliminar productos.
+    """
+
+    def __init__(self, franjas: int = 64):
+        self._cerrojos = [threading.RLock() for _ in range(franjas)]
+
+    def para(self, id_producto):
+        return self._cerrojos[hash(id_producto) % len(self._cerrojos)]
+
+
+class FranjasNulas:
+    """Misma interfaz que CerrojosPorProducto, sin sincronizar nada."""
+
+    def para(self, id_producto):
+        return nullcontext()
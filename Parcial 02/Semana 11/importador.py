@@ -0,0 +1,246 @@
+"""
+Importación masiva de catálogos de proveedores al inventario.
+
+Formatos aceptados (una fila por línea):
+- CSV  (.csv):   encabezado con las columnas id,nombre,cantidad,precio
+- JSON Lines (.jsonl): un objeto {"id", "nombre", "cantidad", "precio"} por línea
+
+El archivo se lee por bloques (sin cargarlo entero en memoria); cada bloque
+se interpreta y valida en un pool de procesos, con a lo sumo dos bloques
+por proceso en vuelo: la lectura espera a que el pool libere lugar. Las
+filas válidas cuyo ID no existe todavía se agregan todas juntas con
+Inventario.agregar_muchos(), es decir, con una sola escritura a disco. Al
+final se muestra un resumen con las filas rechazadas y el motivo.
+
+La cantidad debe ser un entero (2.9 o true se rechazan, no se truncan) y el
+precio un número; un CSV guardado por Excel con BOM se lee igual.
+
+Uso:
+    python importador.py catalogo.csv [--procesos N]
+"""
+
+import csv
+import json
+import math
+import os
+import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+TAMANO_BLOQUE = 5000          # Líneas por bloque enviado a cada proceso
+BLOQUES_POR_PROCESO = 2       # Bloques en vuelo por proceso (uno procesándose, otro en cola)
+MAX_RECHAZOS_MOSTRADOS = 10
+COLUMNAS = ("id", "nombre", "cantidad", "precio")
+ENTERO = re.compile(r"\s*[-+]?[0-9]+\s*")
+
+
+# ─────────────────────────────────────────────
+# LECTURA POR BLOQUES
+# ─────────────────────────────────────────────
+def _formato_de(ruta: str) -> str:
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Formato no soportado: '{extension}' (use .csv o .jsonl)")
+
+
+def leer_bloques(ruta: str, tamano_bloque: int = TAMANO_BLOQUE):
+    """
+    Genera tuplas (formato, encabezado, [(número de línea, texto), ...]).
+    En CSV el encabezado es la lista de columnas de la primera línea; no se
+    admiten campos entre comillas que ocupen varias líneas.
+    """
+    formato = _formato_de(ruta)
+    # utf-8-sig: Excel guarda los CSV con BOM, que si no quedaría pegado a "id"
+    with open(ruta, "r", encoding="utf-8-sig", newline="") as archivo:
+        lineas = enumerate(archivo, start=1)
+        encabezado = None
+        if formato == "csv":
+            primera = next(lineas, None)
+            if primera is None:
+                return
+            encabezado = [c.strip().lower() for c in next(csv.reader([primera[1]]))]
+            faltantes = set(COLUMNAS) - set(encabezado)
+            if faltantes:
+                raise ValueError(f"Faltan columnas en el CSV: {', '.join(sorted(faltantes))}")
+
+        while True:
+            bloque = list(islice(lineas, tamano_bloque))
+            if not bloque:
+                return
+            yield formato, encabezado, bloque
+
+
+# ─────────────────────────────────────────────
+# VALIDACIÓN (se ejecuta en los procesos del pool)
+# ─────────────────────────────────────────────
+def _validar(campos: dict) -> tuple:
+    """Convierte y valida una fila. Lanza ValueError con el motivo si es inválida."""
+    id_producto = str(campos.get("id", "")).strip()
+    nombre = str(campos.get("nombre", "")).strip()
+    if not id_producto:
+        raise ValueError("ID vacío")
+    if not nombre:
+        raise ValueError("nombre vacío")
+    cantidad = _entero(campos.get("cantidad"))
+    precio = _numero(campos.get("precio"))
+    if cantidad < 0 or precio < 0:
+        raise ValueError("cantidad o precio negativos")
+    return id_producto, nombre, cantidad, precio
+
+
+def _entero(valor) -> int:
+    """
+    Cantidad de una fila: un int en JSON o un texto con un entero en CSV.
+    Lanza ValueError con cualquier otra cosa (2.9, "2.9", true, ...).
+    """
+    if type(valor) is int:
+        return valor
+    if type(valor) is str and ENTERO.fullmatch(valor):
+        return int(valor)
+    raise ValueError("cantidad no entera")
+
+
+def _numero(valor) -> float:
+    """Precio de una fila: un número finito (no bool) o un texto con uno."""
+    try:
+        if type(valor) in (str, int, float):
+            precio = float(valor)
+            if math.isfinite(precio):
+                return precio
+    except ValueError:
+        pass
+    raise ValueError("precio no numérico")
+
+
+def procesar_bloque(tarea: tuple) -> tuple:
+    """
+    Interpreta y valida un bloque de líneas.
+
+    Returns:
+        tuple: (aceptadas [(línea, id, nombre, cantidad, precio)],
+                rechazadas [(línea, motivo)])
+    """
+    formato, encabezado, bloque = tarea
+    aceptadas, rechazadas = [], []
+    for numero, texto in bloque:
+        if not texto.strip():
+            continue
+        try:
+            if formato == "csv":
+                valores = next(csv.reader([texto]))
+                if len(valores) != len(encabezado):
+                    raise ValueError(f"se esperaban {len(encabezado)} columnas")
+                campos = dict(zip(encabezado, valores))
+            else:
+                try:
+                    campos = json.loads(texto)
+                except json.JSONDecodeError:
+                    raise ValueError("JSON inválido") from None
+                if not isinstance(campos, dict):
+                    raise ValueError("la línea no es un objeto JSON")
+            aceptadas.append((numero, *_validar(campos)))
+        except ValueError as e:
+            rechazadas.append((numero, str(e)))
+    return aceptadas, rechazadas
+
+
+def _procesar_en_pool(pool: ProcessPoolExecutor, bloques, en_vuelo: int):
+    """
+    Como pool.map(procesar_bloque, bloques), en el mismo orden, pero con a
+    lo sumo 'en_vuelo' bloques enviados y sin resultado consumido: el
+    siguiente bloque se lee recién cuando se entrega el resultado más viejo,
+    así la memoria no depende del tamaño del archivo.
+    """
+    pendientes = deque()
+    for bloque in bloques:
+        pendientes.append(pool.submit(procesar_bloque, bloque))
+        if len(pendientes) >= en_vuelo:
+            yield pendientes.popleft().result()
+    while pendientes:
+        yield pendientes.popleft().result()
+
+
+# ─────────────────────────────────────────────
+# IMPORTACIÓN
+# ─────────────────────────────────────────────
+def importar(inventario, ruta: str, procesos: int = None,
+             tamano_bloque: int = TAMANO_BLOQUE) -> dict:
+    """
+    Importa el archivo al inventario y retorna un resumen:
+        {"leidas": int, "agregadas": int, "rechazadas": [(línea, motivo)]}
+
+    Las filas con un ID que ya existe en el inventario, o repetido dentro
+    del mismo archivo (se conserva la primera), se rechazan. procesos=1
+    valida en el proceso actual, sin pool.
+    """
+    filas: list[tuple] = []
+    rechazadas: list[tuple] = []
+    vistos: set[str] = set()
+    leidas = 0
+
+    bloques = leer_bloques(ruta, tamano_bloque)
+    if procesos == 1:
+        resultados = map(procesar_bloque, bloques)
+        pool = None
+    else:
+        trabajadores = procesos or os.cpu_count() or 1
+        pool = ProcessPoolExecutor(max_workers=trabajadores)
+        resultados = _procesar_en_pool(pool, bloques, trabajadores * BLOQUES_POR_PROCESO)
+
+    try:
+        # Los resultados llegan en el orden de los bloques, así "la primera gana" es estable
+        for aceptadas, rechazos in resultados:
+            leidas += len(aceptadas) + len(rechazos)
+            rechazadas.extend(rechazos)
+            for numero, id_producto, nombre, cantidad, precio in aceptadas:
+                if id_producto in inventario:
+                    rechazadas.append((numero, f"ID '{id_producto}' ya existe en el inventario"))
+                elif id_producto in vistos:
+                    rechazadas.append((numero, f"ID '{id_producto}' repetido en el archivo"))
+                else:
+                    vistos.add(id_producto)
+                    filas.append((id_producto, nombre, cantidad, precio))
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    if filas:
+        inventario.agregar_muchos(filas)   # Una sola escritura a disco
+    rechazadas.sort()
+    return {"leidas": leidas, "agregadas": len(filas), "rechazadas": rechazadas}
+
+
+def imprimir_resumen(resumen: dict):
+    """Muestra el resultado de importar() en consola."""
+    rechazadas = resumen["rechazadas"]
+    print("\n" + "═" * 60)
+    print(f"  Filas leídas    : {resumen['leidas']}")
+    print(f"  Agregadas       : {resumen['agregadas']}")
+    print(f"  Rechazadas      : {len(rechazadas)}")
+    for numero, motivo in rechazadas[:MAX_RECHAZOS_MOSTRADOS]:
+        print(f"    Línea {numero}: {motivo}")
+    if len(rechazadas) > MAX_RECHAZOS_MOSTRADOS:
+        print(f"    ... y {len(rechazadas) - MAX_RECHAZOS_MOSTRADOS} más.")
+    print("═" * 60)
+
+
+if __name__ == "__main__":
+    from Inventario import Inventario
+    from movimientos import ARCHIVO_MOVIMIENTOS, LibroMovimientos
+
+    if len(sys.argv) < 2:
+        print(f"Uso: python {os.path.basename(__file__)} <archivo.csv|archivo.jsonl> [--procesos N]")
+        sys.exit(1)
+    n_procesos = None
+    if "--procesos" in sys.argv:
+        n_procesos = int(sys.argv[sys.argv.index("--procesos") + 1])
+
+    # Con el libro de movimientos, el stock importado queda registrado como alta
+    inventario = Inventario(movimientos=LibroMovimientos(ARCHIVO_MOVIMIENTOS))
+    imprimir_resumen(importar(inventario, sys.argv[1], n_procesos))
+    inventario.cerrar()
@@ -0,0 +1,400 @@
+"""
+Módulo: indice_archivo.py
+Descripción: Índice auxiliar que se guarda junto al archivo de datos
+             (inventario.json.idx, inventario.txt.idx).
+
+Con la carga perezosa, al iniciar hay que saber qué IDs existen y, para la
+primera búsqueda, qué nombres tiene cada producto. Leer eso del archivo de
+datos obliga a interpretar todo el JSON (o todas las líneas). El índice
+auxiliar lo guarda ya resuelto:
+- ID → posición en bytes y largo del registro dentro del archivo de datos,
+  así cada producto se interpreta recién cuando se usa
+- nombre de cada producto y palabra del nombre → productos que la tienen,
+  para buscar por nombre sin crear ningún Producto
+
+Solo se usa con carga perezosa: en ese modo se escribe al guardar el archivo
+de datos (las posiciones se anotan mientras se escribe, ver Posiciones); sin
+ella, guardar solo borra el índice anterior, que ya no correspondería. Si al
+iniciar no existe o no corresponde al archivo, se arma recorriendo los datos
+una vez y se guarda para la próxima. Corresponde al archivo si coinciden el
+tamaño y el mtime guardados: validarlo es un os.fstat, sin leer los datos.
+
+Los registros se leen del archivo de datos recién cuando se piden (os.pread
+en su posición), con el archivo abierto desde el inicio: aunque después se
+reemplace (al guardar), el abierto sigue siendo el que describe el índice.
+En Windows no hay os.pread y un archivo abierto no se puede reemplazar, así
+que allí se lee completo al abrir el índice.
+
+Estructura del archivo (little-endian):
+    Encabezado   "<4sHHQqIIIIII" → firma b"INVX", versión, reservado,
+                 tamaño y mtime (ns) del archivo de datos, cantidad de
+                 productos (n), cantidad de palabras (m), largo de los
+                 bloques de IDs, nombres y palabras, total de apariciones
+    inicios      n × uint64 → posición del registro en el archivo de datos
+    largos       n × uint32 → bytes del registro
+    cortes       (m + 1) × uint32 → inicio de la lista de cada palabra
+    apariciones  total × uint32 → productos (por posición) de cada palabra
+    ids, nombres, palabras → bloques UTF-8 separados por saltos de línea
+
+Uso desde la terminal (arma o revisa el índice de un archivo):
+    python indice_archivo.py inventario.json
+    python indice_archivo.py inventario.txt
+"""
+
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+FIRMA = b"INVX"
+VERSION = 2
+SUFIJO = ".idx"
+ENCABEZADO = struct.Struct("<4sHHQqIIIIII")
+TAMANO_ENCABEZADO = 48   # Múltiplo de 8: las columnas quedan alineadas
+
+
+# ─────────────────────────────────────────────
+# ESCRITURA
+# ─────────────────────────────────────────────
+class Posiciones:
+    """
+    Anota dónde empieza cada registro mientras se escribe el archivo de
+    datos y, una vez guardado, escribe su índice auxiliar.
+
+    Uso (dentro de la función que escribe el archivo):
+        salida = posiciones.envolver(archivo)
+        salida.write(encabezado)
+        posiciones.registro(texto, id_producto, nombre)
+    y después de reemplazar el archivo: posiciones.guardar(ruta)
+    """
+
+    def __init__(self):
+        self.ids: list[str] = []
+        self.nombres: list[str] = []
+        self.inicios = array("Q")
+        self.largos = array("I")
+        self.tamano = 0
+        self.valido = True      # False si algún registro no se puede indexar
+        self._archivo = None
+
+    def envolver(self, archivo):
+        """Escribe a través de este objeto en 'archivo' (se usa como un archivo)."""
+        self._archivo = archivo
+        return self
+
+    def write(self, texto: str):
+        self._archivo.write(texto)
+        self.tamano += len(texto.encode("utf-8"))
+
+    def registro(self, texto: str, id_producto, nombre: str):
+        """Escribe el texto de un producto y anota su posición."""
+        inicio = self.tamano
+        self.write(texto)
+        if not _indexable(id_producto, nombre):
+            self.valido = False
+            return
+        self.ids.append(id_producto)
+        self.nombres.append(nombre)
+        self.inicios.append(inicio)
+        self.largos.append(self.tamano - inicio)
+
+    def guardar(self, ruta_datos: str):
+        """
+        Escribe ruta_datos + '.idx'. Se llama con el bloqueo del archivo de
+        datos tomado, así el mtime leído es el del archivo recién escrito.
+        Si el tamaño en disco no es el contado (por ejemplo, saltos de línea
+        convertidos a \\r\\n en Windows) no se escribe: no serviría.
+        """
+        if not self.valido:
+            return
+        try:
+            estado = os.stat(ruta_datos)
+        except OSError:
+            return
+        if estado.st_size != self.tamano:
+            return
+        _escribir(ruta_datos + SUFIJO, _serializar(
+            self.tamano, estado.st_mtime_ns, self.ids, self.nombres, self.inicios, self.largos))
+
+
+def descartar_indice(ruta_datos: str):
+    """
+    Borra el índice de 'ruta_datos' (si existe). Se llama al guardar sin
+    escribir uno nuevo: así nunca queda uno viejo que pueda confundirse con
+    el archivo nuevo.
+    """
+    try:
+        os.remove(ruta_datos + SUFIJO)
+    except OSError:
+        pass
+
+
+def _indexable(id_producto, nombre) -> bool:
+    """Los IDs y nombres se guardan separados por saltos de línea."""
+    return (type(id_producto) is str and type(nombre) is str
+            and "\n" not in id_producto and "\n" not in nombre)
+
+
+def _serializar(tamano, mtime_ns, ids, nombres, inicios, largos) -> bytes:
+    """Contenido completo del archivo .idx."""
+    apariciones: dict[str, array] = {}    # palabra → posiciones, en orden
+    for posicion, nombre in enumerate(nombres):
+        for palabra in set(nombre.lower().split()):
+            lista = apariciones.get(palabra)
+            if lista is None:
+                lista = apariciones[palabra] = array("I")
+            lista.append(posicion)
+
+    cortes = array("I", [0])
+    todas = array("I")
+    for lista in apariciones.values():
+        todas.extend(lista)
+        cortes.append(len(todas))
+
+    bloque_ids = "\n".join(ids).encode("utf-8")
+    bloque_nombres = "\n".join(nombres).encode("utf-8")
+    bloque_palabras = "\n".join(apariciones).encode("utf-8")
+
+    encabezado = ENCABEZADO.pack(
+        FIRMA, VERSION, 0, tamano, mtime_ns, len(ids), len(apariciones),
+        len(bloque_ids), len(bloque_nombres), len(bloque_palabras), len(todas))
+    return b"".join((encabezado.ljust(TAMANO_ENCABEZADO, b"\0"), _bytes(inicios),
+                     _bytes(largos), _bytes(cortes), _bytes(todas),
+                     bloque_ids, bloque_nombres, bloque_palabras))
+
+
+def _bytes(columna: array) -> bytes:
+    if sys.byteorder != "little":
+        columna = array(columna.typecode, columna)
+        columna.byteswap()
+    return columna.tobytes()
+
+
+def _escribir(ruta: str, contenido: bytes):
+    """
+    Reemplaza 'ruta' con un temporal + os.replace (quien lo lea ve el índice
+    anterior o el nuevo, nunca uno a medias). Sin fsync: si se pierde, no
+    coincidirá con el archivo de datos y se vuelve a armar.
+    """
+    carpeta = os.path.dirname(os.path.abspath(ruta))
+    try:
+        descriptor, temporal = tempfile.mkstemp(
+            prefix=os.path.basename(ruta) + ".", suffix=".tmp", dir=carpeta)
+    except OSError:
+        return   # Carpeta sin permiso de escritura: se arma en cada inicio
+    try:
+        with os.fdopen(descriptor, "wb") as archivo:
+            archivo.write(contenido)
+        os.replace(temporal, ruta)
+    except OSError:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+
+# ─────────────────────────────────────────────
+# LECTURA
+# ─────────────────────────────────────────────
+class IndiceArchivo:
+    """
+    Índice auxiliar cargado, junto con el archivo de datos que describe
+    abierto (así los registros se pueden interpretar aunque otra caja
+    reemplace el archivo después). cerrar() lo libera.
+
+    Atributos:
+        ids (list[str]): IDs en el orden del archivo; la posición de cada
+                         uno es la que usan registro() y nombre()
+    """
+
+    def __init__(self, contenido: bytes, archivo, leer_registro):
+        """
+        Args:
+            contenido (bytes): El archivo .idx completo
+            archivo: El archivo de datos, abierto en modo "rb"; queda a
+                     cargo del índice
+            leer_registro (callable): bytes de un registro → tupla
+                                      (id, nombre, cantidad, precio)
+
+        Raises:
+            ValueError: Si el contenido no es un índice válido
+        """
+        if len(contenido) < TAMANO_ENCABEZADO:
+            raise ValueError("Índice auxiliar truncado.")
+        (firma, version, _, self.tamano, self.mtime_ns, n, m,
+         largo_ids, largo_nombres, largo_palabras, total) = ENCABEZADO.unpack_from(contenido, 0)
+        if firma != FIRMA or version != VERSION:
+            raise ValueError("No es un índice auxiliar de esta versión.")
+
+        vista = memoryview(contenido)
+        posicion = TAMANO_ENCABEZADO
+
+        def columna(tipo, cantidad):
+            nonlocal posicion
+            valores = array(tipo)
+            fin = posicion + valores.itemsize * cantidad
+            if fin > len(contenido):
+                raise ValueError("Índice auxiliar truncado.")
+            valores.frombytes(vista[posicion:fin])
+            if sys.byteorder != "little":
+                valores.byteswap()
+            posicion = fin
+            return valores
+
+        def bloque(largo, cantidad):
+            nonlocal posicion
+            texto = bytes(vista[posicion:posicion + largo]).decode("utf-8")
+            posicion += largo
+            return texto.split("\n") if cantidad else []
+
+        self._inicios = columna("Q", n)
+        self._largos = columna("I", n)
+        self._cortes = columna("I", m + 1)
+        self._apariciones = columna("I", total)
+        self.ids = bloque(largo_ids, n)
+        self._bloque_nombres = bytes(vista[posicion:posicion + largo_nombres])
+        posicion += largo_nombres
+        self._palabras = bloque(largo_palabras, m)
+        if posicion != len(contenido) or len(self.ids) != n or len(self._palabras) != m:
+            raise ValueError("Índice auxiliar inconsistente.")
+
+        self._n = n
+        self._nombres = None     # Se separan en la primera búsqueda
+        self._leer_registro = leer_registro
+        self._archivo = archivo
+        self._datos = None
+        if not hasattr(os, "pread"):     # Windows: se lee todo y se cierra
+            archivo.seek(0)
+            self._datos = archivo.read()
+            archivo.close()
+
+    @staticmethod
+    def abrir(ruta_datos: str, archivo, leer_registro):
+        """
+        Índice guardado de 'ruta_datos' si corresponde al archivo de datos
+        abierto (mismo tamaño y mtime), o None si no existe, es de otra
+        versión o describe otro contenido.
+        """
+        estado = os.fstat(archivo.fileno())
+        try:
+            with open(ruta_datos + SUFIJO, "rb") as archivo_indice:
+                contenido = archivo_indice.read()
+            tamano, mtime_ns = ENCABEZADO.unpack_from(contenido, 0)[3:5]
+        except (OSError, struct.error):
+            return None
+        if tamano != estado.st_size or mtime_ns != estado.st_mtime_ns:
+            return None
+        try:
+            return IndiceArchivo(contenido, archivo, leer_registro)
+        except ValueError:
+            return None
+
+    def __len__(self) -> int:
+        return self._n
+
+    def registro(self, posicion: int) -> tuple:
+        """Tupla (id, nombre, cantidad, precio) leída del archivo de datos."""
+        inicio, largo = self._inicios[posicion], self._largos[posicion]
+        if self._datos is None:
+            return self._leer_registro(os.pread(self._archivo.fileno(), largo, inicio))
+        return self._leer_registro(self._datos[inicio:inicio + largo])
+
+    def nombre(self, posicion: int) -> str:
+        """Nombre del producto en la posición dada, sin leer su registro."""
+        if self._nombres is None:
+            self._nombres = self._bloque_nombres.decode("utf-8").split("\n")
+        return self._nombres[posicion]
+
+    def buscar(self, termino: str) -> set:
+        """
+        Posiciones de los productos en cuyo nombre cada palabra del término
+        (en minúsculas) está dentro de alguna palabra. Incluye a todos los
+        que contienen el término, pero puede incluir otros: hay que revisar
+        el nombre completo de cada uno.
+        """
+        resultado = None
+        for parte in set(termino.split()):
+            posiciones = set()
+            for k, palabra in enumerate(self._palabras):
+                if parte in palabra:
+                    posiciones.update(self._apariciones[self._cortes[k]:self._cortes[k + 1]])
+            resultado = posiciones if resultado is None else resultado & posiciones
+            if not resultado:
+                break
+        return resultado or set()
+
+    def cerrar(self):
+        """Cierra el archivo de datos; después registro() ya no se puede usar."""
+        self._archivo.close()
+
+
+def cargar_indice(ruta_datos: str, leer_registro, recorrer):
+    """
+    Índice auxiliar de 'ruta_datos' listo para usar: el guardado si sigue
+    correspondiendo al archivo; si no, uno nuevo que se arma recorriendo
+    los datos y se guarda para el próximo inicio.
+
+    Args:
+        ruta_datos (str): Archivo de datos (inventario.json, inventario.txt)
+        leer_registro (callable): bytes de un registro → tupla
+        recorrer (callable): bytes del archivo → genera (inicio, largo, tupla)
+                             de cada producto; ValueError si no se puede leer
+
+    Returns:
+        IndiceArchivo | None: None si el archivo no existe, no se puede
+        recorrer (corrupto) o tiene IDs que no se pueden indexar; en ese
+        caso se carga de la forma habitual
+    """
+    try:
+        archivo = open(ruta_datos, "rb")
+    except FileNotFoundError:
+        return None
+    try:
+        indice = IndiceArchivo.abrir(ruta_datos, archivo, leer_registro)
+        if indice is None:
+            indice = _armar_indice(ruta_datos, archivo, leer_registro, recorrer)
+    except BaseException:
+        archivo.close()
+        raise
+    if indice is None:
+        archivo.close()
+    return indice
+
+
+def _armar_indice(ruta_datos: str, archivo, leer_registro, recorrer):
+    """Recorre el archivo de datos abierto, guarda su índice y lo entrega."""
+    estado = os.fstat(archivo.fileno())
+    datos = archivo.read()
+    ids, nombres, inicios, largos = [], [], array("Q"), array("I")
+    try:
+        for inicio, largo, (id_producto, nombre, _, _) in recorrer(datos):
+            if not _indexable(id_producto, nombre):
+                return None
+            ids.append(id_producto)
+            nombres.append(nombre)
+            inicios.append(inicio)
+            largos.append(largo)
+    except (ValueError, KeyError, TypeError):
+        return None
+
+    contenido = _serializar(len(datos), estado.st_mtime_ns, ids, nombres, inicios, largos)
+    _escribir(ruta_datos + SUFIJO, contenido)
+    return IndiceArchivo(contenido, archivo, leer_registro)
+
+
+if __name__ == "__main__":
+    import time
+
+    from almacenamiento import AlmacenamientoJSON, AlmacenamientoTexto
+
+    if len(sys.argv) != 2:
+        print(f"Uso: python {os.path.basename(__file__)} <inventario.json | inventario.txt>")
+        sys.exit(1)
+    ruta = sys.argv[1]
+    tipo = AlmacenamientoTexto if ruta.endswith(".txt") else AlmacenamientoJSON
+    inicio = time.perf_counter()
+    indice = tipo(ruta).indice()
+    if indice is None:
+        print(f"✖  No se pudo indexar '{ruta}' (no existe o no se puede leer).")
+        sys.exit(1)
+    print(f"✔  '{ruta}{SUFIJO}': {len(indice)} productos "
+          f"({(time.perf_counter() - inicio) * 1000:.0f} ms).")
@@ -0,0 +1,142 @@
+"""
+Módulo: indice_nombres.py
+Descripción: Índice invertido para buscar productos por nombre sin recorrer
+             todo el inventario.
+
+Estructuras internas:
+- Tokens   (dict[str, set]): palabra completa  → IDs que la contienen
+- Trigramas (dict[str, set]): 3 letras seguidas → IDs que las contienen
+
+Una búsqueda por subcadena de 3 o más letras intersecta los conjuntos de
+sus trigramas (empezando por el más pequeño) y solo verifica esos pocos
+candidatos, en vez de revisar cada nombre del inventario.
+"""
+
+
+class IndiceNombres:
+    """Índice de nombres actualizado de forma incremental (agregar/eliminar/renombrar)."""
+
+    def __init__(self):
+        self._nombres: dict = {}                 # id → nombre en minúsculas
+        self._orden: dict = {}                   # id → orden de inserción
+        self._tokens: dict[str, set] = {}        # palabra → {ids}
+        self._trigramas: dict[str, set] = {}     # trigrama → {ids}
+        self._contador = 0
+
+    # ── Utilidades ───────────────────────────
+    @staticmethod
+    def _trigramas_de(texto: str) -> set:
+        """Trigramas de un texto; con relleno para que los nombres cortos también tengan."""
+        texto = f" {texto} "
+        return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+    # ── Mantenimiento ────────────────────────
+    def agregar(self, id_producto, nombre: str):
+        """Registra un producto en el índice."""
+        if id_producto in self._nombres:
+            self.eliminar(id_producto)
+
+        nombre = nombre.lower()
+        self._nombres[id_producto] = nombre
+        self._orden[id_producto] = self._contador
+        self._contador += 1
+
+        for token in set(nombre.split()):
+            self._tokens.setdefault(token, set()).add(id_producto)
+        for trigrama in self._trigramas_de(nombre):
+            self._trigramas.setdefault(trigrama, set()).add(id_producto)
+
+    def eliminar(self, id_producto):
+        """Quita un producto del índice (si no existe, no hace nada)."""
+        nombre = self._nombres.pop(id_producto, None)
+        if nombre is None:
+            return
+        del self._orden[id_producto]
+
+        for token in set(nombre.split()):
+            self._quitar(self._tokens, token, id_producto)
+        for trigrama in self._trigramas_de(nombre):
+            self._quitar(self._trigramas, trigrama, id_producto)
+
+    def renombrar(self, id_producto, nuevo_nombre: str):
+        """Actualiza el nombre indexado conservando el orden original."""
+        orden = self._orden.get(id_producto)
+        self.eliminar(id_producto)
+        self.agregar(id_producto, nuevo_nombre)
+        if orden is not None:
+            self._orden[id_producto] = orden
+
+    def limpiar(self):
+        """Vacía el índice."""
+        self._nombres.clear()
+        self._orden.clear()
+        self._tokens.clear()
+        self._trigramas.clear()
+
+    @staticmethod
+    def _quitar(tabla: dict, clave: str, id_producto):
+        ids = tabla.get(clave)
+        if ids is not None:
+            ids.discard(id_producto)
+            if not ids:
+                del tabla[clave]
+
+    # ── Búsqueda ─────────────────────────────
+    def buscar(self, termino: str, limite: int = None) -> list:
+        """
+        Retorna los IDs cuyo nombre contiene 'termino' (sin distinguir
+        mayúsculas), ordenados por relevancia:
+          1. el término es una palabra completa del nombre
+          2. alguna palabra del nombre empieza con el término
+          3. el término aparece en cualquier otra parte
+        A igual relevancia se respeta el orden de inserción.
+        """
+        termino = termino.lower().strip()
+        if not termino:
+            candidatos = self._nombres.keys()
+        elif len(termino) >= 3:
+            candidatos = self._candidatos_trigramas(termino)
+        else:
+            # Término corto: unir los trigramas del vocabulario que lo contienen
+            # (el vocabulario es mucho más pequeño que el catálogo)
+            candidatos = set()
+            for trigrama, ids in self._trigramas.items():
+                if termino in trigrama:
+                    candidatos |= ids
+
+        exactos = self._tokens.get(termino, set())
+        resultados = []
+        for id_producto in candidatos:
+            nombre = self._nombres[id_producto]
+            if termino not in nombre:
+                continue  # Falso positivo del filtro de trigramas
+            if id_producto in exactos:
+                rango = 0
+            elif any(token.startswith(termino) for token in nombre.split()):
+                rango = 1
+            else:
+                rango = 2
+            resultados.append((rango, self._orden[id_producto], id_producto))
+
+        resultados.sort()
+        if limite is not None:
+            resultados = resultados[:limite]
+        return [id_producto for _, _, id_producto in resultados]
+
+    def _candidatos_trigramas(self, termino: str) -> set:
+        conjuntos = []
+        for i in range(len(termino) - 2):
+            ids = self._trigramas.get(termino[i:i + 3])
+            if not ids:
+                return set()
+            conjuntos.append(ids)
+        conjuntos.sort(key=len)
+        candidatos = set(conjuntos[0])
+        for ids in conjuntos[1:]:
+            candidatos &= ids
+            if not candidatos:
+                break
+        return candidatos
+
+    def __len__(self) -> int:
+        return len(self._nombres)
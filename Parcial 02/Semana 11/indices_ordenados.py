@@ -0,0 +1,69 @@
+"""
+Índices secundarios ordenados para consultas por rango (cantidad, precio).
+
+Cada índice es una lista de tuplas (valor, id) siempre ordenada. Con bisect
+se ubica el inicio y el fin del rango en O(log n) y se devuelven solo los k
+elementos que están dentro: O(log n + k), sin recorrer todo el inventario.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+
+
+class _MayorQueTodo:
+    """Centinela que es mayor que cualquier ID; permite buscar '(valor, +∞)'."""
+
+    def __lt__(self, otro):
+        return False
+
+    def __gt__(self, otro):
+        return True
+
+
+_INFINITO = _MayorQueTodo()
+
+
+class IndiceOrdenado:
+    """Lista ordenada de (valor, id) mantenida con bisect."""
+
+    def __init__(self):
+        self._claves: list[tuple] = []
+
+    def agregar(self, valor, id_producto):
+        insort(self._claves, (valor, id_producto))
+
+    def eliminar(self, valor, id_producto):
+        posicion = bisect_left(self._claves, (valor, id_producto))
+        if posicion < len(self._claves) and self._claves[posicion] == (valor, id_producto):
+            del self._claves[posicion]
+
+    def actualizar(self, valor_anterior, valor_nuevo, id_producto):
+        if valor_anterior != valor_nuevo:
+            self.eliminar(valor_anterior, id_producto)
+            self.agregar(valor_nuevo, id_producto)
+
+    def limpiar(self):
+        self._claves.clear()
+
+    def construir(self, pares):
+        """
+        Reemplaza el contenido con los pares (valor, id) dados, ordenándolos
+        de una vez: O(n log n), contra O(n²) de agregarlos uno por uno.
+        """
+        self._claves = sorted(pares)
+
+    def rango(self, minimo=None, maximo=None, incluir_maximo: bool = True) -> list:
+        """
+        IDs con minimo <= valor <= maximo (o < maximo si incluir_maximo es
+        False), de menor a mayor valor. None significa sin límite.
+        """
+        inicio = 0 if minimo is None else bisect_left(self._claves, (minimo,))
+        if maximo is None:
+            fin = len(self._claves)
+        elif incluir_maximo:
+            fin = bisect_right(self._claves, (maximo, _INFINITO))
+        else:
+            fin = bisect_left(self._claves, (maximo,))
+        return [id_producto for _, id_producto in self._claves[inicio:fin]]
+
+    def __len__(self) -> int:
+        return len(self._claves)
@@ -0,0 +1,289 @@
+"""
+Libro de movimientos de stock: cada alta, baja, venta, reposición o ajuste
+de cantidad queda registrado (producto, diferencia, instante, motivo). El
+Inventario solo guarda la cantidad actual; este libro guarda la historia.
+
+Se guarda en SQLite (movimientos.db, modo WAL) con cuatro tablas:
+- movimientos: una fila por cambio, solo se agregan (append-only)
+- por_hora / por_dia: totales precalculados por (producto, período,
+  motivo) con la suma de unidades y la cantidad de movimientos
+- demanda: por producto, las ventas diarias suavizadas exponencialmente
+  (ver demanda_suavizada), que usa pronostico.py
+Todas se actualizan en la misma transacción que inserta los movimientos.
+
+Así "unidades vendidas por producto en los últimos 30 días" lee a lo sumo
+30 filas por producto de por_dia, sin recorrer los movimientos. Los
+períodos usan la hora local ("2025-03-14" y "2025-03-14T09"), que se
+comparan bien como texto.
+
+Varias cajas pueden compartir el mismo movimientos.db: SQLite coordina a
+los procesos y cada caja registra solo sus propios cambios.
+
+Uso:
+    python movimientos.py [--dias 30]      (unidades vendidas por producto)
+"""
+
+from __future__ import annotations
+
+import datetime
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+
+ARCHIVO_MOVIMIENTOS = "movimientos.db"
+
+# Motivos que registra el Inventario
+ALTA, BAJA, VENTA, REPOSICION, AJUSTE = "alta", "baja", "venta", "reposición", "ajuste"
+
+_PERIODOS = (("por_hora", "%Y-%m-%dT%H"), ("por_dia", "%Y-%m-%d"))
+
+# Suavizado exponencial de la demanda: peso del último día (cada día
+# anterior pesa 1 - ALFA_DEMANDA veces lo que el siguiente)
+ALFA_DEMANDA = 0.3
+
+
+def clave_dia(instante: float) -> str:
+    """Día local del instante, como se guarda en por_dia."""
+    return time.strftime("%Y-%m-%d", time.localtime(instante))
+
+
+def clave_hora(instante: float) -> str:
+    """Hora local del instante, como se guarda en por_hora."""
+    return time.strftime("%Y-%m-%dT%H", time.localtime(instante))
+
+
+def dias_hasta(hasta: float, dias: int) -> list[str]:
+    """Los 'dias' días locales que terminan en el de 'hasta', del más viejo al más nuevo."""
+    ultimo = datetime.date.fromtimestamp(hasta)
+    return [(ultimo - datetime.timedelta(days=d)).isoformat() for d in range(dias - 1, -1, -1)]
+
+
+class LibroMovimientos:
+    """
+    Registro append-only de movimientos con totales por hora y por día.
+
+    Uso:
+        libro = LibroMovimientos("movimientos.db")
+        libro.registrar([("P1", -2, time.time(), "venta")])
+        libro.unidades_por_producto(dias=30)    # {"P1": 2, ...}
+    """
+
+    def __init__(self, ruta: str = ARCHIVO_MOVIMIENTOS):
+        self.ruta = ruta
+        # Se registra desde el hilo que vacía la cola de persistencia
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self._cerrojo = threading.Lock()
+        with self._cerrojo, self._conexion:
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            self._conexion.execute("PRAGMA synchronous=NORMAL")
+            self._conexion.execute(
+                "CREATE TABLE IF NOT EXISTS movimientos ("
+                " id INTEGER PRIMARY KEY,"
+                " producto TEXT NOT NULL,"
+                " diferencia INTEGER NOT NULL,"
+                " instante REAL NOT NULL,"
+                " motivo TEXT NOT NULL)")
+            self._conexion.execute(
+                "CREATE INDEX IF NOT EXISTS idx_movimientos_producto"
+                " ON movimientos(producto, instante)")
+            for tabla, _ in _PERIODOS:
+                self._conexion.execute(
+                    f"CREATE TABLE IF NOT EXISTS {tabla} ("
+                    " producto TEXT NOT NULL,"
+                    " periodo TEXT NOT NULL,"
+                    " motivo TEXT NOT NULL,"
+                    " unidades INTEGER NOT NULL,"
+                    " movimientos INTEGER NOT NULL,"
+                    " PRIMARY KEY (producto, periodo, motivo)) WITHOUT ROWID")
+                self._conexion.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{tabla}_periodo ON {tabla}(periodo)")
+            # Ventas diarias (y sus cuadrados) con peso (1 - alfa)^k por cada
+            # día k antes de 'dia' (ordinal de la fecha)
+            self._conexion.execute(
+                "CREATE TABLE IF NOT EXISTS demanda ("
+                " producto TEXT PRIMARY KEY,"
+                " dia INTEGER NOT NULL,"
+                " nivel REAL NOT NULL,"
+                " cuadrados REAL NOT NULL) WITHOUT ROWID")
+            if self._conexion.execute("SELECT 1 FROM demanda LIMIT 1").fetchone() is None:
+                self._reconstruir_demanda()
+
+    # ── Escritura ─────────────────────────────
+    def registrar(self, movimientos: list[tuple]):
+        """
+        Agrega movimientos (producto, diferencia, instante, motivo) y
+        actualiza los totales, todo en una transacción. Los totales se
+        agrupan antes de escribir: una venta de 50 productos del mismo día
+        es una sola fila de por_dia por producto.
+        """
+        if not movimientos:
+            return
+        totales = {tabla: Counter() for tabla, _ in _PERIODOS}
+        conteos = {tabla: Counter() for tabla, _ in _PERIODOS}
+        for producto, diferencia, instante, motivo in movimientos:
+            local = time.localtime(instante)
+            for tabla, formato in _PERIODOS:
+                clave = (producto, time.strftime(formato, local), motivo)
+                totales[tabla][clave] += diferencia
+                conteos[tabla][clave] += 1
+        ventas = {(periodo, producto): -unidades
+                  for (producto, periodo, motivo), unidades in totales["por_dia"].items()
+                  if motivo == VENTA}
+
+        with self._cerrojo, self._conexion:
+            self._conexion.executemany(
+                "INSERT INTO movimientos (producto, diferencia, instante, motivo)"
+                " VALUES (?, ?, ?, ?)", movimientos)
+            if ventas:   # Antes de sumar las ventas de hoy a por_dia
+                self._actualizar_demanda(ventas, self._ventas_previas(ventas))
+            for tabla, _ in _PERIODOS:
+                self._conexion.executemany(
+                    f"INSERT INTO {tabla} (producto, periodo, motivo, unidades, movimientos)"
+                    " VALUES (?, ?, ?, ?, ?) ON CONFLICT(producto, periodo, motivo) DO UPDATE"
+                    " SET unidades = unidades + excluded.unidades,"
+                    " movimientos = movimientos + excluded.movimientos",
+                    [(*clave, unidades, conteos[tabla][clave])
+                     for clave, unidades in totales[tabla].items()])
+
+    def _reconstruir_demanda(self):
+        """Arma la tabla demanda desde por_dia (libros creados sin ella)."""
+        ventas = {(periodo, producto): -unidades for producto, periodo, unidades in
+                  self._conexion.execute("SELECT producto, periodo, unidades FROM por_dia"
+                                         " WHERE motivo = ?", (VENTA,))}
+        if ventas:
+            self._actualizar_demanda(ventas, {})
+
+    def _ventas_previas(self, ventas: dict) -> dict:
+        """Unidades ya vendidas en por_dia para las claves (día, producto) de 'ventas'."""
+        periodos = sorted({periodo for periodo, _ in ventas})
+        productos = sorted({producto for _, producto in ventas})
+        previas = {}
+        for inicio in range(0, len(productos), 500):   # Límite de parámetros de SQLite
+            trozo = productos[inicio:inicio + 500]
+            for producto, periodo, unidades in self._conexion.execute(
+                    "SELECT producto, periodo, unidades FROM por_dia WHERE motivo = ?"
+                    f" AND periodo IN ({', '.join('?' * len(periodos))})"
+                    f" AND producto IN ({', '.join('?' * len(trozo))})",
+                    [VENTA, *periodos, *trozo]):
+                previas[(periodo, producto)] = -unidades
+        return previas
+
+    def _actualizar_demanda(self, ventas: dict, previas: dict):
+        """
+        Suma las ventas {(día, producto): unidades} al estado de cada
+        producto; 'previas' son las unidades que ese día ya tenía, para que
+        el cuadrado sea el del total del día aunque llegue en partes (o
+        tarde, desde otra caja). Se llama dentro de la transacción.
+        """
+        decaimiento = 1 - ALFA_DEMANDA
+        productos = sorted({producto for _, producto in ventas})
+        estados = {}
+        for inicio in range(0, len(productos), 500):
+            trozo = productos[inicio:inicio + 500]
+            for producto, *estado in self._conexion.execute(
+                    "SELECT producto, dia, nivel, cuadrados FROM demanda"
+                    f" WHERE producto IN ({', '.join('?' * len(trozo))})", trozo):
+                estados[producto] = estado
+
+        for (periodo, producto), unidades in ventas.items():
+            dia = datetime.date.fromisoformat(periodo).toordinal()
+            previo = previas.get((periodo, producto), 0)
+            ultimo_dia, nivel, cuadrados = estados.get(producto) or (dia, 0.0, 0.0)
+            nuevo_dia = max(dia, ultimo_dia)
+            atraso = decaimiento ** (nuevo_dia - ultimo_dia)   # Lleva el estado a nuevo_dia
+            peso = decaimiento ** (nuevo_dia - dia)            # Peso de la venta de 'dia'
+            total = previo + unidades
+            estados[producto] = (nuevo_dia, nivel * atraso + unidades * peso,
+                                 cuadrados * atraso + (total * total - previo * previo) * peso)
+        self._conexion.executemany(
+            "INSERT OR REPLACE INTO demanda (producto, dia, nivel, cuadrados) VALUES (?, ?, ?, ?)",
+            [(producto, *estado) for producto, estado in estados.items()])
+
+    # ── Consultas ─────────────────────────────
+    def unidades_por_producto(self, dias: int = 30, motivo: str = VENTA,
+                              hasta: float = None) -> dict[str, int]:
+        """
+        Unidades por producto en los últimos 'dias' días (incluido el de
+        'hasta', por defecto hoy), según los totales diarios. Las salidas
+        (ventas, bajas) se cuentan en positivo.
+        """
+        claves = dias_hasta(time.time() if hasta is None else hasta, dias)
+        with self._cerrojo:
+            filas = self._conexion.execute(
+                "SELECT producto, SUM(unidades) FROM por_dia"
+                " WHERE motivo = ? AND periodo BETWEEN ? AND ? GROUP BY producto",
+                (motivo, claves[0], claves[-1])).fetchall()
+        signo = -1 if motivo in (VENTA, BAJA) else 1
+        return {producto: signo * unidades for producto, unidades in filas}
+
+    def serie_diaria(self, id_producto: str, dias: int = 30, motivo: str = VENTA,
+                     hasta: float = None) -> list[tuple[str, int]]:
+        """[(día, unidades), ...] de un producto, con 0 en los días sin movimientos."""
+        claves = dias_hasta(time.time() if hasta is None else hasta, dias)
+        with self._cerrojo:
+            filas = dict(self._conexion.execute(
+                "SELECT periodo, unidades FROM por_dia"
+                " WHERE producto = ? AND motivo = ? AND periodo BETWEEN ? AND ?",
+                (id_producto, motivo, claves[0], claves[-1])).fetchall())
+        signo = -1 if motivo in (VENTA, BAJA) else 1
+        return [(clave, signo * filas.get(clave, 0)) for clave in claves]
+
+    def serie_horaria(self, id_producto: str, horas: int = 24, motivo: str = VENTA,
+                      hasta: float = None) -> list[tuple[str, int]]:
+        """[(hora, unidades), ...] de un producto en las últimas 'horas' horas."""
+        hasta = time.time() if hasta is None else hasta
+        claves = [clave_hora(hasta - h * 3600) for h in range(horas - 1, -1, -1)]
+        with self._cerrojo:
+            filas = dict(self._conexion.execute(
+                "SELECT periodo, unidades FROM por_hora"
+                " WHERE producto = ? AND motivo = ? AND periodo BETWEEN ? AND ?",
+                (id_producto, motivo, claves[0], claves[-1])).fetchall())
+        signo = -1 if motivo in (VENTA, BAJA) else 1
+        return [(clave, signo * filas.get(clave, 0)) for clave in claves]
+
+    def demanda_suavizada(self, hasta: float = None) -> list[tuple[str, float, float]]:
+        """
+        Ventas diarias suavizadas de todos los productos con ventas, al día
+        de 'hasta' (por defecto hoy): filas (producto, media, media de los
+        cuadrados), donde la venta de hace k días pesa
+        ALFA_DEMANDA × (1 - ALFA_DEMANDA)^k y los días sin ventas cuentan
+        como 0. Se lee una fila por producto, sin recorrer la historia.
+        """
+        hoy = datetime.date.fromtimestamp(time.time() if hasta is None else hasta).toordinal()
+        decaimiento = 1 - ALFA_DEMANDA
+        with self._cerrojo:
+            filas = self._conexion.execute(
+                "SELECT producto, dia, nivel, cuadrados FROM demanda").fetchall()
+        resultado = []
+        for producto, dia, nivel, cuadrados in filas:
+            factor = ALFA_DEMANDA * decaimiento ** max(hoy - dia, 0)
+            resultado.append((producto, nivel * factor, cuadrados * factor))
+        return resultado
+
+    def historial(self, id_producto: str, limite: int = 50) -> list[tuple]:
+        """Últimos movimientos de un producto: (instante, diferencia, motivo), del más nuevo al más viejo."""
+        with self._cerrojo:
+            return self._conexion.execute(
+                "SELECT instante, diferencia, motivo FROM movimientos"
+                " WHERE producto = ? ORDER BY instante DESC, id DESC LIMIT ?",
+                (id_producto, limite)).fetchall()
+
+    def cerrar(self):
+        with self._cerrojo:
+            self._conexion.close()
+
+
+if __name__ == "__main__":
+    dias = int(sys.argv[sys.argv.index("--dias") + 1]) if "--dias" in sys.argv else 30
+    libro = LibroMovimientos()
+    vendidas = sorted(libro.unidades_por_producto(dias).items(), key=lambda par: (-par[1], par[0]))
+    libro.cerrar()
+    print(f"\n  Unidades vendidas en los últimos {dias} días")
+    print("─" * 40)
+    for id_producto, unidades in vendidas:
+        print(f"  {id_producto:<20} {unidades:>10}")
+    if not vendidas:
+        print("  (sin ventas registradas)")
+    print("─" * 40)
@@ -0,0 +1,177 @@
+"""
+Módulo: paginacion.py
+Descripción: Listado del inventario por páginas.
+
+- Paginador: cursor sobre una ordenación ya calculada (lista de productos o
+  de IDs). Solo se arman las filas de la página que se muestra, así ver la
+  primera página de un catálogo grande no formatea el catálogo entero.
+- escribir_lineas(): junta las líneas y las escribe en bloques con una sola
+  llamada a write por bloque, en lugar de un print por fila.
+- leer_orden() / navegar(): elección del orden y recorrido de las páginas
+  desde la consola.
+"""
+
+import sys
+
+# Órdenes disponibles para listar; con '-' delante (por ejemplo '-precio') el
+# orden es descendente
+CLAVES_ORDEN = ("id", "nombre", "cantidad", "precio", "valor")
+FILAS_POR_PAGINA = 20
+LINEAS_POR_ESCRITURA = 1000
+
+
+def escribir_lineas(lineas, salida=None, bloque=LINEAS_POR_ESCRITURA):
+    """
+    Escribe un iterable de líneas (puede ser un generador) de a 'bloque'
+    líneas por llamada a write.
+
+    Args:
+        lineas (iterable): Líneas sin el salto final
+        salida: Archivo de texto destino (por defecto sys.stdout)
+        bloque (int): Líneas que se juntan antes de cada escritura
+    """
+    salida = salida or sys.stdout
+    pendientes = []
+    for linea in lineas:
+        pendientes.append(linea)
+        if len(pendientes) >= bloque:
+            salida.write("\n".join(pendientes) + "\n")
+            pendientes.clear()
+    if pendientes:
+        salida.write("\n".join(pendientes) + "\n")
+    salida.flush()
+
+
+def leer_orden(texto, por_defecto="id"):
+    """
+    Interpreta un orden escrito por el usuario.
+
+    Args:
+        texto (str): Una de CLAVES_ORDEN, con '-' delante para orden
+                     descendente; vacío = por_defecto
+
+    Returns:
+        tuple: (clave, descendente)
+
+    Raises:
+        ValueError: Si la clave no está en CLAVES_ORDEN
+    """
+    texto = texto.strip().lower()
+    descendente = texto.startswith("-")
+    clave = texto.lstrip("-").strip() or por_defecto
+    if clave not in CLAVES_ORDEN:
+        raise ValueError(f"Orden '{clave}' desconocido (use {', '.join(CLAVES_ORDEN)}).")
+    return clave, descendente
+
+
+class Paginador:
+    """
+    Cursor por páginas sobre una secuencia ya ordenada.
+
+    La secuencia no se copia: el inventario entrega una ordenación nueva
+    cada vez que cambia, así que la que tiene el Paginador no se modifica
+    mientras se recorre. El orden descendente se resuelve con índices desde
+    el final, sin invertir la lista.
+
+    Atributos:
+        clave (str): Orden de la secuencia (para el resumen)
+        descendente (bool): Recorrer de mayor a menor
+        por_pagina (int): Elementos por página
+        pagina (int): Página actual, desde 0
+    """
+
+    def __init__(self, elementos, clave="id", descendente=False, por_pagina=FILAS_POR_PAGINA):
+        """
+        Args:
+            elementos (Sequence): La ordenación a recorrer
+            clave (str): Nombre del orden
+            descendente (bool): Recorrer de mayor a menor
+            por_pagina (int): Elementos por página (mínimo 1)
+        """
+        self._elementos = elementos
+        self.clave = clave
+        self.descendente = descendente
+        self.por_pagina = max(1, por_pagina)
+        self.pagina = 0
+
+    @property
+    def total(self):
+        """Cantidad de elementos."""
+        return len(self._elementos)
+
+    @property
+    def paginas(self):
+        """Cantidad de páginas (al menos 1, aunque no haya elementos)."""
+        return max(1, -(-self.total // self.por_pagina))
+
+    def es_ultima(self):
+        """True si la página actual es la última."""
+        return self.pagina >= self.paginas - 1
+
+    def actual(self):
+        """
+        Elementos de la página actual, en el orden pedido.
+
+        Returns:
+            list: A lo sumo por_pagina elementos
+        """
+        inicio = self.pagina * self.por_pagina
+        fin = inicio + self.por_pagina
+        if not self.descendente:
+            return self._elementos[inicio:fin]
+        total = self.total
+        return self._elementos[max(total - fin, 0):total - inicio][::-1]
+
+    def __iter__(self):
+        """Recorre todos los elementos en el orden pedido."""
+        return iter(reversed(self._elementos) if self.descendente else self._elementos)
+
+    def ir(self, pagina):
+        """Salta a 'pagina' (desde 0), ajustada al rango válido."""
+        self.pagina = min(max(pagina, 0), self.paginas - 1)
+
+    def siguiente(self):
+        """Avanza una página. Retorna False si ya estaba en la última."""
+        if self.es_ultima():
+            return False
+        self.pagina += 1
+        return True
+
+    def anterior(self):
+        """Retrocede una página. Retorna False si ya estaba en la primera."""
+        if self.pagina == 0:
+            return False
+        self.pagina -= 1
+        return True
+
+    def resumen(self):
+        """Texto 'Página x de y · n producto(s) · orden: ...' para el pie de página."""
+        sentido = " (descendente)" if self.descendente else ""
+        return (f"Página {self.pagina + 1} de {self.paginas} · {self.total} producto(s) · "
+                f"orden: {self.clave}{sentido}")
+
+
+def navegar(paginador, mostrar, leer=input):
+    """
+    Muestra las páginas una por una hasta que el usuario sale o pasa de
+    la última.
+
+    Args:
+        paginador (Paginador): Cursor a recorrer
+        mostrar (callable): Escribe la página actual, recibe el paginador
+        leer (callable): Lee la respuesta del usuario (por defecto input)
+    """
+    while True:
+        mostrar(paginador)
+        if paginador.paginas <= 1:
+            return
+        respuesta = leer("[Enter] siguiente · [a] anterior · [número] ir a la página · "
+                         "[s] salir: ").strip().lower()
+        if respuesta == "s":
+            return
+        if respuesta == "a":
+            paginador.anterior()
+        elif respuesta.isdigit():
+            paginador.ir(int(respuesta) - 1)
+        elif not respuesta and not paginador.siguiente():
+            return
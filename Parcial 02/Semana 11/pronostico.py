@@ -0,0 +1,199 @@
+"""
+Módulo: pronostico.py
+Descripción: Pronóstico de demanda y lista de pedidos sugeridos.
+
+La demanda diaria de cada producto es la de LibroMovimientos.demanda_suavizada()
+(movimientos.py): un suavizado exponencial de las ventas diarias que el libro
+mantiene al registrar cada venta, así leerla cuesta una fila por producto y
+no depende de cuántos días de historia haya. De ahí salen la media (demanda)
+y la desviación de la demanda diaria. Para un plazo de entrega de L días y
+una cobertura de C días:
+    seguridad    = z × desviación × √L
+    punto_pedido = demanda × L + seguridad
+    objetivo     = punto_pedido + demanda × C
+Un producto se pide cuando su stock no supera el punto de pedido, y la
+cantidad sugerida completa el objetivo.
+
+El cálculo se hace para todos los productos a la vez sobre columnas de
+NumPy si está instalado; si no, con un recorrido en Python puro que da los
+mismos resultados.
+
+Uso:
+    python pronostico.py                       (pedidos con inventario.json)
+    python pronostico.py --sintetico 100000    (mide 100 000 productos)
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+PLAZO_ENTREGA = 3       # Días que tarda en llegar un pedido
+DIAS_COBERTURA = 7      # Días de venta que debe cubrir cada pedido
+Z_SERVICIO = 1.65       # ~95 % de los días sin quiebre de stock
+
+
+def pronosticar(ids: list, cantidades: list, demanda, plazo: int = PLAZO_ENTREGA,
+                cobertura: int = DIAS_COBERTURA, z: float = Z_SERVICIO) -> list[dict]:
+    """
+    Lista de pedidos sugeridos.
+
+    ids y cantidades son columnas paralelas con el stock actual. 'demanda'
+    es un iterable de (id, media, media de los cuadrados) de las ventas
+    diarias, como lo da LibroMovimientos.demanda_suavizada(); los productos
+    sin fila no tienen ventas y los que ya no están en 'ids' se ignoran.
+
+    Retorna un dict por producto a pedir (id, stock, demanda_diaria,
+    desviacion, punto_pedido, sugerido, dias_restantes), del más urgente
+    (menos días de stock) al menos urgente.
+    """
+    if not ids:
+        return []
+    calcular = _calcular_numpy if np is not None else _calcular_python
+    pedidos = []
+    for i, media, desviacion, punto in zip(*calcular(ids, cantidades, demanda, plazo, z)):
+        stock = cantidades[i]
+        # Se redondea antes de ceil para que NumPy y Python puro coincidan
+        sugerido = math.ceil(round(punto + media * cobertura - stock, 6))
+        if sugerido <= 0:
+            continue
+        pedidos.append({
+            "id": ids[i],
+            "stock": stock,
+            "demanda_diaria": round(media, 2),
+            "desviacion": round(desviacion, 2),
+            "punto_pedido": math.ceil(round(punto, 6)),
+            "sugerido": sugerido,
+            "dias_restantes": round(stock / media, 1) if media >= 0.005 else None,
+        })
+    pedidos.sort(key=lambda p: (p["dias_restantes"] is None, p["dias_restantes"] or 0, p["id"]))
+    return pedidos
+
+
+def _calcular_numpy(ids, cantidades, demanda, plazo, z):
+    """
+    Versión vectorizada: la demanda se ubica en columnas alineadas con 'ids'
+    y el punto de pedido de todos los productos sale de operaciones sobre
+    arreglos. Retorna las columnas (índices, media, desviación, punto de
+    pedido) de los productos que llegaron al punto de pedido.
+    """
+    posicion = {id_producto: i for i, id_producto in enumerate(ids)}
+    filas, valores = [], []
+    for id_producto, media, cuadrados in demanda:
+        i = posicion.get(id_producto)
+        if i is not None:
+            filas.append(i)
+            valores.append((media, cuadrados))
+
+    media = np.zeros(len(ids))
+    cuadrados = np.zeros(len(ids))
+    if filas:
+        media[filas], cuadrados[filas] = np.asarray(valores, dtype=np.float64).T
+    desviacion = np.sqrt(np.maximum(cuadrados - media * media, 0.0))
+    punto = media * plazo + z * desviacion * math.sqrt(plazo)
+
+    stock = np.asarray(cantidades, dtype=np.float64)
+    indices = np.flatnonzero(stock <= np.round(punto, 6))
+    return (indices.tolist(), media[indices].tolist(), desviacion[indices].tolist(),
+            punto[indices].tolist())
+
+
+def _calcular_python(ids, cantidades, demanda, plazo, z):
+    """
+    Versión en Python puro, usada cuando NumPy no está disponible. Recorre
+    solo los productos con ventas: sin ventas el punto de pedido es 0 y no
+    hay nada que sugerir.
+    """
+    posicion = {id_producto: i for i, id_producto in enumerate(ids)}
+    raiz_plazo = math.sqrt(plazo)
+    seleccion = []
+    for id_producto, media, cuadrados in demanda:
+        i = posicion.get(id_producto)
+        if i is None:
+            continue
+        desviacion = math.sqrt(max(cuadrados - media * media, 0.0))
+        punto = media * plazo + z * desviacion * raiz_plazo
+        if cantidades[i] <= round(punto, 6):
+            seleccion.append((i, media, desviacion, punto))
+    seleccion.sort()
+    return tuple(zip(*seleccion)) or ((), (), (), ())
+
+
+# ─────────────────────────────────────────────
+# LÍNEA DE COMANDOS
+# ─────────────────────────────────────────────
+def imprimir_pedidos(pedidos: list[dict], limite: int = 50):
+    """Tabla de pedidos sugeridos (los 'limite' más urgentes)."""
+    if not pedidos:
+        print("\n  No hay productos por debajo de su punto de pedido.")
+        return
+    print("\n" + "═" * 75)
+    print(f"  {'ID':<14} {'Stock':>7} {'Demanda/día':>12} {'Desv.':>7} "
+          f"{'Punto':>7} {'Días':>7} {'Pedir':>8}")
+    print("─" * 75)
+    for p in pedidos[:limite]:
+        dias = "—" if p["dias_restantes"] is None else f"{p['dias_restantes']:.1f}"
+        print(f"  {p['id']:<14} {p['stock']:>7} {p['demanda_diaria']:>12.2f} "
+              f"{p['desviacion']:>7.2f} {p['punto_pedido']:>7} {dias:>7} {p['sugerido']:>8}")
+    print("═" * 75)
+    extra = f" (se muestran {limite})" if len(pedidos) > limite else ""
+    print(f"  {len(pedidos)} producto(s) para pedir{extra}")
+
+
+def _sintetico(n: int, dias: int = 28):
+    """
+    Mide la lista de pedidos con n productos: un libro temporal con 'dias'
+    días de ventas al azar (cada producto vende uno de cada tres días) y
+    stock al azar.
+    """
+    import os
+    import tempfile
+
+    from movimientos import LibroMovimientos, VENTA
+
+    azar = random.Random(1)
+    ids = [f"P{i:06d}" for i in range(n)]
+    cantidades = [azar.randint(0, 60) for _ in range(n)]
+    hoy = time.time()
+    print(f"  Armando un libro de {dias} días de ventas para {n} productos...")
+    with tempfile.TemporaryDirectory() as carpeta:
+        libro = LibroMovimientos(os.path.join(carpeta, "movimientos.db"))
+        for dia in range(dias):
+            instante = hoy - (dias - 1 - dia) * 86400
+            libro.registrar([(id_producto, -azar.randint(1, 6), instante, VENTA)
+                             for id_producto in ids if azar.random() < 1 / 3])
+
+        inicio = time.perf_counter()
+        demanda = libro.demanda_suavizada(hoy)
+        lectura = time.perf_counter() - inicio
+        pedidos = pronosticar(ids, cantidades, demanda)
+        total = time.perf_counter() - inicio
+        libro.cerrar()
+
+    motor = "NumPy" if np is not None else "Python puro"
+    print(f"  {n} productos: {total * 1000:.0f} ms (lectura del libro {lectura * 1000:.0f} ms, "
+          f"cálculo con {motor} {(total - lectura) * 1000:.0f} ms), "
+          f"{len(pedidos)} pedidos sugeridos")
+
+
+if __name__ == "__main__":
+    if "--sintetico" in sys.argv:
+        _sintetico(int(sys.argv[sys.argv.index("--sintetico") + 1]))
+    else:
+        import contextlib
+        import io
+
+        from Inventario import Inventario
+        from movimientos import LibroMovimientos
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            inventario = Inventario(movimientos=LibroMovimientos())
+        imprimir_pedidos(inventario.sugerir_pedidos())
+        inventario.cerrar()
@@ -0,0 +1,173 @@
+"""
+Prueba de estrés del Inventario con varios hilos (hilos_seguros=True).
+
+Varios hilos "caja" hacen ventas y reposiciones al azar con
+ajustar_cantidad() sobre pocos productos (mucha competencia), mientras
+otros hilos consultan sin parar (buscar_por_nombre, alerta_stock_bajo).
+Al final se verifica que:
+  1. el stock de cada producto es el inicial más la suma de los ajustes que
+     tuvieron éxito (ninguna actualización perdida),
+  2. el índice ordenado por cantidad coincide con los productos,
+  3. al volver a cargar desde disco se obtiene exactamente lo mismo.
+
+Se ejecuta en una carpeta temporal (no toca inventario.json).
+
+Uso:
+    python prueba_concurrencia.py [--hilos 8] [--operaciones 2000] [--productos 20]
+                                  [--modo diario|autoguardado|sqlite|normal]
+                                  [--sin-cerrojos]
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from almacenamiento import AlmacenamientoSQLite
+from Inventario import Inventario
+
+STOCK_INICIAL = 50
+
+
+def crear_inventario(modo: str, hilos_seguros: bool) -> Inventario:
+    if modo == "sqlite":
+        return Inventario(almacenamiento=AlmacenamientoSQLite("inventario.db"),
+                          hilos_seguros=hilos_seguros)
+    return Inventario(modo_diario=modo == "diario",
+                      autoguardado_ms=50 if modo == "autoguardado" else None,
+                      hilos_seguros=hilos_seguros)
+
+
+def caja(inventario: Inventario, ids: list, operaciones: int, semilla: int,
+         errores: list) -> Counter:
+    """
+    Ventas (-1..-5) y reposiciones (+1..+5). Retorna la suma de los ajustes
+    que se aplicaron, por producto.
+    """
+    azar = random.Random(semilla)
+    propios = Counter()
+    try:
+        for _ in range(operaciones):
+            id_producto = azar.choice(ids)
+            diferencia = azar.choice((-5, -4, -3, -2, -1, 1, 2, 3, 4, 5))
+            try:
+                inventario.ajustar_cantidad(id_producto, diferencia)
+            except ValueError:
+                continue  # Stock insuficiente: la venta no se hizo
+            propios[id_producto] += diferencia
+    except Exception as e:  # Sin cerrojos el índice ordenado puede romperse
+        errores.append(repr(e))
+    return propios
+
+
+def lector(inventario: Inventario, detener: threading.Event, consultas: list, errores: list):
+    total = 0
+    try:
+        while not detener.is_set():
+            inventario.buscar_por_nombre("producto")
+            inventario.alerta_stock_bajo(5)
+            total += 2
+    except Exception as e:
+        errores.append(repr(e))
+    consultas.append(total)
+
+
+def verificar(inventario: Inventario, esperado: dict) -> list:
+    """Lista de diferencias entre el inventario y los valores esperados."""
+    problemas = []
+    productos = {p.get_id(): p for p in inventario.productos_por_cantidad()}
+    for id_producto, cantidad in esperado.items():
+        producto = productos.get(id_producto)
+        if producto is None:
+            problemas.append(f"{id_producto}: falta en el índice ordenado")
+        elif producto.get_cantidad() != cantidad:
+            problemas.append(f"{id_producto}: esperado {cantidad}, hay {producto.get_cantidad()}")
+    cantidades = [p.get_cantidad() for p in inventario.productos_por_cantidad()]
+    if cantidades != sorted(cantidades) or len(cantidades) != len(esperado):
+        problemas.append("el índice ordenado por cantidad no coincide con los productos")
+    return problemas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hilos", type=int, default=8)
+    parser.add_argument("--operaciones", type=int, default=2000, help="por hilo")
+    parser.add_argument("--productos", type=int, default=20)
+    parser.add_argument("--lectores", type=int, default=2)
+    parser.add_argument("--modo", default="diario",
+                        choices=("diario", "autoguardado", "sqlite", "normal"))
+    parser.add_argument("--sin-cerrojos", action="store_true",
+                        help="hilos_seguros=False, para comparar")
+    args = parser.parse_args()
+
+    # Cambios de hilo muy frecuentes: provoca intercalados que sin cerrojos
+    # pierden actualizaciones
+    sys.setswitchinterval(1e-6)
+
+    with tempfile.TemporaryDirectory() as carpeta, open(os.devnull, "w") as nulo:
+        os.chdir(carpeta)
+        with contextlib.redirect_stdout(nulo):
+            inventario = crear_inventario(args.modo, not args.sin_cerrojos)
+            ids = [f"P{i:03d}" for i in range(args.productos)]
+            inventario.agregar_muchos([(i, f"Producto {i}", STOCK_INICIAL, 1.0) for i in ids])
+
+        ajustes: Counter = Counter()
+        cerrojo_ajustes = threading.Lock()
+        errores: list[str] = []
+        consultas: list[int] = []
+        detener = threading.Event()
+
+        def ejecutar_caja(semilla):
+            propios = caja(inventario, ids, args.operaciones, semilla, errores)
+            with cerrojo_ajustes:
+                ajustes.update(propios)
+
+        cajas = [threading.Thread(target=ejecutar_caja, args=(n,)) for n in range(args.hilos)]
+        lectores = [threading.Thread(target=lector, args=(inventario, detener, consultas, errores))
+                    for _ in range(args.lectores)]
+
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(nulo):
+            for hilo in lectores + cajas:
+                hilo.start()
+            for hilo in cajas:
+                hilo.join()
+            detener.set()
+            for hilo in lectores:
+                hilo.join()
+            duracion = time.perf_counter() - inicio
+
+            esperado = {i: STOCK_INICIAL + ajustes[i] for i in ids}
+            en_memoria = verificar(inventario, esperado)
+            inventario.cerrar()
+            en_disco = verificar(crear_inventario(args.modo, True), esperado)
+
+        total = args.hilos * args.operaciones
+        print("\n" + "═" * 60)
+        print(f"  Modo            : {args.modo}"
+              f"{' (sin cerrojos)' if args.sin_cerrojos else ''}")
+        print(f"  Operaciones     : {total} en {duracion:.2f} s ({total / duracion:,.0f}/s)")
+        print(f"  Consultas       : {sum(consultas)}")
+        print(f"  Errores en hilos: {len(errores)}")
+        for error in errores[:3]:
+            print(f"    {error}")
+        for nombre, problemas in (("memoria", en_memoria), ("disco", en_disco)):
+            if problemas:
+                print(f"✖  {len(problemas)} diferencia(s) en {nombre}:")
+                for problema in problemas[:5]:
+                    print(f"    {problema}")
+            else:
+                print(f"✔  Sin actualizaciones perdidas en {nombre}.")
+        print("═" * 60)
+        os.chdir(os.path.dirname(carpeta))
+
+    sys.exit(1 if errores or en_memoria or en_disco else 0)
+
+
+if __name__ == "__main__":
+    main()
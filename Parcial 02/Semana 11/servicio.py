@@ -0,0 +1,416 @@
+"""
+Servicio HTTP/JSON del Inventario para varias cajas (POS) en la misma máquina.
+
+Usa solo la biblioteca estándar: asyncio (start_server y streams) atiende
+las conexiones en un único bucle de eventos, y cada llamada al Inventario
+(que puede escribir a disco) se ejecuta en un pool de hilos con
+run_in_executor. Así una caja que guarda no detiene a las demás: el bucle
+sigue aceptando y leyendo peticiones mientras el disco trabaja. El
+Inventario se crea con hilos_seguros=True (ver cerrojos.py).
+
+Rutas (cuerpos y respuestas en JSON):
+    GET    /productos?nombre=leche&limite=20   buscar por nombre
+    GET    /productos/<id>                     un producto
+    POST   /productos                          agregar {"id", "nombre", "cantidad", "precio"}
+    PATCH  /productos/<id>                     actualizar {"cantidad"?, "precio"?, "nombre"?}
+    POST   /productos/<id>/ajuste              venta/reposición {"diferencia": -2, "motivo"?}
+    DELETE /productos/<id>                     eliminar
+    GET    /estadisticas?umbral=10             totales del inventario
+    GET    /ventas?dias=30                     unidades vendidas por producto (movimientos.py)
+
+Respuestas: {"producto": {...}}, {"productos": [...]}, {"estadisticas": {...}},
+{"ventas": {"id": unidades, ...}}
+o {"error": "..."} con 400 (petición inválida), 404 (no existe), 409 (ID
+repetido o stock insuficiente) o 500 (falla inesperada, p. ej. al escribir a
+disco; el detalle queda en stderr). Las conexiones son keep-alive (HTTP/1.1).
+
+Uso:
+    python servicio.py [--puerto 8765] [--hilos 8] [--diario | --sqlite | --texto]
+    curl -X POST localhost:8765/productos -d '{"id": "P1", "nombre": "Pan", "cantidad": 5, "precio": 0.5}'
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import functools
+import json
+import os
+import signal
+import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from almacenamiento import AlmacenamientoSQLite, AlmacenamientoTexto
+from Inventario import Inventario
+from movimientos import ARCHIVO_MOVIMIENTOS, LibroMovimientos
+
+HOST = "127.0.0.1"             # Solo conexiones locales
+PUERTO = 8765
+MAX_CUERPO = 1 << 20           # 1 MiB por petición
+INACTIVIDAD_S = 60             # Se cierra la conexión sin peticiones en este tiempo
+
+
+class ErrorPeticion(Exception):
+    """Error que se responde al cliente con su código HTTP."""
+
+    def __init__(self, estado: HTTPStatus, mensaje: str):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+# ─────────────────────────────────────────────
+# VALIDACIÓN DE CUERPOS
+# ─────────────────────────────────────────────
+def _entero(datos: dict, campo: str, obligatorio: bool = True) -> int | None:
+    valor = datos.get(campo)
+    if valor is None and not obligatorio:
+        return None
+    if isinstance(valor, bool) or not isinstance(valor, int):
+        raise ErrorPeticion(HTTPStatus.BAD_REQUEST, f"'{campo}' debe ser un entero.")
+    return valor
+
+
+def _numero(datos: dict, campo: str, obligatorio: bool = True) -> float | None:
+    valor = datos.get(campo)
+    if valor is None and not obligatorio:
+        return None
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+        raise ErrorPeticion(HTTPStatus.BAD_REQUEST, f"'{campo}' debe ser un número.")
+    return float(valor)
+
+
+def _texto(datos: dict, campo: str, obligatorio: bool = True) -> str | None:
+    valor = datos.get(campo)
+    if valor is None and not obligatorio:
+        return None
+    if not isinstance(valor, str) or not valor.strip():
+        raise ErrorPeticion(HTTPStatus.BAD_REQUEST, f"'{campo}' debe ser un texto no vacío.")
+    return valor.strip()
+
+
+def _como_diccionario(tupla: tuple) -> dict:
+    id_producto, nombre, cantidad, precio = tupla
+    return {"id": id_producto, "nombre": nombre, "cantidad": cantidad, "precio": precio}
+
+
+# ─────────────────────────────────────────────
+# SERVICIO
+# ─────────────────────────────────────────────
+class ServicioInventario:
+    """
+    Atiende peticiones HTTP/JSON sobre un Inventario con hilos_seguros=True.
+
+    Uso:
+        servicio = ServicioInventario(inventario)
+        await servicio.iniciar("127.0.0.1", 8765)
+        await servicio.esperar()        # Hasta que se llame a detener()
+    """
+
+    def __init__(self, inventario: Inventario, hilos: int = 8):
+        self.__inventario = inventario
+        self.__ejecutor = ThreadPoolExecutor(max_workers=hilos,
+                                             thread_name_prefix="inventario")
+        self.__servidor: asyncio.AbstractServer | None = None
+        self.__conexiones: set[asyncio.Task] = set()
+        self.__detenido: asyncio.Event | None = None
+
+    # ── Ciclo de vida ─────────────────────────
+    async def iniciar(self, host: str = HOST, puerto: int = PUERTO):
+        self.__detenido = asyncio.Event()
+        self.__servidor = await asyncio.start_server(self.__atender, host, puerto)
+        direccion = self.__servidor.sockets[0].getsockname()
+        print(f"✔  Servicio de inventario en http://{direccion[0]}:{direccion[1]}",
+              file=sys.stderr)
+
+    async def esperar(self):
+        await self.__detenido.wait()
+
+    async def detener(self):
+        """
+        Deja de aceptar conexiones, espera las peticiones en curso y las
+        escrituras del pool, y cierra el Inventario (guarda lo pendiente).
+        """
+        servidor, self.__servidor = self.__servidor, None
+        if servidor is None:
+            return   # Ya se está deteniendo
+        servidor.close()
+        # Desde Python 3.12, wait_closed() espera a que se cierren todas las
+        # conexiones: las keep-alive inactivas se cancelan antes de esperarlo
+        for tarea in list(self.__conexiones):
+            tarea.cancel()
+        await asyncio.gather(*self.__conexiones, return_exceptions=True)
+        await servidor.wait_closed()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, functools.partial(self.__ejecutor.shutdown, wait=True))
+        self.__inventario.cerrar()
+        self.__detenido.set()
+        print("✔  Servicio detenido. Datos guardados.", file=sys.stderr)
+
+    async def __en_hilo(self, funcion, *args):
+        """Ejecuta una llamada al Inventario en el pool, sin bloquear el bucle."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__ejecutor, functools.partial(funcion, *args))
+
+    # ── Conexiones (HTTP/1.1 mínimo) ──────────
+    async def __atender(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        tarea = asyncio.current_task()
+        self.__conexiones.add(tarea)
+        try:
+            while True:
+                try:
+                    linea = await asyncio.wait_for(lector.readline(), INACTIVIDAD_S)
+                except asyncio.TimeoutError:
+                    break
+                if not linea:
+                    break
+                partes = linea.decode("latin-1").split()
+                if len(partes) != 3:
+                    await self.__responder(escritor, HTTPStatus.BAD_REQUEST,
+                                           {"error": "Línea de petición inválida."}, False)
+                    break
+                metodo, destino, version = partes
+
+                encabezados = {}
+                while True:
+                    encabezado = await lector.readline()
+                    if encabezado in (b"\r\n", b"\n", b""):
+                        break
+                    nombre, _, valor = encabezado.decode("latin-1").partition(":")
+                    encabezados[nombre.strip().lower()] = valor.strip()
+
+                conexion = encabezados.get("connection", "").lower()
+                mantener = conexion == "keep-alive" if version == "HTTP/1.0" else conexion != "close"
+                try:
+                    largo = int(encabezados.get("content-length") or 0)
+                except ValueError:
+                    largo = -1
+                if not 0 <= largo <= MAX_CUERPO:
+                    await self.__responder(escritor, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                           {"error": f"Cuerpo inválido o mayor a {MAX_CUERPO} bytes."},
+                                           False)
+                    break
+                cuerpo = await lector.readexactly(largo) if largo else b""
+
+                estado, respuesta = await self.__procesar(metodo, destino, cuerpo)
+                await self.__responder(escritor, estado, respuesta, mantener)
+                if not mantener:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass   # Cliente desconectado o línea demasiado larga
+        except asyncio.CancelledError:
+            pass   # Apagado del servicio
+        finally:
+            self.__conexiones.discard(tarea)
+            escritor.close()
+            with contextlib.suppress(ConnectionError, asyncio.CancelledError):
+                await escritor.wait_closed()
+
+    @staticmethod
+    async def __responder(escritor: asyncio.StreamWriter, estado: HTTPStatus,
+                          datos: dict, mantener: bool):
+        cuerpo = json.dumps(datos, ensure_ascii=False).encode("utf-8")
+        escritor.write(
+            f"HTTP/1.1 {estado.value} {estado.phrase}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(cuerpo)}\r\n"
+            f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n".encode("latin-1")
+            + cuerpo)
+        await escritor.drain()
+
+    # ── Rutas ─────────────────────────────────
+    async def __procesar(self, metodo: str, destino: str, cuerpo: bytes) -> tuple[HTTPStatus, dict]:
+        url = urlsplit(destino)
+        partes = [unquote(p) for p in url.path.strip("/").split("/") if p]
+        consulta = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            datos = json.loads(cuerpo) if cuerpo else {}
+            if not isinstance(datos, dict):
+                raise ErrorPeticion(HTTPStatus.BAD_REQUEST, "El cuerpo debe ser un objeto JSON.")
+            return await self.__enrutar(metodo.upper(), partes, consulta, datos)
+        except ErrorPeticion as e:
+            return e.estado, {"error": str(e)}
+        except json.JSONDecodeError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": f"JSON inválido: {e}"}
+        except ValueError as e:   # Validaciones de Producto (valores negativos, ...)
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+        except Exception as e:    # Falla inesperada (disco lleno, ...): se informa, no se corta
+            print(f"✖  Error al atender {metodo} {destino}:", file=sys.stderr)
+            traceback.print_exception(e, file=sys.stderr)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {
+                "error": f"Error interno: {type(e).__name__}: {e}"}
+
+    async def __enrutar(self, metodo: str, partes: list, consulta: dict,
+                        datos: dict) -> tuple[HTTPStatus, dict]:
+        if partes == ["productos"]:
+            if metodo == "GET":
+                return await self.__buscar(consulta)
+            if metodo == "POST":
+                return await self.__agregar(datos)
+        elif len(partes) == 2 and partes[0] == "productos":
+            if metodo == "GET":
+                return await self.__obtener(partes[1])
+            if metodo == "PATCH":
+                return await self.__actualizar(partes[1], datos)
+            if metodo == "DELETE":
+                return await self.__eliminar(partes[1])
+        elif len(partes) == 3 and partes[0] == "productos" and partes[2] == "ajuste":
+            if metodo == "POST":
+                return await self.__ajustar(partes[1], datos)
+        elif partes == ["estadisticas"]:
+            if metodo == "GET":
+                return await self.__estadisticas(consulta)
+        elif partes == ["ventas"]:
+            if metodo == "GET":
+                return await self.__ventas(consulta)
+        else:
+            raise ErrorPeticion(HTTPStatus.NOT_FOUND, "Ruta desconocida.")
+        raise ErrorPeticion(HTTPStatus.METHOD_NOT_ALLOWED, f"Método {metodo} no permitido.")
+
+    async def __producto(self, id_producto: str) -> dict:
+        tupla = await self.__en_hilo(self.__inventario.obtener_producto, id_producto)
+        if tupla is None:
+            raise ErrorPeticion(HTTPStatus.NOT_FOUND, f"No existe el producto '{id_producto}'.")
+        return _como_diccionario(tupla)
+
+    async def __buscar(self, consulta: dict):
+        termino = consulta.get("nombre", "")
+        try:
+            limite = int(consulta["limite"]) if "limite" in consulta else None
+        except ValueError:
+            raise ErrorPeticion(HTTPStatus.BAD_REQUEST, "'limite' debe ser un entero.")
+        productos = await self.__en_hilo(self.__inventario.buscar_por_nombre, termino, limite)
+        return HTTPStatus.OK, {"productos": [p.a_diccionario() for p in productos]}
+
+    async def __obtener(self, id_producto: str):
+        return HTTPStatus.OK, {"producto": await self.__producto(id_producto)}
+
+    async def __agregar(self, datos: dict):
+        id_producto = _texto(datos, "id")
+        nombre = _texto(datos, "nombre")
+        cantidad = _entero(datos, "cantidad")
+        precio = _numero(datos, "precio")
+        if cantidad < 0 or precio < 0:
+            raise ErrorPeticion(HTTPStatus.BAD_REQUEST, "Cantidad y precio no pueden ser negativos.")
+        agregado = await self.__en_hilo(self.__inventario.agregar_producto,
+                                        id_producto, nombre, cantidad, precio)
+        if not agregado:
+            raise ErrorPeticion(HTTPStatus.CONFLICT, f"Ya existe el producto '{id_producto}'.")
+        return HTTPStatus.CREATED, {"producto": await self.__producto(id_producto)}
+
+    async def __actualizar(self, id_producto: str, datos: dict):
+        cantidad = _entero(datos, "cantidad", obligatorio=False)
+        precio = _numero(datos, "precio", obligatorio=False)
+        nombre = _texto(datos, "nombre", obligatorio=False)
+        if cantidad is None and precio is None and nombre is None:
+            raise ErrorPeticion(HTTPStatus.BAD_REQUEST, "Indique cantidad, precio o nombre.")
+
+        def actualizar() -> bool:
+            inventario = self.__inventario
+            if nombre is None:
+                return inventario.actualizar_producto(id_producto, cantidad, precio)
+            with inventario.lote():   # Nombre y valores en una sola escritura
+                if not inventario.renombrar_producto(id_producto, nombre):
+                    return False
+                if cantidad is not None or precio is not None:
+                    inventario.actualizar_producto(id_producto, cantidad, precio)
+                return True
+
+        if not await self.__en_hilo(actualizar):
+            raise ErrorPeticion(HTTPStatus.NOT_FOUND, f"No existe el producto '{id_producto}'.")
+        return HTTPStatus.OK, {"producto": await self.__producto(id_producto)}
+
+    async def __ajustar(self, id_producto: str, datos: dict):
+        diferencia = _entero(datos, "diferencia")
+        motivo = _texto(datos, "motivo", obligatorio=False)
+
+        def ajustar():
+            try:
+                return self.__inventario.ajustar_cantidad(id_producto, diferencia, motivo)
+            except ValueError as e:   # Stock insuficiente
+                raise ErrorPeticion(HTTPStatus.CONFLICT, str(e))
+
+        cantidad = await self.__en_hilo(ajustar)
+        if cantidad is None:
+            raise ErrorPeticion(HTTPStatus.NOT_FOUND, f"No existe el producto '{id_producto}'.")
+        return HTTPStatus.OK, {"id": id_producto, "cantidad": cantidad}
+
+    async def __eliminar(self, id_producto: str):
+        if not await self.__en_hilo(self.__inventario.eliminar_producto, id_producto):
+            raise ErrorPeticion(HTTPStatus.NOT_FOUND, f"No existe el producto '{id_producto}'.")
+        return HTTPStatus.OK, {"id": id_producto}
+
+    async def __estadisticas(self, consulta: dict):
+        try:
+            umbral = int(consulta.get("umbral", 10))
+        except ValueError:
+            raise ErrorPeticion(HTTPStatus.BAD_REQUEST, "'umbral' debe ser un entero.")
+        datos = await self.__en_hilo(self.__inventario.estadisticas, umbral)
+        return HTTPStatus.OK, {"estadisticas": datos}
+
+    async def __ventas(self, consulta: dict):
+        libro = self.__inventario.libro_movimientos()
+        if libro is None:
+            raise ErrorPeticion(HTTPStatus.NOT_FOUND, "El inventario no registra movimientos.")
+        try:
+            dias = int(consulta.get("dias", 30))
+        except ValueError:
+            raise ErrorPeticion(HTTPStatus.BAD_REQUEST, "'dias' debe ser un entero.")
+        if dias < 1:
+            raise ErrorPeticion(HTTPStatus.BAD_REQUEST, "'dias' debe ser al menos 1.")
+        return HTTPStatus.OK, {"ventas": await self.__en_hilo(libro.unidades_por_producto, dias)}
+
+
+# ─────────────────────────────────────────────
+# PUNTO DE ENTRADA
+# ─────────────────────────────────────────────
+async def ejecutar(args: argparse.Namespace):
+    almacenamiento = None
+    if args.sqlite:
+        almacenamiento = AlmacenamientoSQLite("inventario.db")
+    elif args.texto:
+        almacenamiento = AlmacenamientoTexto("inventario.txt")
+    inventario = Inventario(modo_diario=args.diario, almacenamiento=almacenamiento,
+                            hilos_seguros=True,
+                            movimientos=LibroMovimientos(ARCHIVO_MOVIMIENTOS))
+
+    servicio = ServicioInventario(inventario, args.hilos)
+    await servicio.iniciar(args.host, args.puerto)
+
+    loop = asyncio.get_running_loop()
+    for senal in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):   # Windows: solo Ctrl+C
+            loop.add_signal_handler(senal, lambda: asyncio.ensure_future(servicio.detener()))
+    try:
+        await servicio.esperar()
+    finally:
+        await servicio.detener()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--puerto", type=int, default=PUERTO)
+    parser.add_argument("--hilos", type=int, default=8, help="hilos para el Inventario")
+    almacen = parser.add_mutually_exclusive_group()
+    almacen.add_argument("--diario", action="store_true", help="modo diario (inventario.log)")
+    almacen.add_argument("--sqlite", action="store_true", help="usar inventario.db")
+    almacen.add_argument("--texto", action="store_true", help="usar inventario.txt")
+    parser.add_argument("--silencioso", action="store_true",
+                        help="no mostrar los mensajes del Inventario")
+    args = parser.parse_args()
+
+    with contextlib.ExitStack() as pila:
+        if args.silencioso:
+            pila.enter_context(contextlib.redirect_stdout(pila.enter_context(open(os.devnull, "w"))))
+        try:
+            asyncio.run(ejecutar(args))
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
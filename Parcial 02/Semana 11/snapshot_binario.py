@@ -0,0 +1,268 @@
+"""
+Módulo: snapshot_binario.py
+Descripción: Formato binario columnar para guardar el inventario.
+
+En lugar de un objeto JSON (o una línea de texto) por producto, los datos se
+guardan por columnas de ancho fijo, lo que permite abrir el archivo con mmap
+y leer cualquier producto (o sumar una columna completa) sin interpretar
+todo el archivo.
+
+Estructura del archivo (little-endian):
+    Encabezado    "<4sHHII"  → firma b"INVB", versión, reservado,
+                               cantidad de productos (n), cantidad de cadenas (m)
+    cantidades    n × int64
+    precios       n × float64
+    id_idx        n × uint32 → posición del ID en la tabla de cadenas
+    nombre_idx    n × uint32 → posición del nombre en la tabla de cadenas
+    desplaz.      (m + 1) × uint64 → inicio de cada cadena dentro del bloque
+    bloque        cadenas UTF-8 concatenadas
+
+Convertidores (también desde la terminal):
+    python snapshot_binario.py json-a-bin inventario.json inventario.bin
+    python snapshot_binario.py bin-a-json inventario.bin inventario.json
+    python snapshot_binario.py txt-a-bin  inventario.txt  inventario.bin
+    python snapshot_binario.py bin-a-txt  inventario.bin  inventario.txt
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+FIRMA = b"INVB"
+VERSION = 1
+ENCABEZADO = struct.Struct("<4sHHII")
+TAMANO_ENCABEZADO = 24   # Se rellena hasta 24 bytes para alinear las columnas a 8
+
+
+# ─────────────────────────────────────────────
+# ESCRITURA
+# ─────────────────────────────────────────────
+def escribir_snapshot(ruta: str, registros):
+    """
+    Escribe un snapshot binario a partir de tuplas (id, nombre, cantidad, precio).
+    Los IDs se guardan como texto, así sirven tanto los de Semana 10 (int)
+    como los de Semana 11 (str). Se escribe en un temporal que después
+    reemplaza a 'ruta' (os.replace): si algo falla a mitad, el snapshot
+    anterior queda intacto.
+    """
+    cantidades = array("q")
+    precios = array("d")
+    id_idx = array("I")
+    nombre_idx = array("I")
+    cadenas: dict[str, int] = {}     # Tabla de cadenas sin repetidos
+
+    def indice_de(texto: str) -> int:
+        posicion = cadenas.get(texto)
+        if posicion is None:
+            posicion = cadenas[texto] = len(cadenas)
+        return posicion
+
+    for id_producto, nombre, cantidad, precio in registros:
+        id_idx.append(indice_de(str(id_producto)))
+        nombre_idx.append(indice_de(nombre))
+        cantidades.append(int(cantidad))
+        precios.append(float(precio))
+
+    desplazamientos = array("Q", [0])
+    bloque = bytearray()
+    for texto in cadenas:              # dict conserva el orden de inserción
+        bloque += texto.encode("utf-8")
+        desplazamientos.append(len(bloque))
+
+    for columna in (cantidades, precios, id_idx, nombre_idx, desplazamientos):
+        if sys.byteorder != "little":
+            columna.byteswap()
+
+    carpeta = os.path.dirname(os.path.abspath(ruta))
+    descriptor, temporal = tempfile.mkstemp(
+        prefix=os.path.basename(ruta) + ".", suffix=".tmp", dir=carpeta)
+    try:
+        with os.fdopen(descriptor, "wb") as archivo:
+            encabezado = ENCABEZADO.pack(FIRMA, VERSION, 0, len(cantidades), len(cadenas))
+            archivo.write(encabezado.ljust(TAMANO_ENCABEZADO, b"\0"))
+            archivo.write(cantidades.tobytes())
+            archivo.write(precios.tobytes())
+            archivo.write(id_idx.tobytes())
+            archivo.write(nombre_idx.tobytes())
+            archivo.write(desplazamientos.tobytes())
+            archivo.write(bloque)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+
+# ─────────────────────────────────────────────
+# LECTURA CON MMAP
+# ─────────────────────────────────────────────
+class SnapshotBinario:
+    """
+    Vista de solo lectura sobre un snapshot binario abierto con mmap.
+    Las columnas numéricas son memoryview sin copiar: leer el producto i
+    o sumar una columna no requiere interpretar el resto del archivo.
+
+    Uso:
+        with SnapshotBinario("inventario.bin") as snap:
+            print(len(snap), snap.registro(0), snap.valor_total())
+    """
+
+    def __init__(self, ruta: str):
+        """
+        Raises:
+            ValueError: Si el archivo no es un snapshot binario válido (vacío,
+                        truncado o de otro formato); el archivo queda cerrado
+        """
+        self._archivo = open(ruta, "rb")
+        self._mapa = None
+        try:
+            self._abrir(ruta)
+        except BaseException:
+            self.cerrar()
+            raise
+
+    def _abrir(self, ruta: str):
+        """Mapea el archivo y arma las vistas de cada columna."""
+        if os.fstat(self._archivo.fileno()).st_size < TAMANO_ENCABEZADO:
+            raise ValueError(f"'{ruta}' no es un snapshot binario de inventario válido "
+                             f"(vacío o truncado).")
+        self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        firma, version, _, n, m = ENCABEZADO.unpack_from(self._mapa, 0)
+        if firma != FIRMA or version != VERSION:
+            raise ValueError(f"'{ruta}' no es un snapshot binario de inventario válido.")
+        if sys.byteorder != "little":
+            raise ValueError("El formato binario solo se puede leer con mmap en equipos little-endian.")
+
+        # Las columnas y desplazamientos que anuncia el encabezado, y el
+        # bloque de cadenas hasta el último desplazamiento, deben estar completos
+        inicio_bloque = TAMANO_ENCABEZADO + 24 * n + 8 * (m + 1)
+        if len(self._mapa) < inicio_bloque or \
+                inicio_bloque + struct.unpack_from("<Q", self._mapa, inicio_bloque - 8)[0] > len(self._mapa):
+            raise ValueError(f"'{ruta}' está truncado: el encabezado anuncia {n} productos "
+                             f"y {m} cadenas, pero el archivo tiene {len(self._mapa)} bytes.")
+
+        self._n = n
+        self._vista = vista = memoryview(self._mapa)
+        inicio = TAMANO_ENCABEZADO
+        self.cantidades = vista[inicio:inicio + 8 * n].cast("q")
+        inicio += 8 * n
+        self.precios = vista[inicio:inicio + 8 * n].cast("d")
+        inicio += 8 * n
+        self._id_idx = vista[inicio:inicio + 4 * n].cast("I")
+        inicio += 4 * n
+        self._nombre_idx = vista[inicio:inicio + 4 * n].cast("I")
+        inicio += 4 * n
+        self._desplazamientos = vista[inicio:inicio + 8 * (m + 1)].cast("Q")
+        self._inicio_bloque = inicio_bloque
+
+    def _cadena(self, posicion: int) -> str:
+        desde = self._inicio_bloque + self._desplazamientos[posicion]
+        hasta = self._inicio_bloque + self._desplazamientos[posicion + 1]
+        return self._mapa[desde:hasta].decode("utf-8")
+
+    def __len__(self) -> int:
+        return self._n
+
+    def id(self, i: int) -> str:
+        return self._cadena(self._id_idx[i])
+
+    def nombre(self, i: int) -> str:
+        return self._cadena(self._nombre_idx[i])
+
+    def registro(self, i: int) -> tuple:
+        """Tupla (id, nombre, cantidad, precio) del producto en la posición i."""
+        return self.id(i), self.nombre(i), self.cantidades[i], self.precios[i]
+
+    def __iter__(self):
+        for i in range(self._n):
+            yield self.registro(i)
+
+    def valor_total(self) -> float:
+        """Suma cantidad × precio usando solo las columnas numéricas."""
+        return sum(c * p for c, p in zip(self.cantidades, self.precios))
+
+    def cerrar(self):
+        """Libera las vistas y cierra el mmap y el archivo."""
+        for nombre in ("cantidades", "precios", "_id_idx", "_nombre_idx",
+                       "_desplazamientos", "_vista"):
+            vista = self.__dict__.pop(nombre, None)
+            if vista is not None:
+                vista.release()
+        if self._mapa is not None:
+            self._mapa.close()
+        self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.cerrar()
+
+
+# ─────────────────────────────────────────────
+# CONVERTIDORES
+# ─────────────────────────────────────────────
+def json_a_binario(ruta_json: str, ruta_bin: str):
+    """Convierte inventario.json (Semana 11) al formato binario."""
+    with open(ruta_json, "r", encoding="utf-8") as archivo:
+        datos = json.load(archivo)
+    escribir_snapshot(ruta_bin, ((d["id"], d["nombre"], d["cantidad"], d["precio"]) for d in datos))
+
+
+def binario_a_json(ruta_bin: str, ruta_json: str):
+    """Convierte un snapshot binario a inventario.json (Semana 11)."""
+    with SnapshotBinario(ruta_bin) as snap:
+        datos = [{"id": i, "nombre": n, "cantidad": c, "precio": p} for i, n, c, p in snap]
+    with open(ruta_json, "w", encoding="utf-8") as archivo:
+        json.dump(datos, archivo, ensure_ascii=False, indent=4)
+
+
+def texto_a_binario(ruta_txt: str, ruta_bin: str):
+    """Convierte inventario.txt (Semana 10, 'id,nombre,cantidad,precio') al formato binario."""
+    def registros():
+        with open(ruta_txt, "r", encoding="utf-8") as archivo:
+            for linea in archivo:
+                linea = linea.strip()
+                if not linea or linea.startswith("#"):
+                    continue
+                partes = linea.split(",")
+                if len(partes) != 4:
+                    continue
+                try:
+                    yield (partes[0].strip(), partes[1].strip(),
+                           int(partes[2].strip()), float(partes[3].strip()))
+                except ValueError:
+                    continue
+
+    escribir_snapshot(ruta_bin, registros())
+
+
+def binario_a_texto(ruta_bin: str, ruta_txt: str):
+    """Convierte un snapshot binario a inventario.txt (Semana 10)."""
+    with SnapshotBinario(ruta_bin) as snap, open(ruta_txt, "w", encoding="utf-8") as archivo:
+        archivo.write("# Archivo de inventario - Formato: id,nombre,cantidad,precio\n")
+        for id_producto, nombre, cantidad, precio in snap:
+            archivo.write(f"{id_producto},{nombre},{cantidad},{precio}\n")
+
+
+CONVERTIDORES = {
+    "json-a-bin": json_a_binario,
+    "bin-a-json": binario_a_json,
+    "txt-a-bin": texto_a_binario,
+    "bin-a-txt": binario_a_texto,
+}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] not in CONVERTIDORES:
+        print(f"Uso: python {os.path.basename(__file__)} "
+              f"[{'|'.join(CONVERTIDORES)}] <origen> <destino>")
+        sys.exit(1)
+    CONVERTIDORES[sys.argv[1]](sys.argv[2], sys.argv[3])
+    print(f"✔  '{sys.argv[2]}' convertido a '{sys.argv[3]}'.")
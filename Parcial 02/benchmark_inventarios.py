@@ -0,0 +1,410 @@
+"""
+Benchmark de las tres versiones del Inventario (Semana 09, 10 y 11).
+
+Genera catálogos sintéticos (misma semilla → mismos productos) y mide, para
+cada versión y tamaño:
+  - cargar / guardar: el archivo completo (Semana 10: inventario.txt,
+    Semana 11: inventario.json). Semana 09 no guarda en disco.
+  - agregar, eliminar, actualizar (por ID), buscar (por nombre) y
+    estadisticas: costo por operación en memoria. La escritura a disco que
+    cada cambio provoca ya se mide en 'guardar', así que aquí se desactiva
+    (si no, con un millón de productos cada alta costaría un guardado).
+
+Cada versión corre en un proceso aparte: las carpetas tienen módulos con el
+mismo nombre (producto.py, indice_nombres.py) y así la memoria de una
+medición no afecta a la siguiente. Las operaciones se repiten hasta
+--operaciones veces o hasta agotar --presupuesto segundos (la búsqueda por
+ID de Semana 09 es lineal y con catálogos grandes no llega a las 1000).
+
+Resultados: una tabla en consola y, con --salida, una línea JSON por
+medición (JSON Lines) que se agrega al archivo. Con --comparar se contrasta
+contra un archivo anterior y se termina con código 1 si alguna operación
+empeoró más que --tolerancia.
+
+Uso:
+    python benchmark_inventarios.py [--tamanos 1000 10000 100000] [--semanas 09 10 11]
+                                    [--salida resultados.jsonl] [--comparar anterior.jsonl]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import datetime
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+CARPETA = os.path.dirname(os.path.abspath(__file__))
+SEMANAS = {"09": "Semana 09", "10": "Semana 10", "11": "Semana 11"}
+OPERACIONES = ("cargar", "guardar", "agregar", "eliminar", "actualizar", "buscar", "estadisticas")
+
+PALABRAS = ("Leche", "Pan", "Arroz", "Azúcar", "Aceite", "Café", "Atún", "Jabón",
+            "Queso", "Galletas", "Fideos", "Huevos", "Yogur", "Harina", "Sal")
+VARIANTES = ("entera", "integral", "light", "grande", "familiar", "clásico",
+             "premium", "económico", "natural", "de coco")
+BUSQUEDAS = ("leche", "pan", "integral", "fami", "café premium", "ao", "1234")
+
+
+# ─────────────────────────────────────────────
+# CATÁLOGO SINTÉTICO
+# ─────────────────────────────────────────────
+def generar_catalogo(cantidad: int, semilla: int) -> list[tuple]:
+    """Lista de (id entero, nombre, cantidad, precio); reproducible con la semilla."""
+    azar = random.Random(semilla)
+    return [(i, f"{azar.choice(PALABRAS)} {azar.choice(VARIANTES)} {i}",
+             azar.randrange(0, 200), round(azar.uniform(0.25, 50.0), 2))
+            for i in range(cantidad)]
+
+
+# ─────────────────────────────────────────────
+# ADAPTADORES (una interfaz común para las tres versiones)
+# ─────────────────────────────────────────────
+class AdaptadorSemana09:
+    """Semana 09: lista en memoria, sin archivo; búsqueda por ID lineal."""
+
+    persistente = False
+
+    def __init__(self):
+        from inventario import Inventario
+        from producto import Producto
+        self._Inventario, self._Producto = Inventario, Producto
+
+    def crear(self, catalogo):
+        inventario = self._Inventario()
+        # Inserción directa: agregar_producto revisa el ID recorriendo la
+        # lista (O(n)), armar un catálogo grande así tardaría horas
+        for fila in catalogo:
+            producto = self._Producto(*fila)
+            inventario._productos.append(producto)
+            inventario._indice_nombres.agregar(producto, producto.obtener_nombre())
+            inventario._sumar_agregados(producto, 1)
+        return inventario
+
+    def agregar(self, inventario, fila):
+        inventario.agregar_producto(*fila)
+
+    def eliminar(self, inventario, id_producto):
+        inventario.eliminar_producto(id_producto)
+
+    def actualizar(self, inventario, id_producto, cantidad):
+        inventario.actualizar_cantidad(id_producto, cantidad)
+
+    def buscar(self, inventario, termino):
+        return inventario.buscar_por_nombre(termino, 50)
+
+    def estadisticas(self, inventario):
+        return inventario.obtener_estadisticas()
+
+
+class AdaptadorSemana10(AdaptadorSemana09):
+    """Semana 10: lista + índice hash, persistida en inventario.txt."""
+
+    persistente = True
+    ARCHIVO = "inventario.txt"
+
+    def __init__(self):
+        from inventario_modificado import Inventario
+        from producto import Producto
+        self._Inventario, self._Producto = Inventario, Producto
+
+    def preparar_archivo(self, catalogo):
+        with open(self.ARCHIVO, "w", encoding="utf-8") as archivo:
+            archivo.write("# Archivo de inventario - Formato: id,nombre,cantidad,precio\n")
+            archivo.writelines(f"{i},{n},{c},{p}\n" for i, n, c, p in catalogo)
+
+    def cargar(self):
+        return self._Inventario(self.ARCHIVO)
+
+    def guardar(self, inventario):
+        inventario._guardar_en_archivo()
+
+    def crear(self, catalogo):
+        inventario = self.cargar()
+        # Igual que benchmark_indice.py: los cambios no reescriben el archivo
+        inventario._guardar_en_archivo = lambda: True
+        return inventario
+
+
+class AdaptadorSemana11:
+    """Semana 11: dict + set + índices, persistida en inventario.json."""
+
+    persistente = True
+    ARCHIVO = "inventario.json"
+
+    def __init__(self):
+        from almacenamiento import Almacenamiento, AlmacenamientoJSON
+        from Inventario import Inventario
+        self._Inventario, self._AlmacenamientoJSON = Inventario, AlmacenamientoJSON
+
+        class AlmacenamientoMemoria(Almacenamiento):
+            """Entrega el catálogo y descarta las escrituras (cambios solo en memoria)."""
+
+            por_fila = True
+
+            def __init__(self, registros):
+                self.registros = registros
+
+            def cargar(self):
+                return iter(self.registros)
+
+            def guardar_todo(self, registros):
+                pass
+
+            def aplicar(self, operaciones):
+                pass
+
+        self._AlmacenamientoMemoria = AlmacenamientoMemoria
+
+    @staticmethod
+    def _fila(fila):
+        id_producto, nombre, cantidad, precio = fila
+        return str(id_producto), nombre, cantidad, precio
+
+    def preparar_archivo(self, catalogo):
+        with open(self.ARCHIVO, "w", encoding="utf-8") as archivo:
+            self._AlmacenamientoJSON.volcar_json(map(self._fila, catalogo), archivo)
+
+    def cargar(self):
+        return self._Inventario(almacenamiento=self._AlmacenamientoJSON(self.ARCHIVO))
+
+    def guardar(self, inventario):
+        inventario.guardar_en_archivo()
+
+    def crear(self, catalogo):
+        registros = [self._fila(f) for f in catalogo]
+        return self._Inventario(almacenamiento=self._AlmacenamientoMemoria(registros))
+
+    def agregar(self, inventario, fila):
+        inventario.agregar_producto(*self._fila(fila))
+
+    def eliminar(self, inventario, id_producto):
+        inventario.eliminar_producto(str(id_producto))
+
+    def actualizar(self, inventario, id_producto, cantidad):
+        inventario.actualizar_producto(str(id_producto), cantidad)
+
+    def buscar(self, inventario, termino):
+        return inventario.buscar_por_nombre(termino, 50)
+
+    def estadisticas(self, inventario):
+        return inventario.estadisticas()
+
+
+ADAPTADORES = {"09": AdaptadorSemana09, "10": AdaptadorSemana10, "11": AdaptadorSemana11}
+
+
+# ─────────────────────────────────────────────
+# MEDICIÓN (proceso hijo)
+# ─────────────────────────────────────────────
+def _cronometrar(funcion, argumentos, presupuesto: float) -> tuple[int, float]:
+    """Llama funcion(arg) para cada argumento hasta agotar el presupuesto; (veces, segundos)."""
+    veces = 0
+    inicio = time.perf_counter()
+    limite = inicio + presupuesto
+    for argumento in argumentos:
+        funcion(argumento)
+        veces += 1
+        if time.perf_counter() > limite:
+            break
+    return veces, time.perf_counter() - inicio
+
+
+def medir_semana(semana: str, cantidad: int, semilla: int, operaciones: int,
+                 repeticiones: int, presupuesto: float) -> list[dict]:
+    """Ejecuta todas las mediciones de una versión; se llama dentro del proceso hijo."""
+    sys.path.insert(0, os.path.join(CARPETA, SEMANAS[semana]))
+    adaptador = ADAPTADORES[semana]()
+    catalogo = generar_catalogo(cantidad, semilla)
+    azar = random.Random(semilla + 1)
+    resultados = []
+
+    def registrar(operacion, veces, segundos):
+        resultados.append({"operacion": operacion, "veces": veces, "segundos": segundos,
+                           "us_por_op": segundos / veces * 1e6 if veces else None})
+
+    if adaptador.persistente:
+        adaptador.preparar_archivo(catalogo)
+        # Carga y guardado: el mejor de varias repeticiones
+        mejores = {"cargar": float("inf"), "guardar": float("inf")}
+        for _ in range(repeticiones):
+            gc.collect()
+            inicio = time.perf_counter()
+            inventario = adaptador.cargar()
+            mejores["cargar"] = min(mejores["cargar"], time.perf_counter() - inicio)
+            inicio = time.perf_counter()
+            adaptador.guardar(inventario)
+            mejores["guardar"] = min(mejores["guardar"], time.perf_counter() - inicio)
+            del inventario
+        for operacion, segundos in mejores.items():
+            registrar(operacion, 1, segundos)
+
+    gc.collect()
+    inventario = adaptador.crear(catalogo)
+    n_ops = min(operaciones, cantidad)
+    existentes = azar.sample(range(cantidad), n_ops)
+    terminos = [BUSQUEDAS[i % len(BUSQUEDAS)] for i in range(n_ops)]
+
+    registrar("buscar", *_cronometrar(lambda t: adaptador.buscar(inventario, t),
+                                      terminos, presupuesto))
+    registrar("estadisticas", *_cronometrar(lambda _: adaptador.estadisticas(inventario),
+                                            range(max(1, n_ops // 100)), presupuesto))
+    registrar("actualizar", *_cronometrar(
+        lambda i: adaptador.actualizar(inventario, i, (i * 7) % 200), existentes, presupuesto))
+    nuevos = [(cantidad + i, f"Nuevo producto {i}", 10, 1.5) for i in range(n_ops)]
+    registrar("agregar", *_cronometrar(lambda f: adaptador.agregar(inventario, f),
+                                       nuevos, presupuesto))
+    registrar("eliminar", *_cronometrar(lambda i: adaptador.eliminar(inventario, i),
+                                        existentes, presupuesto))
+    return resultados
+
+
+def _ejecutar_hijo(args) -> None:
+    with tempfile.TemporaryDirectory() as carpeta:
+        os.chdir(carpeta)
+        with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+            resultados = medir_semana(args.semana, args.productos, args.semilla,
+                                      args.operaciones, args.repeticiones, args.presupuesto)
+        os.chdir(CARPETA)
+    json.dump(resultados, sys.stdout)
+
+
+# ─────────────────────────────────────────────
+# COORDINACIÓN (proceso principal)
+# ─────────────────────────────────────────────
+def _commit_actual() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=CARPETA,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def ejecutar(args) -> list[dict]:
+    """Lanza un proceso por (semana, tamaño) y junta los resultados con sus metadatos."""
+    comunes = {"fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+               "commit": _commit_actual(), "python": platform.python_version(),
+               "plataforma": platform.platform(), "semilla": args.semilla}
+    registros = []
+    for cantidad in args.tamanos:
+        for semana in args.semanas:
+            print(f"  Semana {semana}, {cantidad:>9,} productos ...", end="", flush=True)
+            proceso = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--interno",
+                 "--semana", semana, "--productos", str(cantidad),
+                 "--semilla", str(args.semilla), "--operaciones", str(args.operaciones),
+                 "--repeticiones", str(args.repeticiones), "--presupuesto", str(args.presupuesto)],
+                capture_output=True, text=True)
+            if proceso.returncode != 0:
+                print(" ✖")
+                print(proceso.stderr.strip(), file=sys.stderr)
+                continue
+            print(" ✔")
+            for resultado in json.loads(proceso.stdout):
+                registros.append({**comunes, "semana": semana, "productos": cantidad, **resultado})
+    return registros
+
+
+def mostrar_tabla(registros: list[dict]):
+    valores = {(r["semana"], r["productos"], r["operacion"]): r for r in registros}
+    semanas = sorted({r["semana"] for r in registros})
+    print("\n" + "═" * (20 + 16 * len(semanas)))
+    print(f"  {'Operación':<17}" + "".join(f"{'Semana ' + s:>16}" for s in semanas))
+    for cantidad in sorted({r["productos"] for r in registros}):
+        print("═" * (20 + 16 * len(semanas)))
+        print(f"  {cantidad:,} productos")
+        for operacion in OPERACIONES:
+            celdas = []
+            for semana in semanas:
+                r = valores.get((semana, cantidad, operacion))
+                if r is None:
+                    celdas.append(f"{'—':>16}")
+                elif operacion in ("cargar", "guardar"):
+                    celdas.append(f"{r['segundos']:>14.3f} s")
+                else:
+                    celdas.append(f"{r['us_por_op']:>13.1f} µs")
+            print(f"    {operacion:<15}" + "".join(celdas))
+    print("═" * (20 + 16 * len(semanas)))
+    print("  cargar/guardar: archivo completo; el resto: tiempo por operación\n")
+
+
+def comparar(registros: list[dict], ruta: str, tolerancia: float) -> int:
+    """
+    Compara contra la última medición de cada (semana, tamaño, operación) en
+    'ruta'. Retorna cuántas empeoraron más que la tolerancia.
+    """
+    anteriores = {}
+    with open(ruta, "r", encoding="utf-8") as archivo:
+        for linea in archivo:
+            if linea.strip():
+                r = json.loads(linea)
+                anteriores[(r["semana"], r["productos"], r["operacion"])] = r
+
+    regresiones = 0
+    print(f"  Comparación con '{ruta}' (tolerancia {tolerancia:.0%})")
+    print("─" * 66)
+    for r in registros:
+        clave = (r["semana"], r["productos"], r["operacion"])
+        anterior = anteriores.get(clave)
+        if anterior is None or not anterior["us_por_op"] or r["us_por_op"] is None:
+            continue
+        cambio = r["us_por_op"] / anterior["us_por_op"] - 1
+        marca = "✔"
+        if cambio > tolerancia:
+            marca = "✖"
+            regresiones += 1
+        print(f"  {marca} Semana {clave[0]} {clave[1]:>9,} {clave[2]:<13} {cambio:>+8.1%}")
+    print("─" * 66)
+    print(f"  {regresiones} regresión(es)\n")
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+                        help="cantidades de productos (hasta 1000000)")
+    parser.add_argument("--semanas", nargs="+", choices=sorted(SEMANAS), default=sorted(SEMANAS))
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--operaciones", type=int, default=1000, help="por tipo de operación")
+    parser.add_argument("--repeticiones", type=int, default=3, help="de cargar/guardar")
+    parser.add_argument("--presupuesto", type=float, default=2.0,
+                        help="segundos máximos por tipo de operación")
+    parser.add_argument("--salida", help="agregar los resultados a este archivo JSON Lines")
+    parser.add_argument("--comparar", help="resultados anteriores (JSON Lines)")
+    parser.add_argument("--tolerancia", type=float, default=0.20,
+                        help="empeoramiento permitido al comparar (0.20 = 20%%)")
+    # Uso interno: el proceso hijo que mide una sola (semana, tamaño)
+    parser.add_argument("--interno", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--semana", help=argparse.SUPPRESS)
+    parser.add_argument("--productos", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.interno:
+        _ejecutar_hijo(args)
+        return
+
+    print(f"\nBenchmark de inventarios (semilla {args.semilla})")
+    registros = ejecutar(args)
+    mostrar_tabla(registros)
+
+    # Se compara antes de agregar: --comparar y --salida pueden ser el mismo archivo
+    regresiones = comparar(registros, args.comparar, args.tolerancia) if args.comparar else 0
+
+    if args.salida:
+        with open(args.salida, "a", encoding="utf-8") as archivo:
+            for r in registros:
+                archivo.write(json.dumps(r, ensure_ascii=False) + "\n")
+        print(f"✔  {len(registros)} medición(es) agregadas a '{args.salida}'.")
+
+    if regresiones:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()